@@ -0,0 +1,29 @@
+"""
+Performance tooling for the TradeTrack backend.
+
+Modules:
+    harness:
+        Timing primitives plus baseline save/load/compare helpers.
+
+    hot_path:
+        Micro-benchmarks for the face scoring hot path (vector utils,
+        verify service, request parsing and response serialization).
+
+    dataset:
+        Deterministic synthetic scale-dataset generator and bulk loader
+        (python -m benchmarks.dataset).
+
+    identify:
+        Recall/latency/memory of the identification indexes versus exact
+        search (python -m benchmarks.identify).
+
+    startup:
+        Cold-start timings in fresh interpreters plus the slowest imports
+        (python -m benchmarks.startup).
+
+    run:
+        Command-line entrypoint:
+
+            python -m benchmarks.run --save benchmarks/baseline.json
+            python -m benchmarks.run --compare benchmarks/baseline.json
+"""
@@ -0,0 +1,92 @@
+"""
+Shift-change burst benchmark for the clock-in write path.
+
+`workers` threads clock in `events` distinct employees as fast as they
+can against a file-backed database (so every commit pays a real fsync),
+once through the per-request repository path and once through
+data.clock_writer.GroupCommitWriter.
+
+Usage:
+    python -m benchmarks.clock_writes --events 2000 --workers 40
+    python -m benchmarks.clock_writes --url postgresql+psycopg2://...
+
+Note: with --url the time_entries table is truncated between runs.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+import data.time_entry_repository as repo
+from data.clock_writer import GroupCommitWriter
+from data.models import Base, TimeEntry
+
+
+def _burst(clock_in, events: int, workers: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(clock_in, [f"bench{i}" for i in range(events)]))
+    return time.perf_counter() - start
+
+
+def run(url: str, events: int, workers: int, window_ms: float) -> Dict[str, Dict[str, float]]:
+    if url.startswith("sqlite"):
+        # SQLite serializes writers; wait for the lock instead of failing
+        engine = create_engine(url, future=True, connect_args={"timeout": 60})
+    else:
+        engine = create_engine(url, future=True, pool_size=workers)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+    def reset():
+        with SessionLocal() as db:
+            db.execute(delete(TimeEntry))
+            db.commit()
+
+    def per_request(employee_id):
+        with SessionLocal() as db:
+            return repo.create_entry(db, employee_id)
+
+    results = {}
+
+    reset()
+    seconds = _burst(per_request, events, workers)
+    results["clock_in.per_request"] = {"seconds": seconds, "per_second": events / seconds}
+
+    reset()
+    writer = GroupCommitWriter(engine, window_ms=window_ms)
+    seconds = _burst(writer.clock_in, events, workers)
+    writer.stop()
+    results["clock_in.group_commit"] = {"seconds": seconds, "per_second": events / seconds}
+
+    engine.dispose()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Clock-in burst throughput.")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=40, help="Concurrent request threads.")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--url", help="Database URL (default: a temporary SQLite file).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        results = run(url, args.events, args.workers, args.window_ms)
+
+    for name, row in results.items():
+        print(f"{name:<24} {row['per_second']:>10.0f} events/s ({row['seconds']:.2f} s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Synthetic scale-dataset generator and bulk loader.
+
+Produces production-sized data deterministically from a seed and loads it
+straight into the `data.models` schema, bypassing the service layer:
+
+    • employees with clustered, unit-normalized 512-d embeddings
+      (people sharing a cluster look alike, which is what makes
+      identification hard at scale)
+    • time_entries following real shift patterns: day/swing/night shifts,
+      rotating 5-day work weeks, late/early arrivals, overtime, absences,
+      mid-period hires, and open entries for shifts still in progress
+
+Generation is chunked with a per-chunk seed, so output is identical for a
+given seed regardless of the load batch size, and memory stays bounded.
+
+Usage:
+    python -m benchmarks.dataset --database-url sqlite:///scale.db \\
+        --employees 100000 --days 365 --seed 42 --create-schema
+
+On PostgreSQL, time entries are streamed with COPY; elsewhere they are
+inserted with multi-row executemany batches.
+"""
+
+import argparse
+import csv
+import io
+import sys
+import time
+from datetime import date, datetime
+from typing import Dict, Iterator, List
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+
+from core.vector_utils import binary_signature
+from data.models import Base, Employee, TimeEntry
+
+
+EMBEDDING_DIM = 512
+CHUNK_SIZE = 1_000
+DEFAULT_END_DATE = date(2026, 1, 1)
+
+FIRST_NAMES = (
+    "Alex", "Blake", "Casey", "Dana", "Eli", "Frankie", "Gray", "Harper",
+    "Indy", "Jordan", "Kai", "Logan", "Morgan", "Noel", "Oakley", "Parker",
+    "Quinn", "Riley", "Sage", "Taylor", "Uri", "Val", "Wren", "Xan",
+    "Yael", "Zion",
+)
+LAST_NAMES = (
+    "Adams", "Baker", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Hughes",
+    "Ivanov", "Jones", "Kim", "Lopez", "Meyer", "Nguyen", "Okafor", "Patel",
+    "Quinn", "Rossi", "Smith", "Tanaka", "Usman", "Varga", "Walsh", "Xu",
+    "Young", "Zhang",
+)
+
+# (start hour, nominal length in hours, share of workforce)
+SHIFT_PATTERNS = (
+    (7.0, 8.5, 0.60),    # day
+    (15.0, 8.5, 0.25),   # swing
+    (23.0, 8.5, 0.15),   # night, crosses midnight
+)
+
+# First weekday of the 5-day work week (Mon, Tue, Sun) and its share
+WORK_WEEK_OFFSETS = ((0, 0.70), (1, 0.15), (6, 0.15))
+
+ABSENCE_RATE = 0.04
+MID_PERIOD_HIRE_RATE = 0.20
+
+
+# ---------------------------------------------------------------------------
+# EMPLOYEES
+# ---------------------------------------------------------------------------
+
+def _chunk_rng(seed: int, stream: int, chunk: int) -> np.random.Generator:
+    """Independent, reproducible generator for one chunk of one stream."""
+    return np.random.default_rng([seed, stream, chunk])
+
+
+def _cluster_centres(seed: int, clusters: int, dim: int) -> np.ndarray:
+    rng = np.random.default_rng([seed, 0])
+    return rng.standard_normal((clusters, dim))
+
+
+def employee_id_for(index: int) -> str:
+    return f"E{index:07d}"
+
+
+def generate_employees(
+    count: int,
+    seed: int,
+    *,
+    clusters: int = 256,
+    spread: float = 0.6,
+    dim: int = EMBEDDING_DIM,
+) -> Iterator[List[Dict]]:
+    """
+    Yield lists of employee row dicts, CHUNK_SIZE at a time.
+
+    Each embedding is a cluster centre plus Gaussian noise scaled by
+    `spread`, normalized to unit length like register_employee() does,
+    with its binary signature alongside.
+    """
+    centres = _cluster_centres(seed, clusters, dim)
+
+    for chunk, start in enumerate(range(0, count, CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, count - start)
+        rng = _chunk_rng(seed, 1, chunk)
+
+        assignment = rng.integers(0, clusters, size)
+        vectors = centres[assignment] + spread * rng.standard_normal((size, dim))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        signatures = binary_signature(vectors)
+
+        first = rng.integers(0, len(FIRST_NAMES), size)
+        last = rng.integers(0, len(LAST_NAMES), size)
+        admin = rng.random(size) < 0.02
+
+        yield [
+            {
+                "employee_id": employee_id_for(start + i),
+                "name": f"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]}",
+                "role": "Admin" if admin[i] else "Employee",
+                "embedding": vectors[i].tolist(),
+                "signature": signatures[i].tobytes(),
+            }
+            for i in range(size)
+        ]
+
+
+# ---------------------------------------------------------------------------
+# TIME ENTRIES
+# ---------------------------------------------------------------------------
+
+def generate_time_entries(
+    employee_count: int,
+    days: int,
+    seed: int,
+    *,
+    end_date: date = DEFAULT_END_DATE,
+) -> Iterator[List[Dict]]:
+    """
+    Yield lists of time entry row dicts, one list per employee chunk.
+
+    The simulated period is the `days` days ending at midnight of
+    `end_date`. Shifts still running at that instant are left open
+    (clock_out=None), exactly one per employee at most.
+    """
+    period_end = np.datetime64(end_date, "s")
+    period_start = period_end - np.timedelta64(days, "D")
+    day_starts = period_start + np.arange(days) * np.timedelta64(1, "D")
+    # 1970-01-01 was a Thursday; shift so Monday == 0
+    weekdays = (day_starts.astype("datetime64[D]").astype(np.int64) + 3) % 7
+
+    shift_p = np.array([p[2] for p in SHIFT_PATTERNS])
+    offset_p = np.array([o[1] for o in WORK_WEEK_OFFSETS])
+
+    for chunk, start in enumerate(range(0, employee_count, CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, employee_count - start)
+        rng = _chunk_rng(seed, 2, chunk)
+
+        shift = rng.choice(len(SHIFT_PATTERNS), size, p=shift_p)
+        week_offset = np.array([o[0] for o in WORK_WEEK_OFFSETS])[
+            rng.choice(len(WORK_WEEK_OFFSETS), size, p=offset_p)
+        ]
+        hired_day = np.where(
+            rng.random(size) < MID_PERIOD_HIRE_RATE,
+            rng.integers(0, days, size),
+            0,
+        )
+
+        # (employees x days) matrices
+        day_index = np.arange(days)[None, :]
+        works = (
+            ((weekdays[None, :] - week_offset[:, None]) % 7 < 5)
+            & (day_index >= hired_day[:, None])
+            & (rng.random((size, days)) >= ABSENCE_RATE)
+        )
+
+        start_hours = np.array([p[0] for p in SHIFT_PATTERNS])[shift][:, None]
+        lengths = np.array([p[1] for p in SHIFT_PATTERNS])[shift][:, None]
+
+        arrive = start_hours + rng.normal(0.0, 0.15, (size, days))
+        duration = np.clip(lengths + rng.normal(0.2, 0.5, (size, days)), 4.0, 13.0)
+
+        clock_in = day_starts[None, :] + (arrive * 3600).astype("timedelta64[s]")
+        clock_out = clock_in + (duration * 3600).astype("timedelta64[s]")
+
+        works &= clock_in < period_end
+        emp_idx, day_idx = np.nonzero(works)
+
+        ins = clock_in[emp_idx, day_idx]
+        outs = clock_out[emp_idx, day_idx]
+        open_mask = outs > period_end
+
+        ins_py = ins.astype("datetime64[us]").tolist()
+        outs_py = outs.astype("datetime64[us]").tolist()
+
+        yield [
+            {
+                "employee_id": employee_id_for(start + int(e)),
+                "clock_in": ins_py[i],
+                "clock_out": None if open_mask[i] else outs_py[i],
+            }
+            for i, e in enumerate(emp_idx)
+        ]
+
+
+# ---------------------------------------------------------------------------
+# LOADING
+# ---------------------------------------------------------------------------
+
+def _copy_time_entries(engine: Engine, rows: List[Dict]) -> None:
+    """Stream rows into time_entries with PostgreSQL COPY."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow((
+            row["employee_id"],
+            row["clock_in"].isoformat(),
+            row["clock_out"].isoformat() if row["clock_out"] else "",
+        ))
+    buffer.seek(0)
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY time_entries (employee_id, clock_in, clock_out) "
+                "FROM STDIN WITH (FORMAT csv, NULL '')",
+                buffer,
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def load_dataset(
+    engine: Engine,
+    *,
+    employees: int,
+    days: int,
+    seed: int,
+    end_date: date = DEFAULT_END_DATE,
+    clusters: int = 256,
+    create_schema: bool = False,
+    progress=None,
+) -> Dict[str, int]:
+    """
+    Generate and bulk-load a dataset. Returns row counts per table.
+
+    `progress`, if given, is called as progress(table, rows_loaded_so_far).
+    """
+    if create_schema:
+        Base.metadata.create_all(engine)
+
+    use_copy = engine.dialect.name == "postgresql"
+    counts = {"employees": 0, "time_entries": 0}
+
+    for rows in generate_employees(employees, seed, clusters=clusters):
+        with engine.begin() as conn:
+            conn.execute(insert(Employee), rows)
+        counts["employees"] += len(rows)
+        if progress:
+            progress("employees", counts["employees"])
+
+    for rows in generate_time_entries(employees, days, seed, end_date=end_date):
+        if not rows:
+            continue
+        if use_copy:
+            _copy_time_entries(engine, rows)
+        else:
+            with engine.begin() as conn:
+                conn.execute(insert(TimeEntry), rows)
+        counts["time_entries"] += len(rows)
+        if progress:
+            progress("time_entries", counts["time_entries"])
+
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate and bulk-load a synthetic scale dataset.")
+    parser.add_argument("--database-url", required=True, help="Target database (SQLite or PostgreSQL).")
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clusters", type=int, default=256, help="Number of embedding look-alike clusters.")
+    parser.add_argument(
+        "--end-date",
+        type=date.fromisoformat,
+        default=DEFAULT_END_DATE,
+        help="Exclusive end of the simulated period (default: %(default)s).",
+    )
+    parser.add_argument("--create-schema", action="store_true", help="Create tables before loading.")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url, future=True)
+    started = time.perf_counter()
+    current = {"table": None}
+
+    def progress(table, loaded):
+        if current["table"] not in (None, table):
+            print()
+        current["table"] = table
+        elapsed = time.perf_counter() - started
+        print(f"\r{table:<13} {loaded:>12,} rows  {elapsed:8.1f}s", end="", flush=True)
+
+    counts = load_dataset(
+        engine,
+        employees=args.employees,
+        days=args.days,
+        seed=args.seed,
+        end_date=args.end_date,
+        clusters=args.clusters,
+        create_schema=args.create_schema,
+        progress=progress,
+    )
+
+    print(
+        f"\nLoaded {counts['employees']:,} employees and "
+        f"{counts['time_entries']:,} time entries in "
+        f"{time.perf_counter() - started:.1f}s at {datetime.now().isoformat(timespec='seconds')}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark harness.
+
+Provides:
+    • measure()        – time a zero-argument callable with timeit
+    • save_baseline()  – persist results as JSON
+    • load_baseline()  – read a previously saved baseline
+    • compare()        – flag cases that regressed beyond a tolerance
+
+Results are plain dicts keyed by case name so they serialize directly to
+JSON and can be diffed in code review.
+"""
+
+import json
+import platform
+import statistics
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List
+
+
+# ---------------------------------------------------------------------------
+# MEASURE
+# ---------------------------------------------------------------------------
+
+def measure(
+    fn: Callable[[], object],
+    *,
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> Dict[str, float]:
+    """
+    Time a callable and return per-call statistics in microseconds.
+
+    The loop count is calibrated with Timer.autorange() so that each of the
+    `repeat` rounds runs for at least `min_time` seconds. The median is used
+    as the comparison metric because it is robust to scheduler noise.
+    """
+    timer = timeit.Timer(fn)
+
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    rounds = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "median_us": statistics.median(rounds),
+        "min_us": min(rounds),
+        "max_us": max(rounds),
+        "loops": number,
+    }
+
+
+# ---------------------------------------------------------------------------
+# BASELINE I/O
+# ---------------------------------------------------------------------------
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path) -> None:
+    """
+    Write benchmark results to `path` as JSON, with machine metadata.
+    """
+    document = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    """
+    Load the `results` section of a baseline written by save_baseline().
+    """
+    return json.loads(path.read_text())["results"]
+
+
+# ---------------------------------------------------------------------------
+# COMPARE
+# ---------------------------------------------------------------------------
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[Dict[str, float]]:
+    """
+    Compare current results against a baseline.
+
+    A case regresses when its median is more than `tolerance` (a fraction,
+    e.g. 0.25 = 25%) slower than the baseline median. Cases missing from
+    either side are ignored so the suite can grow without breaking the gate.
+
+    Returns one row per compared case:
+        {"case", "baseline_us", "current_us", "ratio", "regressed"}
+    """
+    rows = []
+
+    for case in sorted(set(current) & set(baseline)):
+        before = baseline[case]["median_us"]
+        after = current[case]["median_us"]
+        ratio = after / before if before > 0 else float("inf")
+
+        rows.append({
+            "case": case,
+            "baseline_us": before,
+            "current_us": after,
+            "ratio": ratio,
+            "regressed": ratio > 1.0 + tolerance,
+        })
+
+    return rows
@@ -0,0 +1,162 @@
+"""
+Micro-benchmarks for the face scoring hot path.
+
+Each case is a zero-argument callable built ahead of time so that only the
+operation under test is timed. Inputs are representative 512-d float lists,
+matching what the kiosk sends in VerifyFaceRequest.
+
+Cases:
+    • vector.normalize_vector
+    • vector.cosine_similarity
+    • vector.gallery_scan[N]       – one probe scored against N embeddings
+    • verify.verify_face_embedding[N] – full service call against an
+                                      in-memory SQLite DB holding N employees
+    • schema.verify_request_parse  – VerifyFaceRequest JSON validation
+    • schema.api_response_dump     – ApiResponse[List[EmployeeResult]] JSON
+"""
+
+import json
+import random
+from typing import Callable, Dict, List
+
+import structlog
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.api_response import ok
+from core.settings import Settings
+from core.vector_utils import cosine_similarity, normalize_vector
+from data.models import Base, Employee
+from schemas import EmployeeResult, VerifyFaceRequest
+from services.verify_face import verify_face_embedding
+
+
+EMBEDDING_DIM = 512
+GALLERY_SIZES = (100, 1_000, 10_000)
+
+
+# ---------------------------------------------------------------------------
+# INPUT FACTORIES
+# ---------------------------------------------------------------------------
+
+def random_embedding(rng: random.Random, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Gaussian embedding, similar in distribution to model output."""
+    return [rng.gauss(0.0, 1.0) for _ in range(dim)]
+
+
+def silence_logging() -> None:
+    """
+    Run structlog processors but discard the rendered output.
+
+    Services log on every call; writing to a terminal would dominate the
+    timings and make them depend on the console rather than the code.
+    """
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.JSONRenderer(),
+        ],
+        logger_factory=structlog.ReturnLoggerFactory(),
+        cache_logger_on_first_use=False,
+    )
+
+
+def build_gallery_session(size: int, rng: random.Random):
+    """
+    Create an in-memory SQLite session holding `size` employees.
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+
+    rows = [
+        {
+            "employee_id": f"emp{i:06d}",
+            "name": f"Employee {i}",
+            "role": "Employee",
+            "embedding": normalize_vector(random_embedding(rng)).tolist(),
+        }
+        for i in range(size)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), rows)
+
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+# ---------------------------------------------------------------------------
+# CASES
+# ---------------------------------------------------------------------------
+
+def build_cases(
+    gallery_sizes=GALLERY_SIZES,
+    seed: int = 1234,
+) -> Dict[str, Callable[[], object]]:
+    """
+    Build every hot-path case. Returns {case_name: callable}.
+    """
+    rng = random.Random(seed)
+    silence_logging()
+
+    probe = random_embedding(rng)
+    stored = random_embedding(rng)
+
+    cases: Dict[str, Callable[[], object]] = {
+        "vector.normalize_vector": lambda: normalize_vector(probe),
+        "vector.cosine_similarity": lambda: cosine_similarity(probe, stored),
+    }
+
+    # --- Gallery scans ------------------------------------------------------
+    for size in gallery_sizes:
+        gallery = [random_embedding(rng) for _ in range(size)]
+
+        def scan(gallery=gallery):
+            return max(cosine_similarity(probe, g) for g in gallery)
+
+        cases[f"vector.gallery_scan[{size}]"] = scan
+
+    # --- Verify service -----------------------------------------------------
+    settings = Settings(
+        database_url="sqlite://",
+        admin_api_key="bench",
+        env="test",
+        face_match_threshold=0.01,
+    )
+
+    for size in gallery_sizes:
+        db = build_gallery_session(size, rng)
+        target = db.get(Employee, f"emp{size // 2:06d}")
+        req = VerifyFaceRequest(
+            employee_id=target.employee_id,
+            embedding=list(target.embedding),
+        )
+        db.expire_all()
+
+        def verify(req=req, db=db):
+            return verify_face_embedding(req, db, settings=settings)
+
+        cases[f"verify.verify_face_embedding[{size}]"] = verify
+
+    # --- Schemas ------------------------------------------------------------
+    request_body = json.dumps({
+        "employee_id": "emp000001",
+        "embedding": probe,
+    }).encode()
+
+    cases["schema.verify_request_parse"] = (
+        lambda: VerifyFaceRequest.model_validate_json(request_body)
+    )
+
+    results = [
+        EmployeeResult(employee_id=f"emp{i:06d}", name=f"Employee {i}", role="Employee")
+        for i in range(25)
+    ]
+    cases["schema.api_response_dump"] = lambda: ok(results).model_dump_json()
+
+    return cases
@@ -0,0 +1,145 @@
+"""
+Recall / latency / memory benchmark for the 1:N identification indexes.
+
+Builds a clustered synthetic gallery (benchmarks.dataset), derives noisy
+probes from random gallery members, and compares every index in
+core.face_index against ExactIndex:
+
+    • recall@1  – share of probes whose top match equals the exact top match
+    • latency   – median microseconds per search (benchmarks.harness.measure)
+    • memory    – resident bytes of the index
+
+Re-ranking fetches exact vectors from an in-memory mapping, standing in
+for the primary-key lookup the service performs.
+
+Usage:
+    python -m benchmarks.identify --size 100000 --queries 200
+    python -m benchmarks.identify --size 100000 --rerank 16 64 --shortlist 128 512
+    python -m benchmarks.identify --size 100000 --nlist 316 --nprobe 4 8 16 32
+"""
+
+import argparse
+import sys
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.dataset import generate_employees
+from benchmarks.harness import measure
+from core.face_index import BinaryIndex, ExactIndex, Int8Index, IVFIndex
+
+
+def build_gallery(size: int, seed: int, clusters: int = 256):
+    """(employee_ids, float32 (size, 512) matrix) from the synthetic generator."""
+    ids: List[str] = []
+    rows: List[List[float]] = []
+    for chunk in generate_employees(size, seed, clusters=clusters):
+        for row in chunk:
+            ids.append(row["employee_id"])
+            rows.append(row["embedding"])
+    return ids, np.asarray(rows, dtype=np.float32)
+
+
+def make_probes(vectors: np.ndarray, count: int, seed: int, noise: float = 0.04) -> np.ndarray:
+    """Noisy re-captures of random gallery members, normalized."""
+    rng = np.random.default_rng([seed, 99])
+    picks = rng.integers(0, len(vectors), count)
+    probes = vectors[picks] + noise * rng.standard_normal((count, vectors.shape[1]))
+    return (probes / np.linalg.norm(probes, axis=1, keepdims=True)).astype(np.float32)
+
+
+def evaluate(index, exact_top: List[str], probes: np.ndarray, fetch, repeat: int, min_time: float) -> Dict:
+    hits = sum(
+        1
+        for probe, expected in zip(probes, exact_top)
+        if index.search(probe, k=1, fetch=fetch)[0][0] == expected
+    )
+    timing = measure(lambda: index.search(probes[0], k=1, fetch=fetch), repeat=repeat, min_time=min_time)
+    return {
+        **timing,
+        "recall_at_1": hits / len(probes),
+        "nbytes": index.nbytes,
+    }
+
+
+def run(
+    size: int,
+    queries: int,
+    seed: int,
+    reranks=(32,),
+    shortlists=(256,),
+    nprobes=(8,),
+    nlist: int = 0,
+    repeat: int = 3,
+    min_time: float = 0.1,
+) -> Dict[str, Dict]:
+    ids, vectors = build_gallery(size, seed)
+    probes = make_probes(vectors, queries, seed)
+
+    by_id = dict(zip(ids, vectors))
+    fetch = lambda candidate_ids: {e: by_id[e] for e in candidate_ids}  # noqa: E731
+
+    exact = ExactIndex(ids, vectors)
+    exact_top = [exact.search(p, k=1)[0][0] for p in probes]
+
+    results = {f"identify.exact[{size}]": evaluate(exact, exact_top, probes, None, repeat, min_time)}
+
+    int8 = Int8Index(ids, vectors)
+    for rerank in reranks:
+        int8.rerank = rerank
+        results[f"identify.int8[{size},rerank={rerank}]"] = evaluate(
+            int8, exact_top, probes, fetch, repeat, min_time
+        )
+
+    binary = BinaryIndex(ids, vectors)
+    for shortlist in shortlists:
+        binary.shortlist = shortlist
+        results[f"identify.binary[{size},shortlist={shortlist}]"] = evaluate(
+            binary, exact_top, probes, None, repeat, min_time
+        )
+
+    ivf = IVFIndex(ids, vectors, nlist=nlist)
+    for nprobe in nprobes:
+        ivf.nprobe = nprobe
+        results[f"identify.ivf[{size},nlist={ivf.nlist},nprobe={nprobe}]"] = evaluate(
+            ivf, exact_top, probes, None, repeat, min_time
+        )
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Identification index recall/latency benchmark.")
+    parser.add_argument("--size", type=int, default=100_000, help="Gallery size.")
+    parser.add_argument("--queries", type=int, default=200, help="Probes used for recall.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rerank", type=int, nargs="+", default=[32], help="Re-rank depths to try.")
+    parser.add_argument("--shortlist", type=int, nargs="+", default=[256], help="Binary prefilter shortlist sizes.")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF cells (0 = about sqrt(size)).")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8], help="IVF cells scanned per query.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds per case.")
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.size,
+        args.queries,
+        args.seed,
+        reranks=args.rerank,
+        shortlists=args.shortlist,
+        nprobes=args.nprobe,
+        nlist=args.nlist,
+        repeat=args.repeat,
+    )
+
+    print(f"{'case':<48} {'median':>12} {'recall@1':>9} {'memory':>10}")
+    for name, row in results.items():
+        print(
+            f"{name:<48} {row['median_us']:>9.1f} us "
+            f"{row['recall_at_1']:>9.3f} {row['nbytes'] / 2**20:>7.1f} MiB"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Run the benchmark suite and optionally save or compare a baseline.
+
+Usage:
+    python -m benchmarks.run                               # print results
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks.run --startup --save benchmarks/baseline.json
+
+Exit status is 1 when --compare finds a case slower than the baseline by
+more than the tolerance, so the command can gate CI. The committed
+benchmarks/baseline.json was recorded on the machine named in its
+"machine" block; absolute timings only compare on similar hardware, so a
+CI runner class gets its own baseline by running --save once on it and
+committing the file.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.harness import compare, load_baseline, measure, save_baseline
+from benchmarks.hot_path import build_cases
+from benchmarks.startup import measure_startup
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", type=Path, help="Write results to this baseline file.")
+    parser.add_argument("--compare", type=Path, help="Compare results against this baseline file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown as a fraction of the baseline median (default: 0.25).",
+    )
+    parser.add_argument("--filter", default="", help="Only run cases containing this substring.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case.")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum seconds per timing round (default: 0.2).",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="Also measure cold-start time (import + app construction).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare and not args.compare.exists():
+        parser.error(
+            f"baseline {args.compare} does not exist; record one with --save first"
+        )
+
+    cases = build_cases()
+
+    results = {}
+    for name, fn in cases.items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(fn, repeat=args.repeat, min_time=args.min_time)
+        print(f"{name:<45} {results[name]['median_us']:>12.2f} us")
+
+    if args.startup:
+        for name, stats in measure_startup(args.repeat).items():
+            if args.filter not in name:
+                continue
+            results[name] = stats
+            print(f"{name:<45} {stats['median_us']:>12.2f} us")
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        rows = compare(results, load_baseline(args.compare), args.tolerance)
+
+        print(f"\n{'case':<45} {'baseline':>12} {'current':>12} {'ratio':>7}")
+        for row in rows:
+            flag = "  REGRESSED" if row["regressed"] else ""
+            print(
+                f"{row['case']:<45} {row['baseline_us']:>12.2f} "
+                f"{row['current_us']:>12.2f} {row['ratio']:>7.2f}{flag}"
+            )
+
+        if any(row["regressed"] for row in rows):
+            print(f"\nRegression beyond {args.tolerance:.0%} tolerance detected.")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
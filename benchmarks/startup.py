@@ -0,0 +1,110 @@
+"""
+Cold-start benchmark.
+
+Each measurement runs in a fresh interpreter so nothing is cached:
+
+    • startup.import_main  – `import main`
+    • startup.app_ready    – `import main; main.app` (what a new pod does
+                             before it can pass its readiness probe)
+
+Usage:
+    python -m benchmarks.startup                 # timings + slowest imports
+    python -m benchmarks.startup --top 25
+
+The same cases can be folded into a baseline with
+`python -m benchmarks.run --startup --save ...`.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Required settings for a throwaway process; real values win if set
+_DEFAULT_ENV = {
+    "DATABASE_URL": "sqlite://",
+    "ADMIN_API_KEY": "startup-benchmark",
+    "ENV": "prod",
+    "LOG_ASYNC": "false",
+}
+
+_SNIPPETS = {
+    "startup.import_main": "import main",
+    "startup.app_ready": "import main; main.app",
+}
+
+_TIMER = (
+    "import time; _t = time.perf_counter(); {code}; "
+    "print((time.perf_counter() - _t) * 1e6)"
+)
+
+
+def _env() -> Dict[str, str]:
+    return {**_DEFAULT_ENV, **os.environ}
+
+
+def _run(code: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _TIMER.format(code=code)],
+        capture_output=True,
+        text=True,
+        env=_env(),
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Median/min/max microseconds per case, in benchmarks.harness format."""
+    results = {}
+    for name, code in _SNIPPETS.items():
+        rounds = [_run(code) for _ in range(repeat)]
+        results[name] = {
+            "median_us": statistics.median(rounds),
+            "min_us": min(rounds),
+            "max_us": max(rounds),
+            "loops": 1,
+        }
+    return results
+
+
+def slowest_imports(top: int = 15) -> List[Tuple[int, str]]:
+    """Cumulative import time (us) per module from `-X importtime`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main; main.app"],
+        capture_output=True,
+        text=True,
+        env=_env(),
+        check=True,
+    )
+
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        rows.append((int(cumulative), module.strip()))
+
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start time.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="How many slow imports to list.")
+    args = parser.parse_args(argv)
+
+    for name, stats in measure_startup(args.repeat).items():
+        print(f"{name:<25} {stats['median_us'] / 1000:>10.1f} ms (min {stats['min_us'] / 1000:.1f})")
+
+    print("\nSlowest imports (cumulative):")
+    for cumulative, module in slowest_imports(args.top):
+        print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,17 +43,15 @@ def add_exception_handlers(app: FastAPI) -> None:
             message=exc.message,
         )
 
-        # If chained exception exists, log the traceback of the cause
+        # If chained exception exists, log the traceback of the cause.
+        # The exception object is passed through; the logging pipeline
+        # skips it for expected error types and otherwise formats it at
+        # render time (see core.log_sampling).
         if exc.__cause__:
             log.warning(
                 "app_exception_cause",
-                cause="".join(
-                    traceback.format_exception(
-                        type(exc.__cause__),
-                        exc.__cause__,
-                        exc.__cause__.__traceback__,
-                    )
-                ),
+                exc_type=type(exc).__name__,
+                cause=exc.__cause__,
             )
 
         return JSONResponse(
@@ -17,6 +17,12 @@ class ErrorCode(StrEnum):
     UNKNOWN_ERROR = "UNKNOWN_ERROR"
     ALREADY_CLOCKED_IN = "ALREADY_CLOCKED_IN"
     NOT_CLOCKED_IN = "NOT_CLOCKED_IN"
+    PROFILER_BUSY = "PROFILER_BUSY"
+    TEMPLATE_LIMIT_REACHED = "TEMPLATE_LIMIT_REACHED"
+    STREAM_LIMIT_REACHED = "STREAM_LIMIT_REACHED"
+    DUPLICATE_ENROLLMENT = "DUPLICATE_ENROLLMENT"
+    IDEMPOTENCY_KEY_REUSED = "IDEMPOTENCY_KEY_REUSED"
+    SHIFT_OVERLAP = "SHIFT_OVERLAP"
 
 class AppException(Exception):
     """
@@ -54,6 +60,18 @@ class DatabaseError(AppException):
         super().__init__(message, ErrorCode.DB_ERROR)
 
 
+class SyncEventAlreadyStored(DatabaseError):
+    """
+    Raised when a concurrent POST /clock/sync stored one of the same
+    event_ids first. services.sync_clock_events retries, so the event is
+    reported as a duplicate; it only reaches a client (as a 500) if that
+    retry conflicts again.
+    """
+
+    def __init__(self, message="Clock sync event was stored by a concurrent request"):
+        super().__init__(message)
+
+
 class EmployeeNotFound(AppException):
     """
     Raised when the requested employee ID or prefix lookup cannot be found.
@@ -136,3 +154,57 @@ class NotClockedIn(AppException):
         super().__init__(message, ErrorCode.NOT_CLOCKED_IN)
 
 
+class ProfilerBusy(AppException):
+    """
+    Raised when a sampling profile is requested while another one is
+    already running in the same worker.
+    """
+    http_status = status.HTTP_409_CONFLICT
+
+    def __init__(self, message="A profile is already running in this worker"):
+        super().__init__(message, ErrorCode.PROFILER_BUSY)
+
+
+class TemplateLimitReached(AppException):
+    """
+    Raised when enrolling another face template for an employee who already
+    has the maximum number allowed (settings.max_face_templates).
+    """
+    http_status = status.HTTP_409_CONFLICT
+
+    def __init__(self, message="Face template limit reached for this employee"):
+        super().__init__(message, ErrorCode.TEMPLATE_LIMIT_REACHED)
+
+
+class StreamLimitReached(AppException):
+    """
+    Raised when a worker already serves its maximum number of status
+    streams (settings.status_stream_max_subscribers).
+    """
+    http_status = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def __init__(self, message="Too many open status streams, retry later"):
+        super().__init__(message, ErrorCode.STREAM_LIMIT_REACHED)
+
+
+class DuplicateEnrollment(AppException):
+    """
+    Raised when a new employee's face matches an enrolled employee at or
+    above settings.duplicate_enrollment_threshold (and
+    settings.duplicate_enrollment_check is "reject").
+    """
+    http_status = status.HTTP_409_CONFLICT
+
+    def __init__(self, message="Face is already enrolled for another employee"):
+        super().__init__(message, ErrorCode.DUPLICATE_ENROLLMENT)
+
+
+class IdempotencyKeyReused(AppException):
+    """
+    Raised when an Idempotency-Key is sent again with a different request
+    body than the request it was first used for (core.idempotency).
+    """
+    http_status = status.HTTP_409_CONFLICT
+
+    def __init__(self, message="Idempotency-Key was already used with a different request body"):
+        super().__init__(message, ErrorCode.IDEMPOTENCY_KEY_REUSED)
@@ -0,0 +1,119 @@
+# core/etag.py
+
+"""
+ETag / If-None-Match support for polled GET routes.
+
+Routes compute an ETag from the data behind the response (e.g. the open
+entry of a status check) and answer a matching If-None-Match with 304 Not
+Modified and no body. ValidatorCache additionally remembers the last ETag
+per resource, so a poll whose ETag is still current is answered before
+touching the database at all:
+
+    • entries are grouped (e.g. one group per employee) and a whole group
+      is invalidated when that data changes in this worker
+    • entries expire after `ttl` seconds, which bounds how long a change
+      made through another worker can go unnoticed
+    • both the number of groups and the variants within one group are
+      LRU-bounded, so a group keyed by client input (e.g. search
+      prefixes) cannot grow without limit
+    • a read that raced with an invalidation is not cached (generation
+      check), so an old ETag is never stored after the change
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request
+from starlette.responses import Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag (quoted) from the repr of the given values."""
+    digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def if_none_match(request: Request, etag: Optional[str]) -> bool:
+    """True if the request's If-None-Match header matches etag."""
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+class ValidatorCache:
+    """
+    Per-worker map of group -> variant -> ETag with TTL, LRU-bounded to
+    `max_groups` groups of at most `max_variants` variants each.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 2.0,
+        max_groups: int = 10_000,
+        max_variants: int = 1_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_groups = max_groups
+        self.max_variants = max_variants
+        self._clock = clock
+        self._lock = threading.Lock()
+        # group -> {variant: (etag, stored_at)}
+        self._groups: "OrderedDict[Hashable, OrderedDict[Hashable, Tuple[str, float]]]" = OrderedDict()
+        # group -> invalidation count (one int per group ever invalidated)
+        self._generations: Dict[Hashable, int] = {}
+
+    def generation(self, group: Hashable) -> int:
+        """Read before loading data; pass to put()."""
+        return self._generations.get(group, 0)
+
+    def get(self, group: Hashable, variant: Hashable = None) -> Optional[str]:
+        if self.ttl <= 0:
+            return None
+        now = self._clock()
+        with self._lock:
+            variants = self._groups.get(group)
+            if variants is None or variant not in variants:
+                return None
+            etag, stored_at = variants[variant]
+            if now - stored_at >= self.ttl:
+                del variants[variant]
+                return None
+            variants.move_to_end(variant)
+            self._groups.move_to_end(group)
+            return etag
+
+    def put(self, group: Hashable, variant: Hashable, etag: str, generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if self._generations.get(group, 0) != generation:
+                return
+            variants = self._groups.setdefault(group, OrderedDict())
+            variants[variant] = (etag, self._clock())
+            variants.move_to_end(variant)
+            while len(variants) > self.max_variants:
+                variants.popitem(last=False)
+            self._groups.move_to_end(group)
+            while len(self._groups) > self.max_groups:
+                self._groups.popitem(last=False)
+
+    def invalidate(self, group: Hashable) -> None:
+        with self._lock:
+            self._generations[group] = self._generations.get(group, 0) + 1
+            self._groups.pop(group, None)
@@ -0,0 +1,592 @@
+# core/face_index.py
+
+"""
+In-memory 1:N identification indexes over normalized face embeddings.
+
+Indexes:
+    • ExactIndex – float32 (N, dim) matrix, one matrix-vector product
+    • Int8Index  – per-vector scaled int8 codes (~4x smaller), scanned in
+                   blocks, then the top candidates are re-ranked exactly
+                   with float32 vectors supplied by the caller
+    • BinaryIndex – 64-byte sign-bit signatures; a popcount Hamming scan
+                    shortlists candidates, which are then scored exactly
+    • IVFIndex    – spherical k-means coarse quantizer with per-cluster
+                    posting matrices; only `nprobe` clusters are scanned
+
+All expose the same interface:
+
+    index.search(query, k) -> [(employee_id, score), ...]   best first
+    index.add(employee_id, vector)                            insert in place
+    index.nbytes                                              resident size
+
+near_duplicate_pairs() finds every pair of rows above a similarity
+threshold (the duplicate-enrollment audit) with blocked matrix products.
+
+FaceGallery caches one index per worker, rebuilding it from the database
+after invalidate() or once it is older than its TTL; new registrations
+are inserted in place instead of forcing a rebuild.
+
+SiteGalleries keeps one FaceGallery per site, created on first use and
+dropped once idle, so identification work scales with the site rather
+than the company.
+"""
+
+import threading
+import time
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple
+
+from core.lazy import lazy_import
+from core.vector_utils import binary_signature, hamming_distances
+
+np = lazy_import("numpy")
+
+Match = Tuple[str, float]
+
+# Fetch exact vectors for candidate ids; ids missing from the result
+# (deleted since the index was built) are dropped
+VectorFetcher = Callable[[List[str]], Mapping[str, Sequence[float]]]
+
+
+def _append_row(matrix: "np.ndarray", row: "np.ndarray") -> "np.ndarray":
+    """matrix with row appended, as a new array (an empty index is (0, 0))."""
+    if len(matrix) == 0:
+        return np.array(row[None, :], dtype=matrix.dtype)
+    return np.vstack([matrix, row[None, :].astype(matrix.dtype)])
+
+
+def _top_k(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """Indices of the k largest scores, best first."""
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(scores, -k)[-k:]
+    return top[np.argsort(scores[top])[::-1]]
+
+
+# ---------------------------------------------------------------------------
+# EXACT
+# ---------------------------------------------------------------------------
+
+class ExactIndex:
+    """
+    Brute-force float32 search. The reference for recall measurements.
+    """
+
+    def __init__(self, ids: Sequence[str], vectors: "np.ndarray"):
+        self.ids = list(ids)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes
+
+    def add(self, employee_id: str, vector: "np.ndarray") -> None:
+        """Append one normalized row."""
+        # ids first: a concurrent search never scores a row without an id
+        self.ids.append(employee_id)
+        self.vectors = _append_row(self.vectors, np.asarray(vector, dtype=np.float32))
+
+    def search(self, query: "np.ndarray", k: int = 1, fetch: Optional[VectorFetcher] = None) -> List[Match]:
+        scores = self.vectors @ np.asarray(query, dtype=np.float32)
+        return [(self.ids[i], float(scores[i])) for i in _top_k(scores, k)]
+
+
+# ---------------------------------------------------------------------------
+# INT8
+# ---------------------------------------------------------------------------
+
+def quantize_int8(vectors: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Symmetric per-row int8 quantization.
+
+    Returns (codes, scales) with vectors ≈ codes * scales[:, None].
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(vectors).max(axis=1, initial=0.0) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class Int8Index:
+    """
+    Quantized search with exact float32 re-ranking.
+
+    Only int8 codes and one float32 scale per row stay resident. A query
+    is quantized the same way and scanned against the codes block by block
+    (each block is widened to float32 so the product runs in BLAS; int8
+    products summed over 512 dims stay exact in float32). Blocks are kept
+    small enough for the widened copy to stay in cache. The best
+    `rerank` candidates are then re-scored exactly against float32 vectors
+    obtained from `fetch` (typically a primary-key lookup). Without a
+    fetcher the approximate scores are returned.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        vectors: "np.ndarray",
+        *,
+        rerank: int = 32,
+        block_rows: int = 512,
+    ):
+        self.ids = list(ids)
+        self.codes, self.scales = quantize_int8(vectors)
+        self.rerank = rerank
+        self.block_rows = block_rows
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes
+
+    def add(self, employee_id: str, vector: "np.ndarray") -> None:
+        """Quantize and append one normalized row."""
+        codes, scales = quantize_int8(vector)
+        # ids, then scales, then codes: a concurrent search reads codes
+        # first and so never sees a code without its scale or id
+        self.ids.append(employee_id)
+        self.scales = np.concatenate([self.scales, scales])
+        self.codes = _append_row(self.codes, codes[0])
+
+    def approximate_scores(self, query: "np.ndarray") -> "np.ndarray":
+        """Approximate cosine similarity of the query to every row."""
+        codes, scales = self.codes, self.scales
+        q_codes, q_scale = quantize_int8(query)
+        q = q_codes[0].astype(np.float32)
+
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), self.block_rows):
+            block = codes[start:start + self.block_rows]
+            scores[start:start + len(block)] = block.astype(np.float32) @ q
+
+        scores *= scales[:len(codes)] * q_scale[0]
+        return scores
+
+    def search(self, query: "np.ndarray", k: int = 1, fetch: Optional[VectorFetcher] = None) -> List[Match]:
+        scores = self.approximate_scores(query)
+        candidates = _top_k(scores, max(k, self.rerank))
+
+        if fetch is None:
+            return [(self.ids[i], float(scores[i])) for i in candidates[:k]]
+
+        found = fetch([self.ids[i] for i in candidates])
+        kept = [self.ids[i] for i in candidates if self.ids[i] in found]
+        if not kept:
+            return []
+
+        vectors = np.asarray([found[e] for e in kept], dtype=np.float32)
+        exact = vectors @ np.asarray(query, dtype=np.float32)
+        return [(kept[i], float(exact[i])) for i in _top_k(exact, k)]
+
+
+# ---------------------------------------------------------------------------
+# BINARY PREFILTER
+# ---------------------------------------------------------------------------
+
+class BinaryIndex:
+    """
+    Hamming-prefiltered exact search.
+
+    Each row's sign bits are packed into uint64 words (512 dims → 8 words,
+    64 bytes, vs 2 KiB of float32). A query scans only the signatures with
+    XOR + popcount, keeps the `shortlist` rows with the smallest Hamming
+    distance, and computes exact cosine similarity on those rows alone.
+
+    Signatures persisted on Employee.signature are used when every row has
+    one; otherwise they are computed from the vectors.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        vectors: "np.ndarray",
+        *,
+        signatures: Optional[Sequence[Optional[bytes]]] = None,
+        shortlist: int = 256,
+    ):
+        self.ids = list(ids)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.shortlist = shortlist
+
+        if signatures is not None and len(self.ids) and all(s is not None for s in signatures):
+            self.signatures = np.frombuffer(b"".join(signatures), dtype=np.uint64).reshape(len(self.ids), -1)
+        else:
+            self.signatures = binary_signature(self.vectors)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.signatures.nbytes + self.vectors.nbytes
+
+    def add(self, employee_id: str, vector: "np.ndarray") -> None:
+        """Append one normalized row and its signature."""
+        vector = np.asarray(vector, dtype=np.float32)
+        # Signatures last: a concurrent search selects rows by signature,
+        # so every selected row already has its vector and id
+        self.ids.append(employee_id)
+        self.vectors = _append_row(self.vectors, vector)
+        self.signatures = _append_row(self.signatures, binary_signature(vector)[0])
+
+    def candidates(self, query: "np.ndarray") -> "np.ndarray":
+        """Row indices of the `shortlist` nearest signatures (unordered)."""
+        distances = hamming_distances(self.signatures, binary_signature(query)[0])
+        m = min(self.shortlist, distances.size)
+        if m >= distances.size:
+            return np.arange(distances.size)
+        return np.argpartition(distances, m - 1)[:m]
+
+    def search(self, query: "np.ndarray", k: int = 1, fetch: Optional[VectorFetcher] = None) -> List[Match]:
+        rows = self.candidates(query)
+        scores = self.vectors[rows] @ np.asarray(query, dtype=np.float32)
+        return [(self.ids[rows[i]], float(scores[i])) for i in _top_k(scores, k)]
+
+
+# ---------------------------------------------------------------------------
+# IVF
+# ---------------------------------------------------------------------------
+
+def train_centroids(
+    vectors: "np.ndarray",
+    nlist: int,
+    *,
+    iterations: int = 10,
+    seed: int = 0,
+    block_rows: int = 8192,
+) -> "np.ndarray":
+    """
+    Spherical k-means: unit-length centroids maximizing cosine similarity.
+
+    Initialized from a random sample of rows; clusters that end up empty
+    are re-seeded with random rows.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    nlist = max(1, min(nlist, n))
+    centroids = vectors[rng.choice(n, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = assign_clusters(vectors, centroids, block_rows)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(n, int(empty.sum()), replace=False)]
+            norms[empty] = np.linalg.norm(sums[empty], axis=1)
+
+        centroids = (sums / norms[:, None]).astype(np.float32)
+
+    return centroids
+
+
+def assign_clusters(vectors: "np.ndarray", centroids: "np.ndarray", block_rows: int = 8192) -> "np.ndarray":
+    """Index of the nearest centroid for every row, computed in blocks."""
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_rows):
+        block = vectors[start:start + block_rows]
+        assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+class IVFIndex:
+    """
+    Inverted-file index: sublinear search without an external vector store.
+
+    Rows are clustered with spherical k-means into `nlist` cells (default
+    ≈ sqrt(N)), each holding a contiguous float32 posting matrix. A query
+    is compared to the centroids, then scored exactly against the rows of
+    its `nprobe` nearest cells only.
+
+    Tuning:
+        nprobe ↑  → recall ↑, latency ↑   (nprobe = nlist is exact search)
+        nlist  ↑  → smaller cells, faster scans, more probes needed
+
+    Centroids are trained on at most `train_sample` rows. add() assigns
+    new rows to their nearest cell without retraining; once more than
+    `retrain_fraction` of the trained size has been added, needs_retrain
+    turns True and FaceGallery rebuilds the index.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        vectors: "np.ndarray",
+        *,
+        nlist: int = 0,
+        nprobe: int = 8,
+        iterations: int = 10,
+        train_sample: int = 50_000,
+        retrain_fraction: float = 0.2,
+        seed: int = 0,
+    ):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n = len(ids)
+
+        self.nprobe = nprobe
+        self.retrain_fraction = retrain_fraction
+        self.trained_size = n
+        self.added = 0
+
+        if n == 0:
+            self.centroids = np.zeros((0, 0), dtype=np.float32)
+            self.postings: List[Tuple[List[str], "np.ndarray"]] = []
+            return
+
+        nlist = nlist or max(1, int(round(np.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        sample = vectors if n <= train_sample else vectors[rng.choice(n, train_sample, replace=False)]
+
+        self.centroids = train_centroids(sample, nlist, iterations=iterations, seed=seed)
+        assignment = assign_clusters(vectors, self.centroids)
+
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(len(self.centroids) + 1))
+        self.postings = [
+            (
+                [ids[i] for i in order[lo:hi]],
+                vectors[order[lo:hi]],
+            )
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(posting_ids) for posting_ids, _ in self.postings)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.centroids.nbytes + sum(matrix.nbytes for _, matrix in self.postings)
+
+    @property
+    def needs_retrain(self) -> bool:
+        return self.added > self.retrain_fraction * max(self.trained_size, 1)
+
+    def add(self, employee_id: str, vector: "np.ndarray") -> None:
+        """Append one normalized row to its nearest cell (no retraining)."""
+        vector = np.asarray(vector, dtype=np.float32)
+        self.added += 1
+
+        if not self.postings:
+            # Untrained (empty) index: seed a single cell with this row
+            self.centroids = vector[None, :].copy()
+            self.postings = [([employee_id], vector[None, :].copy())]
+            return
+
+        cell = int(np.argmax(self.centroids @ vector))
+        posting_ids, matrix = self.postings[cell]
+        # Swap in a new tuple so concurrent searches see a consistent cell
+        self.postings[cell] = (posting_ids + [employee_id], np.vstack([matrix, vector]))
+
+    def search(self, query: "np.ndarray", k: int = 1, fetch: Optional[VectorFetcher] = None) -> List[Match]:
+        query = np.asarray(query, dtype=np.float32)
+        cells = _top_k(self.centroids @ query, self.nprobe)
+
+        ids: List[str] = []
+        scores = []
+        for cell in cells:
+            posting_ids, matrix = self.postings[cell]
+            if posting_ids:
+                ids.extend(posting_ids)
+                scores.append(matrix @ query)
+
+        if not ids:
+            return []
+
+        scores = np.concatenate(scores)
+        return [(ids[i], float(scores[i])) for i in _top_k(scores, k)]
+
+
+INDEX_TYPES = {
+    "exact": ExactIndex,
+    "int8": Int8Index,
+    "binary": BinaryIndex,
+    "ivf": IVFIndex,
+}
+
+
+# ---------------------------------------------------------------------------
+# DUPLICATE PAIRS
+# ---------------------------------------------------------------------------
+
+def near_duplicate_pairs(
+    ids: Sequence[str],
+    vectors: "np.ndarray",
+    threshold: float,
+    *,
+    block_rows: int = 2048,
+    block_cols: int = 8192,
+) -> List[Tuple[str, str, float]]:
+    """
+    Every pair of normalized rows with similarity >= threshold, as
+    (id_a, id_b, score) with id_a listed before id_b in `ids`, best first.
+
+    The upper triangle of the N x N similarity matrix is computed one
+    block_rows x block_cols tile at a time (tiles left of the diagonal
+    are skipped), so peak memory is one tile whatever N is; only the
+    pairs found accumulate.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n = len(ids)
+    pairs: List[Tuple[str, str, float]] = []
+
+    for row_start in range(0, n, block_rows):
+        rows_block = vectors[row_start:row_start + block_rows]
+
+        for col_start in range(row_start, n, block_cols):
+            scores = rows_block @ vectors[col_start:col_start + block_cols].T
+            rows, cols = np.nonzero(scores >= threshold)
+
+            # Keep pairs strictly past the diagonal (global col > global row)
+            upper = col_start + cols > row_start + rows
+            for r, c in zip(rows[upper], cols[upper]):
+                pairs.append((ids[row_start + r], ids[col_start + c], float(scores[r, c])))
+
+    pairs.sort(key=lambda pair: pair[2], reverse=True)
+    return pairs
+
+
+# ---------------------------------------------------------------------------
+# PER-WORKER CACHE
+# ---------------------------------------------------------------------------
+
+class FaceGallery:
+    """
+    Lazily built, periodically refreshed identification index.
+
+    loader(db) returns (employee_ids, normalized float vectors) and
+    optionally a third list of persisted binary signatures. The index
+    is rebuilt on the next get() after invalidate() (called by this
+    worker's writes) or once it is older than `ttl` seconds (to pick up
+    writes made by other workers).
+    """
+
+    def __init__(
+        self,
+        loader: Callable,
+        *,
+        kind: str = "exact",
+        ttl: float = 300.0,
+        index_options: Optional[dict] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loader = loader
+        self.kind = kind
+        self.ttl = ttl
+        self.index_options = index_options or {}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = None
+        self._built_at = 0.0
+
+    def invalidate(self) -> None:
+        self._index = None
+
+    def add(self, employee_id: str, embedding: Sequence[float]) -> None:
+        """
+        Make a newly registered employee searchable by inserting it into
+        the built index, so registrations never force a reload of every
+        embedding. Nothing to do when the index is not built yet.
+        """
+        with self._lock:
+            index = self._index
+            if index is None:
+                return
+            vector = np.asarray(embedding, dtype=np.float32)
+            index.add(employee_id, vector / np.linalg.norm(vector))
+
+    def _fresh(self, index) -> bool:
+        return (
+            index is not None
+            and self._clock() - self._built_at < self.ttl
+            and not getattr(index, "needs_retrain", False)
+        )
+
+    def get(self, db):
+        index = self._index
+        if self._fresh(index):
+            return index
+
+        with self._lock:
+            if not self._fresh(self._index):
+                self._index = self._build(db)
+                self._built_at = self._clock()
+            return self._index
+
+    def _build(self, db):
+        ids, vectors, *extra = self.loader(db)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(ids):
+            vectors = vectors.reshape(0, 0)
+
+        options = dict(self.index_options)
+        if self.kind == "binary" and extra:
+            options["signatures"] = extra[0]
+
+        return INDEX_TYPES[self.kind](ids, vectors, **options)
+
+
+class SiteGalleries:
+    """
+    Per-site FaceGallery registry with idle eviction.
+
+    factory(site_id) builds the FaceGallery for a site; site_id None is the
+    company-wide gallery used by the unscoped routes. Galleries unused for
+    `idle_ttl` seconds are dropped (releasing their index memory) on the
+    next access to the registry.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Optional[str]], FaceGallery],
+        *,
+        idle_ttl: float = 1800.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.factory = factory
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # site_id -> [gallery, last_used]
+        self._galleries: dict = {}
+
+    def __contains__(self, site_id: Optional[str]) -> bool:
+        return site_id in self._galleries
+
+    def get(self, site_id: Optional[str]) -> FaceGallery:
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._galleries.get(site_id)
+            if entry is None:
+                entry = self._galleries[site_id] = [self.factory(site_id), now]
+            entry[1] = now
+            return entry[0]
+
+    def add(self, site_id: str, employee_id: str, embedding: Sequence[float]) -> None:
+        """Propagate a registration to the site's and the company-wide gallery."""
+        with self._lock:
+            galleries = [self._galleries.get(key) for key in {site_id, None}]
+        for entry in galleries:
+            if entry is not None:
+                entry[0].add(employee_id, embedding)
+
+    def _evict_idle(self, now: float) -> None:
+        idle = [
+            site for site, (_, last_used) in self._galleries.items()
+            if now - last_used >= self.idle_ttl
+        ]
+        for site in idle:
+            del self._galleries[site]
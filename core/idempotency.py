@@ -0,0 +1,260 @@
+# core/idempotency.py
+
+"""
+Idempotency-Key support for the clock POST routes.
+
+A kiosk that times out retries the same action with the same
+Idempotency-Key header. The first response is stored and replayed for
+every retry, so the retry does no database work and gets the original
+result (e.g. the clock-in status) instead of AlreadyClockedIn.
+
+    • Keys are scoped to method + path: the same key on another
+      employee's route is a different request.
+    • A hash of the request body is stored with the response; a retry
+      whose body differs (e.g. another sync batch under a reused key)
+      gets 409 IDEMPOTENCY_KEY_REUSED instead of the old response.
+    • Only 2xx and deterministic domain rejections (400 NotClockedIn,
+      404, 409 AlreadyClockedIn) are stored. 5xx, 429 rate limits, 408
+      and validation errors are transient or request-shaped and are not,
+      so a retry with the same key runs again.
+    • Concurrent requests with the same key are serialized per worker;
+      the second waits for the first and replays its response.
+    • Replays carry `Idempotent-Replayed: true`.
+
+Stores: MemoryIdempotencyStore (per worker, LRU + TTL) or
+data.idempotency_store.DatabaseIdempotencyStore (shared by all workers).
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from structlog import get_logger
+
+from core.api_response import fail
+from core.errors import IdempotencyKeyReused
+
+log = get_logger()
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Headers that belong to one response only and are not replayed
+_PER_RESPONSE_HEADERS = {"content-length", "x-request-id", "server-timing", "date"}
+
+# Non-2xx statuses that are replayed: the same request would get the same
+# domain error again (400 NotClockedIn, 404 EmployeeNotFound, 409
+# AlreadyClockedIn)
+_STORED_ERROR_STATUSES = {400, 404, 409}
+
+# Clock POST routes, unscoped or under /sites/{site_id}
+CLOCK_ROUTES = r"^(/sites/[^/]+)?/clock/"
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    # SHA-256 of the request body; empty for responses stored without one
+    request_hash: str = ""
+
+    def to_response(self, replayed: bool = False) -> Response:
+        response = Response(content=self.body, status_code=self.status_code)
+        for name, value in self.headers:
+            response.headers.append(name, value)
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+
+# ---------------------------------------------------------------------------
+# IN-MEMORY STORE
+# ---------------------------------------------------------------------------
+
+class MemoryIdempotencyStore:
+    """
+    Bounded per-worker store: least recently used keys are evicted beyond
+    `max_keys`, and keys older than `ttl` seconds are ignored.
+    """
+
+    blocking = False
+
+    def __init__(
+        self,
+        *,
+        max_keys: int = 10_000,
+        ttl: float = 86_400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (stored_at, response)
+        self._entries: "OrderedDict[str, Tuple[float, StoredResponse]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now - entry[0] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+
+# ---------------------------------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------------------------------
+
+def _storable(status_code: int) -> bool:
+    return 200 <= status_code < 300 or status_code in _STORED_ERROR_STATUSES
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+class IdempotencyMiddleware:
+    """
+    Store and replay responses for POST requests carrying an
+    Idempotency-Key header on paths matching `path_pattern`.
+
+    A plain ASGI middleware: every other request is passed straight to
+    the app, without the extra task and body buffering of
+    BaseHTTPMiddleware. A keyed response is streamed to the client as
+    usual and recorded on the way through.
+    """
+
+    def __init__(self, app, store, path_pattern: str = CLOCK_ROUTES):
+        self.app = app
+        self.store = store
+        self.path_re = re.compile(path_pattern)
+        # key -> [lock, waiters]; entries live only while a key is in flight
+        self._locks: Dict[str, list] = {}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not self.path_re.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = Headers(scope=scope).get(IDEMPOTENCY_HEADER)
+        if not key:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        scoped = hashlib.sha256(f"POST {path} {key}".encode()).hexdigest()
+
+        # Read the body to hash it, then hand it to the app unchanged
+        body = await _read_body(receive)
+        request_hash = hashlib.sha256(body).hexdigest()
+        body_sent = False
+
+        async def replay_body():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async with self._key_lock(scoped):
+            stored = await self._store_call(self.store.get, scoped)
+            if stored is not None:
+                if stored.request_hash and stored.request_hash != request_hash:
+                    log.warning("idempotency_key_reused", path=path)
+                    exc = IdempotencyKeyReused()
+                    response = JSONResponse(
+                        status_code=exc.http_status,
+                        content=fail(exc.code, exc.message).model_dump(),
+                    )
+                    await response(scope, receive, send)
+                    return
+
+                log.info("idempotent_replay", path=path, status=stored.status_code)
+                await stored.to_response(replayed=True)(scope, receive, send)
+                return
+
+            start: dict = {}
+            chunks: List[bytes] = []
+
+            async def record(message):
+                if message["type"] == "http.response.start":
+                    start.update(message)
+                elif message["type"] == "http.response.body":
+                    chunks.append(message.get("body", b""))
+                await send(message)
+
+            await self.app(scope, replay_body, record)
+
+            if not start or not _storable(start["status"]):
+                return
+
+            stored = StoredResponse(
+                status_code=start["status"],
+                headers=[
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in start.get("headers", [])
+                    if name.decode("latin-1").lower() not in _PER_RESPONSE_HEADERS
+                ],
+                body=b"".join(chunks),
+                request_hash=request_hash,
+            )
+            await self._store_call(self.store.put, scoped, stored)
+
+    async def _store_call(self, fn, *args):
+        """Store errors degrade to "no idempotency", never fail the request."""
+        try:
+            if self.store.blocking:
+                return await run_in_threadpool(fn, *args)
+            return fn(*args)
+        except Exception as e:
+            log.warning("idempotency_store_error", error=str(e))
+            return None
+
+    @asynccontextmanager
+    async def _key_lock(self, key: str):
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
@@ -0,0 +1,39 @@
+# core/lazy.py
+
+"""
+Deferred module imports.
+
+    np = lazy_import("numpy")
+
+returns a module object immediately but only executes the real import the
+first time an attribute is accessed. After that the object *is* the real
+module (importlib's LazyLoader swaps its class), so hot paths pay nothing
+extra.
+
+Used for heavy dependencies that are not needed to get a worker to
+"ready" — NumPy is only touched by the first verify/registration.
+Forking servers can resolve them up front with main.preload().
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import `name` lazily. Returns the already-loaded module if present.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
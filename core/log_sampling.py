@@ -0,0 +1,177 @@
+# core/log_sampling.py
+
+"""
+structlog processors that keep high-volume logging cheap.
+
+Request-thread stage (runs before anything is rendered):
+    • EventSampler – per-event sampling rates and per-second rate caps
+    • suppress_expected_causes – drops the chained-traceback event for
+      routine AppException subclasses (EmployeeNotFound, ...)
+
+Formatter stage (runs in the log writer thread when logging is async):
+    • render_exception_cause – formats the chained exception traceback only
+      for events that survived the stages above
+
+Errors are never sampled or capped.
+"""
+
+import random
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Iterable, Optional
+
+from structlog import DropEvent
+
+_ALWAYS_KEEP = frozenset({"error", "critical", "exception", "fatal"})
+
+
+# ---------------------------------------------------------------------------
+# SAMPLING + RATE CAPS
+# ---------------------------------------------------------------------------
+
+class EventSampler:
+    """
+    Drop a fraction of selected events, and cap how many per second pass.
+
+    sample_rates: {"face_verify_start": 0.1} keeps ~10% of that event.
+    rate_limits:  {"clock_status_request": 50} keeps at most 50 per second
+                  per worker; the first event of the next window carries
+                  `suppressed=<n>` so the volume is still visible.
+
+    If the capped event does not recur, its count is handed to
+    `report(event, n)` instead: by the first event of any kind logged
+    after the window has passed, or by flush() (called on logging
+    shutdown). Without `report` the count waits for the event to recur.
+
+    Events not named in either mapping pass through untouched. ERROR and
+    above always pass.
+    """
+
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, int]] = None,
+        *,
+        rand: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+        report: Optional[Callable[[str, int], None]] = None,
+    ):
+        self.sample_rates = dict(sample_rates or {})
+        self.rate_limits = dict(rate_limits or {})
+        self._rand = rand
+        self._clock = clock
+        self._report = report
+        self._lock = threading.Lock()
+        # event -> [window_start_second, passed_in_window, suppressed]
+        self._windows: Dict[str, list] = {}
+        # Last second whose finished windows were swept for pending counts
+        self._swept = 0
+
+    def __call__(self, logger, method_name, event_dict):
+        if method_name in _ALWAYS_KEEP:
+            return event_dict
+
+        event = event_dict.get("event")
+
+        if self._report is not None and self.rate_limits:
+            second = int(self._clock())
+            if second > self._swept:
+                self._sweep(second)
+
+        rate = self.sample_rates.get(event)
+        if rate is not None and self._rand() >= rate:
+            raise DropEvent
+
+        limit = self.rate_limits.get(event)
+        if limit is not None:
+            self._apply_rate_limit(event, limit, event_dict)
+
+        return event_dict
+
+    def _apply_rate_limit(self, event: str, limit: int, event_dict) -> None:
+        second = int(self._clock())
+
+        with self._lock:
+            window = self._windows.get(event)
+            if window is None or window[0] != second:
+                suppressed = window[2] if window is not None else 0
+                window = self._windows[event] = [second, 0, 0]
+                if suppressed:
+                    event_dict["suppressed"] = suppressed
+
+            if window[1] >= limit:
+                window[2] += 1
+                raise DropEvent
+
+            window[1] += 1
+
+    def _sweep(self, second: int) -> None:
+        """Report counts of windows before `second` (at most once a second)."""
+        with self._lock:
+            if second <= self._swept:
+                return
+            self._swept = second
+            pending = self._take_pending(lambda window: window[0] < second)
+        self._emit(pending)
+
+    def flush(self) -> None:
+        """Report every pending suppressed count now."""
+        with self._lock:
+            pending = self._take_pending(lambda window: True)
+        self._emit(pending)
+
+    def _take_pending(self, finished) -> list:
+        pending = []
+        for event, window in list(self._windows.items()):
+            if window[2] and finished(window):
+                pending.append((event, window[2]))
+                window[2] = 0
+        return pending
+
+    def _emit(self, pending) -> None:
+        if self._report is None:
+            return
+        for event, suppressed in pending:
+            self._report(event, suppressed)
+
+
+# ---------------------------------------------------------------------------
+# TRACEBACK SUPPRESSION
+# ---------------------------------------------------------------------------
+
+def suppress_expected_causes(quiet_exceptions: Iterable[str]):
+    """
+    Build a processor dropping `app_exception_cause` events whose
+    `exc_type` is an expected AppException subclass name.
+
+    The `app_exception` summary event is still logged; only the chained
+    traceback is skipped.
+    """
+    quiet = frozenset(quiet_exceptions)
+
+    def processor(logger, method_name, event_dict):
+        if (
+            event_dict.get("event") == "app_exception_cause"
+            and event_dict.get("exc_type") in quiet
+        ):
+            raise DropEvent
+        return event_dict
+
+    return processor
+
+
+def render_exception_cause(logger, method_name, event_dict):
+    """
+    Replace an exception object under `cause` with its formatted traceback.
+
+    Deferring this to the formatter means the traceback is only built for
+    events that are actually written, and off the request thread when the
+    async log pipeline is enabled.
+    """
+    cause = event_dict.get("cause")
+    if isinstance(cause, BaseException):
+        event_dict["cause"] = "".join(
+            traceback.format_exception(type(cause), cause, cause.__traceback__)
+        )
+    return event_dict
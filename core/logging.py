@@ -1,30 +1,426 @@
 # core/logging.py
 
-import structlog
+import atexit
 import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
 from logging.config import dictConfig
+from typing import Dict, Iterable, Literal, Optional
+
+import structlog
+
+from core.log_sampling import (
+    EventSampler,
+    render_exception_cause,
+    suppress_expected_causes,
+)
+from core.timing import record
+
+DropPolicy = Literal["drop_newest", "drop_oldest"]
+
+_SENTINEL = object()
+
+# Active background writer (None when logging synchronously)
+_writer: Optional["BatchingLogWriter"] = None
+
+# Sampler of the current configuration; flushed on shutdown
+_sampler: Optional[EventSampler] = None
+
+
+# ---------------------------------------------------------------------------
+# ASYNC PIPELINE
+# ---------------------------------------------------------------------------
+
+class BatchingLogWriter:
+    """
+    Background thread that renders and writes log records in batches.
+
+    Request threads only enqueue the structlog event dict (see
+    QueueLogHandler); rendering to JSON/console text and the write syscall
+    both happen here, one write + flush per batch.
+
+    Overload behavior:
+        The queue is bounded. When it is full, records are discarded
+        according to `drop_policy` and counted in `dropped`:
+            • drop_newest – discard the incoming record
+            • drop_oldest – evict the oldest queued record to make room
+        ERROR and above wait briefly for space before being dropped.
+        The writer reports drops with a `log_records_dropped` event.
+    """
+
+    def __init__(
+        self,
+        stream,
+        formatter: logging.Formatter,
+        *,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        drop_policy: DropPolicy = "drop_newest",
+    ):
+        self.stream = stream
+        self.formatter = formatter
+        self.batch_size = batch_size
+        self.drop_policy = drop_policy
+
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._drop_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run,
+            name="log-writer",
+            daemon=True,
+        )
+
+    # --- Producer side (request threads) -----------------------------------
+
+    def submit(self, record: logging.LogRecord) -> None:
+        """Enqueue a record without blocking (except briefly for errors)."""
+        try:
+            if record.levelno >= logging.ERROR:
+                self._queue.put(record, timeout=0.1)
+            else:
+                self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.drop_policy == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+
+        with self._drop_lock:
+            self.dropped += 1
+
+    # --- Lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def flush(self) -> None:
+        """Block until every record enqueued so far has been written."""
+        self._queue.join()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything still queued, then stop the thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_SENTINEL, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    # --- Consumer side (writer thread) -------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = self._write_batch(batch)
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if stopping:
+                return
+
+    def _write_batch(self, batch) -> bool:
+        stopping = False
+        lines = []
+
+        for record in batch:
+            if record is _SENTINEL:
+                stopping = True
+                continue
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                continue
+
+        dropped_line = self._drop_report()
+        if dropped_line:
+            lines.append(dropped_line)
+
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except Exception:
+                # Never let a broken stream kill the writer thread
+                pass
+
+        return stopping
+
+    def _drop_report(self) -> Optional[str]:
+        dropped = self.dropped
+        if dropped == self._reported_dropped:
+            return None
+
+        newly = dropped - self._reported_dropped
+        self._reported_dropped = dropped
+
+        # Same record shape as a structlog event routed through the stdlib
+        (event_dict,), kwargs = structlog.stdlib.ProcessorFormatter.wrap_for_formatter(
+            None,
+            "warning",
+            {
+                "event": "log_records_dropped",
+                "dropped": newly,
+                "dropped_total": dropped,
+                "level": "warning",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        record = logging.getLogger(__name__).makeRecord(
+            __name__, logging.WARNING, __file__, 0, event_dict, (), None, **kwargs
+        )
+
+        try:
+            return self.formatter.format(record)
+        except Exception:
+            return None
+
+
+class QueueLogHandler(logging.Handler):
+    """
+    stdlib handler that hands records to a BatchingLogWriter.
+
+    Unlike logging.handlers.QueueHandler it does not format in emit(), so
+    the calling thread pays only for the enqueue.
+    """
+
+    def __init__(self, writer: BatchingLogWriter):
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.writer.submit(record)
+
+
+def shutdown_logging(timeout: float = 5.0) -> None:
+    """
+    Flush and stop the background log writer, if one is running.
+
+    Called on application shutdown and at interpreter exit. Any records
+    logged afterwards are written synchronously instead of being queued
+    with no consumer.
+    """
+    global _writer
+    # Counts of capped events that never recurred would otherwise be lost
+    if _sampler is not None:
+        _sampler.flush()
+
+    writer, _writer = _writer, None
+    if writer is None:
+        return
+
+    writer.stop(timeout)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueLogHandler) and handler.writer is writer:
+            fallback = logging.StreamHandler(writer.stream)
+            fallback.setFormatter(writer.formatter)
+            root.removeHandler(handler)
+            root.addHandler(fallback)
+
+
+def get_log_stats() -> dict:
+    """Drop counter and queue depth of the async pipeline (empty if sync)."""
+    if _writer is None:
+        return {}
+    return {"dropped": _writer.dropped, "queued": _writer._queue.qsize()}
+
 
-def init_logging(env: str = "dev"):
+def _restart_writer_after_fork() -> None:
+    """
+    Threads do not survive fork(). When the app is built in a preloading
+    master (gunicorn --preload), give each worker its own writer thread
+    and an empty queue.
+    """
+    global _writer
+    if _writer is None:
+        return
+
+    old = _writer
+    _writer = BatchingLogWriter(
+        old.stream,
+        old.formatter,
+        queue_size=old._queue.maxsize,
+        batch_size=old.batch_size,
+        drop_policy=old.drop_policy,
+    )
+    _writer.start()
+
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, QueueLogHandler) and handler.writer is old:
+            handler.writer = _writer
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_writer_after_fork)
+
+
+# ---------------------------------------------------------------------------
+# INIT
+# ---------------------------------------------------------------------------
+
+# Key stamped on the event dict by the first processor; popped (never
+# rendered) by _TimedLogger
+_LOG_STARTED = "_log_started"
+
+
+# stdlib Logger methods structlog emits through
+_LEVEL_METHODS = frozenset(
+    {"debug", "info", "warning", "warn", "error", "exception", "critical", "fatal", "log", "msg"}
+)
+
+
+def _start_log_timer(logger, method_name, event_dict):
+    """First processor: note when the event entered the chain."""
+    event_dict[_LOG_STARTED] = time.perf_counter()
+    return event_dict
+
+
+class _TimedLogger:
+    """
+    Wraps the stdlib logger structlog hands events to, and records each
+    event's time from _start_log_timer through rendering and write (or
+    the enqueue, when logging is async) as the request's `log` phase
+    (core.timing). Events dropped by a processor are not recorded.
+    """
+
+    __slots__ = ("_logger",)
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    def __getattr__(self, name):
+        method = getattr(self._logger, name)
+        if name not in _LEVEL_METHODS:
+            return method
+
+        def timed(*args, **kwargs):
+            started = None
+            if args and isinstance(args[0], dict):
+                started = args[0].pop(_LOG_STARTED, None)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if started is not None:
+                    record("log", (time.perf_counter() - started) * 1000)
+
+        return timed
+
+
+class _TimedLoggerFactory(structlog.stdlib.LoggerFactory):
+    def __init__(self):
+        # Name loggers after the caller, not this module
+        super().__init__(ignore_frame_names=[__name__])
+
+    def __call__(self, *args) -> _TimedLogger:
+        return _TimedLogger(super().__call__(*args))
+
+
+def _report_suppressed(event: str, suppressed: int) -> None:
+    structlog.get_logger().info("log_events_suppressed", suppressed_event=event, suppressed=suppressed)
+
+
+def init_logging(
+    env: str = "dev",
+    *,
+    async_logging: bool = False,
+    queue_size: int = 10_000,
+    batch_size: int = 256,
+    drop_policy: DropPolicy = "drop_newest",
+    sample_rates: Optional[Dict[str, float]] = None,
+    rate_limits: Optional[Dict[str, int]] = None,
+    quiet_exceptions: Iterable[str] = (),
+):
     """
     Initialize structured logging.
     - dev: pretty console logs + DEBUG level
     - prod: JSON logs + INFO level
+
+    With async_logging=True, rendering and writing move to a background
+    BatchingLogWriter behind a bounded queue; otherwise a synchronous
+    StreamHandler is used.
+
+    sample_rates / rate_limits / quiet_exceptions configure the volume
+    controls in core.log_sampling; they run before any rendering so
+    dropped events cost almost nothing.
     """
+    global _writer, _sampler
 
     # Set Python logging level based on environment
     python_log_level = "DEBUG" if env == "dev" else "INFO"
     structlog_log_level = logging.DEBUG if env == "dev" else logging.INFO
 
+    # Renderer selection (pretty vs json)
+    renderer = (
+        structlog.dev.ConsoleRenderer()
+        if env == "dev"
+        else structlog.processors.JSONRenderer()
+    )
+
+    # Rendering happens in the stdlib formatter so it can run off-thread.
+    # Foreign (non-structlog) records get the same level + timestamp.
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            render_exception_cause,
+            renderer,
+        ],
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+    )
+
+    # Replace any writer from a previous init (tests build many apps)
+    shutdown_logging()
+
+    _sampler = EventSampler(sample_rates, rate_limits, report=_report_suppressed)
+
+    if async_logging:
+        _writer = BatchingLogWriter(
+            sys.stderr,
+            formatter,
+            queue_size=queue_size,
+            batch_size=batch_size,
+            drop_policy=drop_policy,
+        )
+        _writer.start()
+        handler = {"()": QueueLogHandler, "writer": _writer}
+    else:
+        handler = {
+            "class": "logging.StreamHandler",
+            "formatter": "structlog",
+        }
+
     dictConfig({
         "version": 1,
+        # Re-initializing must not silence loggers created by earlier use
+        "disable_existing_loggers": False,
         "formatters": {
-            "plain": {"format": "%(message)s"},
+            "structlog": {"()": lambda: formatter},
         },
         "handlers": {
-            "default": {
-                "class": "logging.StreamHandler",
-                "formatter": "plain",
-            }
+            "default": handler,
         },
         "root": {
             "handlers": ["default"],
@@ -32,21 +428,17 @@ def init_logging(env: str = "dev"):
         },
     })
 
-    # Renderer selection (pretty vs json)
-    renderer = (
-        structlog.dev.ConsoleRenderer()
-        if env == "dev"
-        else structlog.processors.JSONRenderer()
-    )
-
     structlog.configure(
         processors=[
+            _start_log_timer,
+            _sampler,
+            suppress_expected_causes(quiet_exceptions),
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
-            renderer,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         wrapper_class=structlog.make_filtering_bound_logger(structlog_log_level),
-        logger_factory=structlog.stdlib.LoggerFactory(),
+        logger_factory=_TimedLoggerFactory(),
         cache_logger_on_first_use=True,
     )
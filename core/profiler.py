@@ -0,0 +1,214 @@
+# core/profiler.py
+
+"""
+On-demand statistical sampling profiler for a live worker.
+
+The thread serving the profile request periodically snapshots the Python
+stack of every other thread in the process (sys._current_frames) and counts
+identical stacks. Nothing is installed or hooked while no profile is
+running, so the cost outside a profiling window is exactly zero.
+
+Request filtering:
+    When a route prefix and/or header is given, a thread's stack is only
+    counted while one of its frames is handling a matching Starlette
+    Request (found via the endpoint's `request` argument). Every endpoint
+    that sits behind SlowAPI already takes `request: Request`.
+
+Output formats:
+    • collapsed   – "outer;inner;leaf 42" lines (flamegraph.pl, speedscope)
+    • speedscope  – speedscope "sampled" JSON document
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.errors import ProfilerBusy
+
+Frame = Tuple[str, str, int]   # (function, filename, first line)
+Stack = Tuple[Frame, ...]      # outermost → innermost
+
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+_active_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# REQUEST MATCHING
+# ---------------------------------------------------------------------------
+
+def build_request_matcher(
+    route: Optional[str] = None,
+    header: Optional[str] = None,
+) -> Optional[Callable]:
+    """
+    Build a predicate over a thread's innermost frame.
+
+    route:  path prefix, e.g. "/employees/verify"
+    header: "name" (header present) or "name=value" (exact match)
+
+    Returns None when neither is given, meaning "profile everything".
+    """
+    if route is None and header is None:
+        return None
+
+    header_name, header_value = None, None
+    if header is not None:
+        name, _, value = header.partition("=")
+        header_name = name.strip().lower().encode("latin-1")
+        header_value = value.strip().encode("latin-1") if value else None
+
+    def scope_matches(scope: dict) -> bool:
+        if route is not None and not scope.get("path", "").startswith(route):
+            return False
+        if header_name is not None:
+            values = [v for k, v in scope.get("headers", ()) if k == header_name]
+            if not values:
+                return False
+            if header_value is not None and header_value not in values:
+                return False
+        return True
+
+    def matcher(frame) -> bool:
+        while frame is not None:
+            if "request" in frame.f_code.co_varnames:
+                scope = getattr(frame.f_locals.get("request"), "scope", None)
+                if isinstance(scope, dict) and scope.get("type") == "http":
+                    return scope_matches(scope)
+            frame = frame.f_back
+        return False
+
+    return matcher
+
+
+# ---------------------------------------------------------------------------
+# PROFILE RESULT
+# ---------------------------------------------------------------------------
+
+class ProfileResult:
+    """
+    Aggregated stack samples from one profiling window.
+    """
+
+    def __init__(self, counts: Counter, interval: float, duration: float):
+        self.counts = counts
+        self.interval = interval
+        self.duration = duration
+
+    @property
+    def total_samples(self) -> int:
+        return sum(self.counts.values())
+
+    @staticmethod
+    def _label(frame: Frame) -> str:
+        func, filename, line = frame
+        return f"{func} ({filename}:{line})"
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format, heaviest stacks first."""
+        lines = [
+            ";".join(self._label(f) for f in stack) + f" {count}"
+            for stack, count in self.counts.most_common()
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self, name: str = "tradetrack-profile") -> Dict:
+        """speedscope file-format document with one sampled profile."""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+
+        for stack, count in self.counts.most_common():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "tradetrack-backend",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+# ---------------------------------------------------------------------------
+# SAMPLING
+# ---------------------------------------------------------------------------
+
+def _stack_of(frame) -> Stack:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def _is_idle(stack: Stack) -> bool:
+    if not stack:
+        return True
+    func, filename, _ = stack[-1]
+    return (filename.rsplit("/", 1)[-1], func) in _IDLE_LEAVES
+
+
+def sample(
+    seconds: float,
+    *,
+    interval: float = 0.005,
+    matcher: Optional[Callable] = None,
+    include_idle: bool = False,
+) -> ProfileResult:
+    """
+    Sample all other threads for `seconds` and return the aggregated stacks.
+
+    Blocks the calling thread for the duration. Only one profile may run
+    per process at a time; a concurrent call raises ProfilerBusy.
+    """
+    if not _active_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+
+    try:
+        caller = threading.get_ident()
+        counts: Counter = Counter()
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        while time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == caller:
+                    continue
+                if matcher is not None and not matcher(frame):
+                    continue
+                stack = _stack_of(frame)
+                if include_idle or not _is_idle(stack):
+                    counts[stack] += 1
+            time.sleep(interval)
+
+        return ProfileResult(counts, interval, time.perf_counter() - started)
+
+    finally:
+        _active_lock.release()
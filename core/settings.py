@@ -16,7 +16,8 @@ Design philosophy:
       settings never influence the test database
 """
 
-from typing import Literal
+from functools import lru_cache
+from typing import Dict, List, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -30,8 +31,9 @@ class Settings(BaseSettings):
         - env             ("dev" | "test" | "prod")
 
     These MUST be provided by environment variables (or `.env` locally).
-    If missing, pydantic raises a clear ValidationError immediately on import,
-    preventing the application from starting with bad configuration.
+    If missing, pydantic raises a clear ValidationError as soon as the
+    settings are first loaded (get_settings()), preventing the application
+    from starting with bad configuration.
 
     Optional fields with defaults:
         - face_match_threshold
@@ -53,11 +55,136 @@ class Settings(BaseSettings):
     face_match_threshold: float = 0.5
     embedding_dim: int = 512
 
+    # Multi-template enrollment
+    # Extra templates per employee on top of the primary embedding; verify
+    # fuses the per-template scores with "max" (best match) or "mean".
+    max_face_templates: int = 5
+    face_template_fusion: Literal["max", "mean"] = "max"
+
+    # Multi-frame probes (VerifyFaceRequest.embeddings)
+    # Per-frame scores are combined with "mean", "max" or "k_of_n"
+    # (at least probe_k frames must pass the threshold).
+    probe_aggregate: Literal["mean", "max", "k_of_n"] = "mean"
+    probe_k: int = 2
+
+    # 1:N identification (POST /employees/identify)
+    # identify_index:
+    #   "exact"  – float32 matrix
+    #   "int8"   – quantized codes (~4x less memory) re-ranked exactly over
+    #              identify_rerank candidates
+    #   "binary" – sign-bit signature Hamming prefilter, exact scoring on
+    #              the identify_shortlist nearest signatures
+    #   "ivf"    – k-means inverted file; scans identify_nprobe of
+    #              identify_nlist cells (0 = ≈sqrt(N)). New registrations
+    #              are inserted in place; the index is retrained once they
+    #              exceed identify_retrain_fraction of its trained size.
+    # Each worker rebuilds its index after local writes or after
+    # identify_cache_ttl_seconds (to see other workers' writes).
+    identify_index: Literal["exact", "int8", "binary", "ivf"] = "exact"
+    identify_rerank: int = 32
+    identify_shortlist: int = 256
+    identify_nlist: int = 0
+    identify_nprobe: int = 8
+    identify_retrain_fraction: float = 0.2
+    identify_cache_ttl_seconds: float = 300.0
+
+    # Duplicate enrollment check at registration. The new face is searched
+    # in the company-wide identification index; a match at or above
+    # duplicate_enrollment_threshold is rejected with 409 ("reject"),
+    # registered with a warning logged ("flag"), or not looked for ("off").
+    # Only primary embeddings are compared, not additional face templates.
+    # scripts.audit_duplicate_enrollments finds pairs already enrolled.
+    duplicate_enrollment_check: Literal["reject", "flag", "off"] = "flag"
+    duplicate_enrollment_threshold: float = 0.8
+
+    # Per-site identification galleries (routes under /sites/{site_id}/...)
+    # not used for this long are dropped to free their memory.
+    site_gallery_idle_seconds: float = 1800.0
+
+    # Read replicas (comma-separated SQLAlchemy URLs; empty = primary only)
+    # Search, verify, identify and clock status read from a replica.
+    # After a clock action, that employee's reads stay on the primary for
+    # replica_sticky_seconds; an unreachable replica is skipped for
+    # replica_retry_seconds.
+    database_replica_urls: str = ""
+    replica_sticky_seconds: float = 5.0
+    replica_retry_seconds: float = 10.0
+
+    # Group commit for clock in/out (data.clock_writer)
+    # Concurrent clock events are collected for up to
+    # clock_group_commit_window_ms (or clock_group_commit_max_batch events)
+    # and committed in one transaction. Trades a few ms of latency for far
+    # fewer commits at shift change.
+    clock_group_commit: bool = False
+    clock_group_commit_window_ms: float = 2.0
+    clock_group_commit_max_batch: int = 128
+
+    # Idempotency-Key replay on the clock POST routes (core.idempotency)
+    # "memory" keeps up to idempotency_max_keys per worker; "database"
+    # shares keys across workers via the idempotency_keys table.
+    idempotency_store: Literal["off", "memory", "database"] = "memory"
+    idempotency_ttl_seconds: float = 86_400.0
+    idempotency_max_keys: int = 10_000
+
+    # Cold archive of closed time entries (data.archive)
+    # Directory written by scripts/archive_time_entries.py; timesheets
+    # merge archived entries back in. Empty = no archive.
+    time_entry_archive_dir: str = ""
+
+    # Clock status stream (GET /clock/stream, core.status_broker)
+    # Changes are pushed within a worker; every stream also re-reads its
+    # statuses every status_stream_resync_seconds (0 = never, for a single
+    # worker) to pick up changes made through other workers.
+    status_stream_max_subscribers: int = 1000
+    status_stream_heartbeat_seconds: float = 15.0
+    status_stream_resync_seconds: float = 30.0
+
+    # Conditional GET for clock status and employee search (core.etag)
+    # A worker answers a matching If-None-Match from memory for up to
+    # etag_cache_seconds after its last read (0 = always read); changes
+    # made through the same worker invalidate it at once. Search responses
+    # may be reused by clients for search_cache_max_age_seconds.
+    etag_cache_seconds: float = 2.0
+    etag_cache_max_groups: int = 10_000
+    # Per-group cap; all searches share one group, one variant per prefix
+    etag_cache_max_variants: int = 1_000
+    search_cache_max_age_seconds: int = 10
+
     # CORS configuration
     # In development: "*" (allow all)
     # In production: comma-separated list like "https://app.example.com,https://admin.example.com"
     cors_origins: str = "*"
 
+    # Per-request phase timing (Server-Timing header + request_timing log)
+    # Off by default; when disabled the instrumentation is a no-op.
+    server_timing_enabled: bool = False
+
+    # Logging pipeline
+    # log_async moves rendering + writes to a background thread behind a
+    # bounded queue; under overload records are dropped per log_drop_policy
+    # ("drop_newest" | "drop_oldest") and counted. Opt-in because it is
+    # lossy: synchronous logging never drops a record.
+    log_async: bool = False
+    log_queue_size: int = 10_000
+    log_batch_size: int = 256
+    log_drop_policy: Literal["drop_newest", "drop_oldest"] = "drop_newest"
+
+    # Log volume controls (JSON in env vars), e.g.
+    #   LOG_SAMPLE_RATES='{"face_verify_start": 0.1}'   keep ~10%
+    #   LOG_RATE_LIMITS='{"clock_status_request": 50}'  max 50/s per worker
+    # ERROR-level events are never sampled or capped.
+    log_sample_rates: Dict[str, float] = {}
+    log_rate_limits: Dict[str, int] = {}
+
+    # AppException subclasses whose chained traceback is not logged
+    log_quiet_exceptions: List[str] = [
+        "EmployeeNotFound",
+        "EmployeeAlreadyExists",
+        "FaceConfidenceTooLow",
+        "AlreadyClockedIn",
+        "NotClockedIn",
+    ]
+
     # ------------------------------------------------------------------
     # Settings behavior (Pydantic v2)
     # ------------------------------------------------------------------
@@ -69,7 +196,19 @@ class Settings(BaseSettings):
     )
 
 
-# Global singleton — imported everywhere as `from core.settings import settings`
-# This instantiation immediately validates configuration and throws fast
-# if required values are missing.
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings, reading env / `.env` exactly once.
+
+    Validation still fails fast, but on first use (app creation, Alembic)
+    rather than as a side effect of importing this module.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Backwards compatibility for `from core.settings import settings`
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
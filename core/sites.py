@@ -0,0 +1,15 @@
+# core/sites.py
+from typing import Optional
+
+from fastapi import Request
+
+
+def current_site(request: Request) -> Optional[str]:
+    """
+    FastAPI dependency returning the site a request is scoped to.
+
+    Routers are mounted twice: unscoped (/employees, /clock) and under
+    /sites/{site_id}/... . Scoped mounts carry `site_id` as a path
+    parameter; unscoped ones return None, meaning "every site".
+    """
+    return request.path_params.get("site_id")
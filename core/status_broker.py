@@ -0,0 +1,195 @@
+# core/status_broker.py
+
+"""
+In-process fan-out of clock status changes to streaming subscribers.
+
+services.clock_service publishes a StatusChange after every committed
+clock in/out; GET /clock/stream (services.status_stream) subscribes and
+forwards matching changes to the client as Server-Sent Events.
+
+    • publish() may be called from any thread (clock routes run in the
+      threadpool); delivery hops onto each subscriber's event loop.
+    • Backpressure: a subscription keeps only the latest pending change
+      per employee, so a slow client receives the current state instead
+      of a growing backlog, and memory stays bounded by the number of
+      employees it watches.
+    • Each worker has its own broker. Changes made through another worker
+      are picked up by the stream's periodic resync from the database.
+    • Synchronous listeners (add_listener) see every change as it is
+      published, e.g. to drop cached status ETags (core.etag).
+    • shared_read() lets streams that resync on the same tick share one
+      roster read instead of each reloading it.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple, TypeVar
+
+from structlog import get_logger
+
+from core.errors import StreamLimitReached
+
+log = get_logger()
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StatusChange:
+    employee_id: str
+    site_id: str
+    is_clocked_in: bool
+    clock_in_time: Optional[datetime] = None
+
+
+class Subscription:
+    """
+    One subscriber's view of the broker. Create with
+    StatusBroker.subscribe() and close() when the client goes away.
+    """
+
+    def __init__(
+        self,
+        broker: "StatusBroker",
+        loop: asyncio.AbstractEventLoop,
+        employee_ids: Optional[FrozenSet[str]],
+        site_id: Optional[str],
+    ):
+        self.employee_ids = employee_ids
+        self.site_id = site_id
+        self._broker = broker
+        self._loop = loop
+        # employee_id -> latest undelivered change (coalesced)
+        self._pending: "OrderedDict[str, StatusChange]" = OrderedDict()
+        self._wake = asyncio.Event()
+        self.closed = False
+
+    @property
+    def broker(self) -> "StatusBroker":
+        return self._broker
+
+    def matches(self, change: StatusChange) -> bool:
+        if self.site_id is not None and change.site_id != self.site_id:
+            return False
+        return self.employee_ids is None or change.employee_id in self.employee_ids
+
+    def _offer(self, change: StatusChange) -> None:
+        # Runs on the subscriber's loop
+        self._pending.pop(change.employee_id, None)
+        self._pending[change.employee_id] = change
+        self._wake.set()
+
+    async def get(self, timeout: float) -> List[StatusChange]:
+        """
+        Pending changes, oldest first, waiting up to `timeout` seconds for
+        at least one. Returns [] on timeout.
+        """
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        changes = list(self._pending.values())
+        self._pending.clear()
+        self._wake.clear()
+        return changes
+
+    def close(self) -> None:
+        """Unsubscribe; safe to call more than once."""
+        if not self.closed:
+            self.closed = True
+            self._broker._remove(self)
+
+
+class StatusBroker:
+    """
+    Process-local pub/sub of StatusChange events, capped at
+    `max_subscribers` concurrent subscriptions.
+    """
+
+    def __init__(self, max_subscribers: int = 1000):
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscriptions: List[Subscription] = []
+        self._listeners: List[Callable[[StatusChange], None]] = []
+        # scope -> (tick, result of that tick's read); one entry per scope
+        self._reads: Dict[Hashable, Tuple[int, Future]] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        employee_ids: Optional[List[str]] = None,
+        site_id: Optional[str] = None,
+    ) -> Subscription:
+        """
+        Subscribe the running event loop to changes for employee_ids (all
+        employees when None) at site_id (every site when None).
+
+        Raises:
+            StreamLimitReached: If max_subscribers are already connected.
+        """
+        subscription = Subscription(
+            self,
+            asyncio.get_running_loop(),
+            frozenset(employee_ids) if employee_ids is not None else None,
+            site_id,
+        )
+        with self._lock:
+            if len(self._subscriptions) >= self.max_subscribers:
+                raise StreamLimitReached()
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def add_listener(self, listener: Callable[[StatusChange], None]) -> None:
+        """Call listener(change) in the publishing thread for every change."""
+        self._listeners.append(listener)
+
+    def publish(self, change: StatusChange) -> None:
+        """Deliver a change to every matching subscription (thread-safe)."""
+        for listener in self._listeners:
+            listener(change)
+
+        # Copy-on-write list: iterate without holding the lock
+        for subscription in self._subscriptions:
+            if not subscription.matches(change):
+                continue
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._offer, change)
+            except RuntimeError:
+                # The subscriber's loop is gone (worker shutting down)
+                self._remove(subscription)
+
+    async def shared_read(self, scope: Hashable, tick: int, load: Callable[[], T]) -> T:
+        """
+        Result of load() for `scope` at `tick`, run on a broker thread.
+
+        The first caller for a (scope, tick) starts load(); callers with
+        the same pair, on any event loop, share its result, so it must not
+        be mutated. A caller that goes away does not cancel the read the
+        others wait for. Only the latest tick is kept per scope.
+        """
+        with self._lock:
+            entry = self._reads.get(scope)
+            if entry is not None and entry[0] == tick:
+                future = entry[1]
+            else:
+                if self._pool is None:
+                    # Created on first use, i.e. in the serving worker
+                    self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="status-read")
+                future = self._pool.submit(load)
+                if entry is None or entry[0] < tick:
+                    self._reads[scope] = (tick, future)
+
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
@@ -0,0 +1,188 @@
+# core/timing.py
+
+"""
+Lightweight per-request phase timing.
+
+Services and repositories wrap their phases in `span(...)`:
+
+    with span("db"):
+        emp = db.query(...).first()
+
+When ServerTimingMiddleware is installed, every request gets a fresh
+SpanRecorder stored in a ContextVar. Spans accumulate into it, and the
+middleware:
+
+    • adds a `Server-Timing` header to the response start, covering the
+      phases up to that point (visible in browser devtools)
+    • logs one `request_timing` event with all phase durations once the
+      response has been sent
+
+Two phases are recorded outside services:
+
+    • parse – Pydantic validation of request bodies (TimedModel)
+    • log   – structlog calls made during the request: processors plus
+              rendering and write, or the enqueue when logging is async
+              (core.logging)
+
+When the middleware is not installed there is no recorder, and span()
+returns a shared no-op context manager — one ContextVar lookup per call.
+"""
+
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+import structlog
+from pydantic import BaseModel, model_validator
+from starlette.datastructures import MutableHeaders
+
+log = structlog.get_logger()
+
+_NOOP = nullcontext()
+_recorder: ContextVar[Optional["SpanRecorder"]] = ContextVar("span_recorder", default=None)
+
+
+# ---------------------------------------------------------------------------
+# RECORDING
+# ---------------------------------------------------------------------------
+
+class SpanRecorder:
+    """
+    Accumulates durations (milliseconds) per phase name.
+
+    Repeated spans with the same name add up, so a request that performs
+    two DB round-trips reports one `db` total.
+    """
+
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + elapsed_ms
+
+    def header_value(self, total_ms: Optional[float] = None) -> str:
+        """Render durations in Server-Timing syntax: `db;dur=1.23, ...`."""
+        parts = [f"{name};dur={ms:.2f}" for name, ms in self.durations.items()]
+        if total_ms is not None:
+            parts.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(parts)
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "started")
+
+    def __init__(self, recorder: SpanRecorder, name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+def span(name: str):
+    """
+    Time a block as phase `name` if a recorder is active, else do nothing.
+
+    Names must be valid HTTP tokens (no spaces or commas).
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NOOP
+    return _Span(recorder, name)
+
+
+def record(name: str, elapsed_ms: float) -> None:
+    """Add an already measured duration to phase `name`, if recording."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add(name, elapsed_ms)
+
+
+def start_recording() -> SpanRecorder:
+    """
+    Activate a fresh recorder in the current context and return it.
+
+    Used by the middleware, and by benchmarks/tests that call services
+    directly.
+    """
+    recorder = SpanRecorder()
+    _recorder.set(recorder)
+    return recorder
+
+
+class TimedModel(BaseModel):
+    """
+    Base for request body schemas: validation is recorded as `parse`.
+
+    Use it for the top-level body model only; nested models validated
+    inside it are already included.
+    """
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _record_parse(cls, data, handler):
+        with span("parse"):
+            return handler(data)
+
+
+# ---------------------------------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------------------------------
+
+class ServerTimingMiddleware:
+    """
+    Record phase spans for each request and expose them via Server-Timing.
+
+    A plain ASGI middleware (like core.idempotency.IdempotencyMiddleware):
+    the app runs in this task, so the recorder ContextVar reaches it
+    directly and streamed responses pass through unbuffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = SpanRecorder()
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        status = None
+        # RequestIDMiddleware stores the request id here
+        state = scope.setdefault("state", {})
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", recorder.header_value(total_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _recorder.reset(token)
+
+        total_ms = (time.perf_counter() - started) * 1000
+
+        log.info(
+            "request_timing",
+            request_id=state.get("request_id"),
+            path=scope["path"],
+            method=scope["method"],
+            status=status,
+            total_ms=round(total_ms, 2),
+            phases={name: round(ms, 2) for name, ms in recorder.durations.items()},
+        )
@@ -1,7 +1,11 @@
-import numpy as np
 from typing import List
 
-def normalize_vector(vec: List[float]) -> np.ndarray:
+from core.lazy import lazy_import
+
+# NumPy is resolved on first use so importing the app stays fast
+np = lazy_import("numpy")
+
+def normalize_vector(vec: List[float]) -> "np.ndarray":
     """
     Normalize a numeric vector to unit length.
 
@@ -54,3 +58,120 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     v1 = normalize_vector(vec1)
     v2 = normalize_vector(vec2)
     return float(np.dot(v1, v2))
+
+
+def normalize_rows(matrix: List[List[float]]) -> "np.ndarray":
+    """
+    Normalize every row of a 2-D array to unit length.
+
+    Parameters:
+        matrix (List[List[float]]):
+            Stack of vectors, one per row (e.g. an employee's face templates).
+
+    Returns:
+        np.ndarray:
+            float64 array of shape (rows, dim) with ||row|| = 1 for each row.
+
+    Raises:
+        ValueError:
+            If the input is not 2-D or any row has zero magnitude.
+    """
+    arr = np.asarray(matrix, dtype=np.float64)
+    if arr.ndim != 2:
+        raise ValueError("Expected a 2-D array")
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    if np.any(norms == 0):
+        raise ValueError("Matrix has a zero-magnitude row")
+    return arr / norms
+
+
+def template_similarity(
+    query_vec: "np.ndarray",
+    templates: List["np.ndarray"],
+    fusion: str = "max",
+    aggregate: str = "mean",
+    k: int = 1,
+) -> float:
+    """
+    Score one or more probes against several enrolled templates in one
+    matrix product.
+
+    Parameters:
+        query_vec (np.ndarray):
+            Normalized probe embedding, shape (dim,), or a stack of
+            normalized probes (one per captured frame), shape (m, dim).
+        templates (List[np.ndarray]):
+            Normalized templates, one per row, shape (n, dim).
+        fusion (str):
+            How each probe's similarities to the templates are combined:
+            "max"  – best single match (default)
+            "mean" – average similarity across templates
+        aggregate (str):
+            How the per-probe scores are combined into one decision score:
+            "mean"   – average over frames (default)
+            "max"    – best frame
+            "k_of_n" – k-th best frame, i.e. the score passes the threshold
+                       only if at least k frames do
+        k (int):
+            Frames required for "k_of_n" (capped at the number of probes).
+
+    Returns:
+        float:
+            Combined cosine similarity in the range [-1.0, 1.0].
+    """
+    scores = np.atleast_2d(query_vec) @ np.asarray(templates).T
+
+    if fusion == "mean":
+        per_probe = scores.mean(axis=1)
+    else:
+        per_probe = scores.max(axis=1)
+
+    if aggregate == "max":
+        return float(per_probe.max())
+    if aggregate == "k_of_n":
+        kth = min(max(k, 1), per_probe.size)
+        return float(np.sort(per_probe)[-kth])
+    return float(per_probe.mean())
+
+
+def binary_signature(vectors: List[List[float]]) -> "np.ndarray":
+    """
+    Pack the sign bits of each vector into uint64 words.
+
+    Parameters:
+        vectors (List[List[float]]):
+            One vector per row, or a single 1-D vector. Dimension must be
+            a multiple of 64 (512-d embeddings give 8 words / 64 bytes).
+
+    Returns:
+        np.ndarray:
+            uint64 array of shape (rows, dim // 64). The Hamming distance
+            between two signatures approximates the angle between the
+            original vectors.
+    """
+    arr = np.atleast_2d(np.asarray(vectors))
+    return np.packbits(arr > 0, axis=1).view(np.uint64)
+
+
+def signature_bytes(vec: List[float]) -> bytes:
+    """
+    Binary signature of a single vector as bytes, for Employee.signature.
+    """
+    return binary_signature(vec).tobytes()
+
+
+def hamming_distances(signatures: "np.ndarray", query: "np.ndarray") -> "np.ndarray":
+    """
+    Popcount Hamming distance from one query signature to every row.
+
+    Parameters:
+        signatures (np.ndarray):
+            uint64 array of shape (n, words).
+        query (np.ndarray):
+            uint64 array of shape (words,) or (1, words).
+
+    Returns:
+        np.ndarray:
+            Differing bit counts, shape (n,).
+    """
+    return np.bitwise_count(signatures ^ query.reshape(1, -1)).sum(axis=1, dtype=np.int32)
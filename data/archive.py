@@ -0,0 +1,206 @@
+# data/archive.py
+
+"""
+Cold archive of closed time entries as compressed columnar files.
+
+Layout of an archive directory:
+
+    manifest.json          – segment list (atomically replaced on change)
+    segment-<stamp>.npz    – one archival run's rows, NumPy savez_compressed
+
+Each segment stores one array per column (columnar, so a scan reads only
+what it needs and compresses well):
+
+    id           int64
+    employee     uint32   code into `employees` (dictionary encoding)
+    site         uint32   code into `sites`
+    clock_in     datetime64[s]
+    clock_out    datetime64[s]
+    employees    str      distinct employee ids of the segment
+    sites        str      distinct site ids of the segment
+
+The manifest records each segment's clock_in range, so a read only opens
+segments overlapping the requested window. Archival writes the segment
+and manifest before deleting the rows from the database, and
+services.timesheet merges archived and live rows by id, so a crash
+between the two steps never double counts.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from core.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class ArchivedEntry:
+    """Read-only row from the archive; mirrors the TimeEntry columns."""
+    id: int
+    employee_id: str
+    site_id: str
+    clock_in: datetime
+    clock_out: datetime
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Archived timestamps are naive UTC, like time_entries."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _to_datetime64(values: Iterable[datetime]) -> "np.ndarray":
+    return np.array(list(values), dtype="datetime64[s]")
+
+
+@lru_cache(maxsize=8)
+def _load_segment(path: str, sha256: str) -> Dict[str, "np.ndarray"]:
+    """Decompressed columns of a segment (cached; keyed by content hash)."""
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+class TimeEntryArchive:
+    """
+    Append-only archive directory with range-pruned reads.
+
+    Thread-safe for concurrent readers; writers (the archival script) are
+    expected to run one at a time.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._manifest: Optional[dict] = None
+        self._manifest_mtime: Optional[float] = None
+
+    # --- Manifest ----------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST
+
+    def segments(self) -> List[dict]:
+        """Manifest entries, reloaded when the archival job changes them."""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            return []
+
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                self._manifest = json.loads(self.manifest_path.read_text())
+                self._manifest_mtime = mtime
+            return list(self._manifest["segments"])
+
+    def _write_manifest(self, segments: List[dict]) -> None:
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"version": 1, "segments": segments}, indent=2))
+        os.replace(tmp, self.manifest_path)
+
+    # --- Write ------------------------------------------------------------
+
+    def append(self, entries: List) -> Optional[dict]:
+        """
+        Write closed entries (TimeEntry or ArchivedEntry) as a new segment
+        and register it in the manifest. Returns the manifest entry, or
+        None when there is nothing to write.
+        """
+        if not entries:
+            return None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        employees, employee_codes = np.unique(
+            np.array([e.employee_id for e in entries]), return_inverse=True
+        )
+        sites, site_codes = np.unique(
+            np.array([e.site_id for e in entries]), return_inverse=True
+        )
+        clock_in = _to_datetime64(e.clock_in for e in entries)
+        columns = {
+            "id": np.array([e.id for e in entries], dtype=np.int64),
+            "employee": employee_codes.astype(np.uint32),
+            "site": site_codes.astype(np.uint32),
+            "clock_in": clock_in,
+            "clock_out": _to_datetime64(e.clock_out for e in entries),
+            "employees": employees,
+            "sites": sites,
+        }
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = self.root / f"segment-{stamp}.npz"
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **columns)
+            f.flush()
+            os.fsync(f.fileno())
+
+        segment = {
+            "file": path.name,
+            "rows": len(entries),
+            "min_clock_in": str(clock_in.min()),
+            "max_clock_in": str(clock_in.max()),
+            "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write_manifest(self.segments() + [segment])
+        return segment
+
+    # --- Read -------------------------------------------------------------
+
+    def read(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        employee_id: Optional[str] = None,
+        site_id: Optional[str] = None,
+    ) -> List[ArchivedEntry]:
+        """
+        Archived entries with start <= clock_in < end, by clock_in.
+        Offset-aware bounds are converted to UTC first.
+        """
+        lo = np.datetime64(_naive_utc(start), "s")
+        hi = np.datetime64(_naive_utc(end), "s")
+        rows: List[ArchivedEntry] = []
+
+        for segment in self.segments():
+            if np.datetime64(segment["max_clock_in"]) < lo or np.datetime64(segment["min_clock_in"]) >= hi:
+                continue
+
+            cols = _load_segment(str(self.root / segment["file"]), segment["sha256"])
+            mask = (cols["clock_in"] >= lo) & (cols["clock_in"] < hi)
+
+            if employee_id is not None:
+                code = np.searchsorted(cols["employees"], employee_id)
+                if code == len(cols["employees"]) or cols["employees"][code] != employee_id:
+                    continue
+                mask &= cols["employee"] == code
+            if site_id is not None:
+                code = np.searchsorted(cols["sites"], site_id)
+                if code == len(cols["sites"]) or cols["sites"][code] != site_id:
+                    continue
+                mask &= cols["site"] == code
+
+            for i in np.flatnonzero(mask):
+                rows.append(ArchivedEntry(
+                    id=int(cols["id"][i]),
+                    employee_id=str(cols["employees"][cols["employee"][i]]),
+                    site_id=str(cols["sites"][cols["site"][i]]),
+                    clock_in=cols["clock_in"][i].item(),
+                    clock_out=cols["clock_out"][i].item(),
+                ))
+
+        rows.sort(key=lambda e: e.clock_in)
+        return rows
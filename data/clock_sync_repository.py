@@ -0,0 +1,127 @@
+"""
+Repository layer for offline kiosk sync (POST /clock/sync).
+
+Reads are batched (one query per table for the whole sync request) and
+the resulting time entries plus sync records are written in a single
+transaction. Ordering and validation rules live in
+services.sync_clock_events.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import structlog
+
+from core.timing import span
+from data.daily_hours_repository import record_shifts
+from data.models import ClockSyncEvent, TimeEntry
+from core.errors import DatabaseError, SyncEventAlreadyStored
+
+log = structlog.get_logger()
+
+
+# ---------------------------------------------------------------------------
+# READ
+# ---------------------------------------------------------------------------
+
+def get_synced_events(db: Session, event_ids: List[str]) -> Dict[str, ClockSyncEvent]:
+    """
+    Previously received sync events among event_ids, keyed by event_id.
+    """
+    try:
+        with span("db"):
+            rows = (
+                db.query(ClockSyncEvent)
+                .filter(ClockSyncEvent.event_id.in_(event_ids))
+                .all()
+            )
+    except Exception as e:
+        log.error(
+            "repo_get_synced_events_error",
+            count=len(event_ids),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query sync events: {e}") from e
+
+    return {row.event_id: row for row in rows}
+
+
+# ---------------------------------------------------------------------------
+# CREATE / UPDATE
+# ---------------------------------------------------------------------------
+
+def save_sync_batch(
+    db: Session,
+    new_entries: List[TimeEntry],
+    records: List[Tuple[ClockSyncEvent, Optional[TimeEntry]]],
+) -> List[Optional[int]]:
+    """
+    Persist one sync request in a single transaction.
+
+    new_entries are inserted together: on PostgreSQL the ORM batches them
+    into multi-row INSERT ... RETURNING statements (SQLite falls back to
+    one statement per row, still inside this transaction). Open entries
+    closed by the sync were loaded into this session and are flushed as
+    an executemany UPDATE. Each sync record is linked to the time entry
+    it created or closed, and closed shifts are added to the daily_hours
+    rollup.
+
+    Returns the linked time entry ids in `records` order, read before the
+    commit expires the objects (so no per-row reload).
+
+    Raises SyncEventAlreadyStored (after rolling back) when an event_id
+    was inserted by a concurrent sync in the meantime.
+    """
+    try:
+        with span("db"):
+            db.add_all(new_entries)
+            db.flush()
+
+            entry_ids = [entry.id if entry is not None else None for _, entry in records]
+            for (record, _), entry_id in zip(records, entry_ids):
+                record.time_entry_id = entry_id
+            db.add_all([record for record, _ in records])
+
+            # An entry opened and closed in the same sync has two records
+            closed = {
+                id(entry): entry
+                for _, entry in records
+                if entry is not None and entry.clock_out is not None
+            }
+            record_shifts(db, closed.values())
+
+            db.commit()
+
+        log.debug(
+            "repo_save_sync_batch_success",
+            inserted=len(new_entries),
+            events=len(records),
+        )
+
+        return entry_ids
+
+    except IntegrityError as e:
+        db.rollback()
+        stored = get_synced_events(db, [record.event_id for record, _ in records])
+        if not stored:
+            log.error(
+                "repo_save_sync_batch_error",
+                events=len(records),
+                error=str(e),
+            )
+            raise DatabaseError(f"Failed to save clock sync batch: {e}") from e
+        log.warning(
+            "repo_save_sync_batch_concurrent_duplicate",
+            events=len(records),
+            stored=len(stored),
+        )
+        raise SyncEventAlreadyStored() from e
+
+    except Exception as e:
+        db.rollback()
+        log.error(
+            "repo_save_sync_batch_error",
+            events=len(records),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to save clock sync batch: {e}") from e
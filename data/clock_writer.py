@@ -0,0 +1,316 @@
+# data/clock_writer.py
+
+"""
+Group-commit write path for clock events.
+
+At shift change hundreds of clock-ins arrive within seconds, and the
+default path (data.time_entry_repository) pays one commit — one fsync on
+the primary — per request. GroupCommitWriter instead collects concurrent
+clock events for a few milliseconds on a background thread and applies
+them in a single transaction:
+
+    1. one SELECT for the batch's open entries
+    2. one multi-row INSERT ... RETURNING for the clock-ins
+    3. one UPDATE ... RETURNING for the clock-outs
+    4. one upsert of their daily_hours rollup rows
+    5. one COMMIT
+
+Each request thread blocks on its own Future. Business-rule rejections
+(AlreadyClockedIn / NotClockedIn) are set on the individual item; if the
+batch transaction fails before its COMMIT, its items are retried one per
+transaction so a single bad row only fails its own request. Once COMMIT
+has been issued the events are never applied again: a failed (possibly
+ambiguous) COMMIT fails its items with DatabaseError, and after a
+successful one the futures are resolved from the returned rows.
+
+Enabled with CLOCK_GROUP_COMMIT=true (see core.settings).
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from structlog import get_logger
+
+from core.errors import AlreadyClockedIn, DatabaseError, NotClockedIn
+from data.daily_hours_repository import record_shifts
+from data.models import DEFAULT_SITE, Employee, TimeEntry
+
+log = get_logger()
+
+_SENTINEL = object()
+
+_RETURNING = (
+    TimeEntry.id,
+    TimeEntry.employee_id,
+    TimeEntry.clock_in,
+    TimeEntry.clock_out,
+    TimeEntry.site_id,
+)
+
+
+@dataclass
+class _ClockEvent:
+    op: Literal["in", "out"]
+    employee_id: str
+    future: Future = field(default_factory=Future)
+
+
+class GroupCommitWriter:
+    """
+    Background thread that commits clock events in batches.
+
+    A batch closes `window_ms` after its first event arrives or when it
+    holds `max_batch` events. An employee appearing twice in one batch
+    (in then out) is applied in order, in a follow-up transaction.
+
+    The thread starts on first use (and again in a forked worker), so the
+    writer can be built in a preloading gunicorn master.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        window_ms: float = 2.0,
+        max_batch: int = 128,
+        timeout: float = 10.0,
+    ):
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.timeout = timeout
+
+        self._sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self._queue: queue.Queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    # --- Producer side (request threads) -----------------------------------
+
+    def clock_in(self, employee_id: str) -> TimeEntry:
+        """Clock in; raises AlreadyClockedIn or DatabaseError."""
+        return self._submit("in", employee_id)
+
+    def clock_out(self, employee_id: str) -> TimeEntry:
+        """Clock out; raises NotClockedIn or DatabaseError."""
+        return self._submit("out", employee_id)
+
+    def _submit(self, op: str, employee_id: str) -> TimeEntry:
+        """
+        Queue one event and wait for its outcome.
+
+        After `timeout` seconds an event still waiting in the queue is
+        cancelled (the writer skips it), so the DatabaseError means
+        nothing was written and the kiosk can retry. An event whose
+        transaction has already started is waited for once more; only if
+        that also times out can the write still commit after the error.
+        """
+        self._ensure_started()
+        event = _ClockEvent(op, employee_id)
+        self._queue.put(event)
+        try:
+            return event.future.result(timeout=self.timeout)
+        except TimeoutError as e:
+            if event.future.cancel():
+                raise DatabaseError("Timed out waiting for clock write") from e
+        try:
+            return event.future.result(timeout=self.timeout)
+        except TimeoutError as e:
+            raise DatabaseError("Timed out waiting for clock write to commit") from e
+
+    # --- Lifecycle ---------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="clock-writer",
+                daemon=True,
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Commit everything still queued, then stop the thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_SENTINEL)
+        self._thread.join(timeout)
+
+    # --- Consumer side (writer thread) -------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _SENTINEL:
+                return
+
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is _SENTINEL:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            self._write(batch)
+
+            if stopping:
+                return
+
+    def _write(self, batch: List[_ClockEvent]) -> None:
+        # Skip events whose caller timed out and cancelled them
+        batch = [event for event in batch if event.future.set_running_or_notify_cancel()]
+
+        # One event per employee per transaction, in arrival order
+        while batch:
+            seen = set()
+            current, deferred = [], []
+            for event in batch:
+                target = deferred if event.employee_id in seen else current
+                target.append(event)
+                seen.add(event.employee_id)
+
+            try:
+                self._apply(current)
+            except _CommitFailed as e:
+                # The COMMIT may have reached the database; applying the
+                # events again could clock someone in twice
+                log.error("clock_group_commit_failed", size=len(current), error=str(e))
+                for event in current:
+                    _fail(event, e)
+            except Exception as e:
+                # Raised before the COMMIT: nothing was written
+                log.warning("clock_group_batch_failed", size=len(current), error=str(e))
+                for event in current:
+                    try:
+                        self._apply([event])
+                    except Exception as item_error:
+                        _fail(event, item_error)
+
+            batch = deferred
+
+    def _apply(self, events: List[_ClockEvent]) -> None:
+        """
+        Apply one transaction's events, then resolve their futures.
+
+        Raises only before the COMMIT (nothing written) or _CommitFailed.
+        """
+        outcomes: Dict[str, object] = {}
+
+        with self._sessionmaker() as db:
+            employee_ids = [event.employee_id for event in events]
+            open_entries = dict(
+                db.execute(
+                    select(TimeEntry.employee_id, TimeEntry.id).where(
+                        TimeEntry.employee_id.in_(employee_ids),
+                        TimeEntry.clock_out.is_(None),
+                    )
+                ).all()
+            )
+
+            clock_ins, clock_outs = [], []
+            for event in events:
+                is_open = event.employee_id in open_entries
+                if event.op == "in":
+                    if is_open:
+                        outcomes[event.employee_id] = AlreadyClockedIn()
+                    else:
+                        clock_ins.append(event.employee_id)
+                else:
+                    if is_open:
+                        clock_outs.append(open_entries[event.employee_id])
+                    else:
+                        outcomes[event.employee_id] = NotClockedIn()
+
+            rows = []
+            if clock_ins:
+                rows += db.execute(
+                    insert(TimeEntry)
+                    .values([
+                        {"employee_id": employee_id, "site_id": _employee_site(employee_id)}
+                        for employee_id in clock_ins
+                    ])
+                    .returning(*_RETURNING)
+                ).all()
+            if clock_outs:
+                closed = db.execute(
+                    update(TimeEntry)
+                    .where(TimeEntry.id.in_(clock_outs))
+                    .values(clock_out=func.now())
+                    .returning(*_RETURNING),
+                    execution_options={"synchronize_session": False},
+                ).all()
+                record_shifts(db, closed)
+                rows += closed
+
+            try:
+                db.commit()
+            except Exception as e:
+                raise _CommitFailed(str(e)) from e
+
+        # Committed: from here on a failure is reported, never replayed
+        try:
+            self._resolve(events, outcomes, rows)
+        except Exception as e:
+            log.error("clock_group_commit_resolve_failed", size=len(events), error=str(e))
+            for event in events:
+                if not event.future.done():
+                    _fail(event, e)
+
+        log.debug(
+            "clock_group_commit",
+            size=len(events),
+            clock_ins=len(clock_ins),
+            clock_outs=len(clock_outs),
+        )
+
+    def _resolve(self, events: List[_ClockEvent], outcomes: Dict[str, object], rows) -> None:
+        for row in rows:
+            outcomes[row.employee_id] = TimeEntry(**row._mapping)
+
+        for event in events:
+            outcome = outcomes[event.employee_id]
+            if isinstance(outcome, Exception):
+                event.future.set_exception(outcome)
+            else:
+                event.future.set_result(outcome)
+
+
+class _CommitFailed(Exception):
+    """COMMIT raised; whether the transaction was applied is unknown."""
+
+
+def _fail(event: _ClockEvent, error: Exception) -> None:
+    event.future.set_exception(DatabaseError(f"Failed to write clock event: {error}"))
+
+
+def _employee_site(employee_id: str):
+    """Same site copy as data.time_entry_repository.create_entry."""
+    return func.coalesce(
+        select(Employee.site_id)
+        .where(Employee.employee_id == employee_id)
+        .scalar_subquery(),
+        DEFAULT_SITE,
+    )
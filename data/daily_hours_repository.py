@@ -0,0 +1,265 @@
+"""
+Repository layer for the daily_hours rollup.
+
+record_shifts() is called inside the clock-out transaction of every write
+path (time_entry_repository.close_entry, the group-commit writer and
+offline sync), so the rollup is exactly as current as time_entries.
+rebuild_daily_hours() recomputes a date range from the raw entries (and
+the cold archive) for backfills and repairs; it locks the rollup against
+those clock-outs while it runs, so it is safe during working hours.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+import structlog
+
+from core.timing import span
+from data.models import DailyHours, TimeEntry
+from core.errors import DatabaseError, ServerMisconfigured
+
+log = structlog.get_logger()
+
+# Archived shifts are found by clock_in, so a rebuild also reads shifts
+# that started this long before the range to catch ones crossing into it
+ARCHIVE_LOOKBACK = timedelta(days=2)
+
+
+# ---------------------------------------------------------------------------
+# SHIFT SPLITTING
+# ---------------------------------------------------------------------------
+
+def split_by_day(clock_in: datetime, clock_out: datetime) -> List[Tuple[date, int]]:
+    """
+    Seconds of a shift falling on each calendar day it covers.
+
+    A 22:00 → 06:00 shift yields [(day1, 7200), (day2, 21600)]; an
+    empty shift yields one zero-second part so it still counts as an
+    entry.
+    """
+    parts = []
+    start = clock_in
+    while start < clock_out:
+        midnight = datetime.combine(start.date() + timedelta(days=1), time.min)
+        end = min(midnight, clock_out)
+        parts.append((start.date(), int((end - start).total_seconds())))
+        start = end
+    return parts or [(clock_in.date(), 0)]
+
+
+def _accumulate(
+    totals: Dict[Tuple[str, date], list],
+    shift,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> None:
+    """Add one closed shift to totals[(employee_id, day)] = [site, seconds, entries]."""
+    for i, (day, seconds) in enumerate(split_by_day(shift.clock_in, shift.clock_out)):
+        if (start is not None and day < start) or (end is not None and day >= end):
+            continue
+        row = totals.setdefault((shift.employee_id, day), [shift.site_id, 0, 0])
+        row[1] += seconds
+        if i == 0:
+            row[2] += 1
+
+
+def _rows(totals: Dict[Tuple[str, date], list]) -> List[dict]:
+    # Key order keeps concurrent upserts from deadlocking on each other
+    return [
+        {"employee_id": employee_id, "day": day, "site_id": site_id, "seconds": seconds, "entries": entries}
+        for (employee_id, day), (site_id, seconds, entries) in sorted(totals.items())
+    ]
+
+
+# ---------------------------------------------------------------------------
+# INCREMENTAL UPDATE
+# ---------------------------------------------------------------------------
+
+def record_shifts(db: Session, shifts: Iterable) -> None:
+    """
+    Add closed shifts (anything with employee_id, site_id, clock_in and
+    clock_out) to the rollup with one upsert.
+
+    Does not commit: the caller's clock-out transaction commits the entry
+    and its rollup together.
+    """
+    totals: Dict[Tuple[str, date], list] = {}
+    for shift in shifts:
+        _accumulate(totals, shift)
+    if not totals:
+        return
+
+    stmt = _upsert_dialect(db).insert(DailyHours).values(_rows(totals))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyHours.employee_id, DailyHours.day],
+        set_={
+            "seconds": DailyHours.seconds + stmt.excluded.seconds,
+            "entries": DailyHours.entries + stmt.excluded.entries,
+        },
+    )
+    db.execute(stmt)
+
+
+def _upsert_dialect(db: Session):
+    """Dialect module whose insert() supports ON CONFLICT DO UPDATE."""
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        return postgresql
+    if name == "sqlite":
+        return sqlite
+    raise ServerMisconfigured(f"daily_hours upsert is not implemented for {name}")
+
+
+# ---------------------------------------------------------------------------
+# REBUILD
+# ---------------------------------------------------------------------------
+
+def rebuild_daily_hours(db: Session, start: date, end: date, archive=None) -> int:
+    """
+    Recompute rollup rows for days in [start, end) from closed entries,
+    including archived ones when an archive (data.archive) is given.
+    Returns the number of rows written.
+
+    The rollup is locked before the entries are read: on PostgreSQL with
+    LOCK TABLE ... IN EXCLUSIVE MODE (reads continue, writes wait), on
+    SQLite by the DELETE taking the database write lock. A clock-out
+    committed before the lock is in the read; one still in flight waits
+    and adds its shift after the rebuild commits. Either way it is
+    counted once, but clock-outs stall for the length of the rebuild, so
+    keep ranges short (scripts.rebuild_daily_hours does one month per
+    transaction).
+    """
+    lo = datetime.combine(start, time.min)
+    hi = datetime.combine(end, time.min)
+    totals: Dict[Tuple[str, date], list] = {}
+
+    try:
+        with span("db"):
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(text("LOCK TABLE daily_hours IN EXCLUSIVE MODE"))
+            db.execute(delete(DailyHours).where(DailyHours.day >= start, DailyHours.day < end))
+
+            # >= lo keeps a zero-length shift at the start of the range
+            live = db.execute(
+                select(
+                    TimeEntry.id,
+                    TimeEntry.employee_id,
+                    TimeEntry.site_id,
+                    TimeEntry.clock_in,
+                    TimeEntry.clock_out,
+                )
+                .where(TimeEntry.clock_in < hi, TimeEntry.clock_out >= lo)
+                .execution_options(yield_per=10_000)
+            )
+            live_ids = set()
+            for entry in live:
+                live_ids.add(entry.id)
+                _accumulate(totals, entry, start, end)
+
+        if archive is not None:
+            for entry in archive.read(lo - ARCHIVE_LOOKBACK, hi):
+                if entry.id not in live_ids:
+                    _accumulate(totals, entry, start, end)
+
+        rows = _rows(totals)
+        with span("db"):
+            if rows:
+                db.execute(insert(DailyHours), rows)
+            db.commit()
+
+        log.info(
+            "repo_rebuild_daily_hours_success",
+            start=start.isoformat(),
+            end=end.isoformat(),
+            rows=len(rows),
+        )
+
+        return len(rows)
+
+    except Exception as e:
+        db.rollback()
+        log.error(
+            "repo_rebuild_daily_hours_error",
+            start=start.isoformat(),
+            end=end.isoformat(),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to rebuild daily hours: {e}") from e
+
+
+# ---------------------------------------------------------------------------
+# READ
+# ---------------------------------------------------------------------------
+
+def get_daily_hours(
+    db: Session,
+    start: date,
+    end: date,
+    employee_id: Optional[str] = None,
+    site_id: Optional[str] = None,
+) -> List[DailyHours]:
+    """Rollup rows for days in [start, end), by employee then day."""
+    try:
+        query = db.query(DailyHours).filter(DailyHours.day >= start, DailyHours.day < end)
+        if employee_id is not None:
+            query = query.filter(DailyHours.employee_id == employee_id)
+        if site_id is not None:
+            query = query.filter(DailyHours.site_id == site_id)
+
+        with span("db"):
+            return query.order_by(DailyHours.employee_id, DailyHours.day).all()
+
+    except Exception as e:
+        log.error(
+            "repo_get_daily_hours_error",
+            employee_id=employee_id,
+            site_id=site_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query daily hours: {e}") from e
+
+
+def get_hours_totals(
+    db: Session,
+    start: date,
+    end: date,
+    site_id: Optional[str] = None,
+) -> List[Tuple[str, str, int, int, int]]:
+    """
+    Per-employee totals for days in [start, end):
+    (employee_id, site_id, seconds, entries, days worked).
+    """
+    try:
+        query = (
+            db.query(
+                DailyHours.employee_id,
+                func.max(DailyHours.site_id),
+                func.sum(DailyHours.seconds),
+                func.sum(DailyHours.entries),
+                func.count(),
+            )
+            .filter(DailyHours.day >= start, DailyHours.day < end)
+        )
+        if site_id is not None:
+            query = query.filter(DailyHours.site_id == site_id)
+
+        with span("db"):
+            rows = (
+                query.group_by(DailyHours.employee_id)
+                .order_by(DailyHours.employee_id)
+                .all()
+            )
+
+    except Exception as e:
+        log.error(
+            "repo_get_hours_totals_error",
+            site_id=site_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query hours totals: {e}") from e
+
+    return [tuple(row) for row in rows]
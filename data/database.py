@@ -5,10 +5,26 @@ Build FastAPI DB dependency from an SQLAlchemy engine.
 
 This is intentionally minimal. The app provides the engine,
 and we return a get_session dependency bound to it.
+
+Read replicas (optional):
+    ReplicaRouter picks an engine for read-only routes — round-robin over
+    healthy replicas, or the primary when there are none — and
+    build_read_session_dependency turns it into a get_read_session
+    dependency. Writes always use get_session (the primary).
 """
 
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import Engine
+from structlog import get_logger
+
+log = get_logger()
+
 
 def build_session_dependency(engine: Engine):
     """
@@ -33,3 +49,127 @@ def build_session_dependency(engine: Engine):
 def make_get_session(engine: Engine):
     return build_session_dependency(engine)
 
+
+# ---------------------------------------------------------------------------
+# READ REPLICAS
+# ---------------------------------------------------------------------------
+
+class ReplicaRouter:
+    """
+    Chooses the engine for a read-only request.
+
+    Routing:
+        • round-robin over replicas that are not marked down
+        • the primary (None) when no replica is configured or healthy
+        • the primary for `sticky_seconds` after record_write(key), so a
+          client reads its own clock action instead of a lagging replica
+
+    Health checks are passive: a replica whose connection fails is marked
+    down and skipped for `retry_seconds`, then tried again by the next
+    request routed to it.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Engine],
+        *,
+        sticky_seconds: float = 5.0,
+        retry_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.replicas = list(replicas)
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next = 0
+        # replica index -> time it may be retried
+        self._down_until: Dict[int, float] = {}
+        # sticky key -> time reads may return to replicas
+        self._sticky_until: Dict[str, float] = {}
+
+    def choose(self, key: Optional[str] = None) -> Optional[Engine]:
+        """Replica engine for this read, or None for the primary."""
+        if not self.replicas:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            if key is not None and self._sticky_until.get(key, 0.0) > now:
+                return None
+
+            for _ in range(len(self.replicas)):
+                i = self._next
+                self._next = (i + 1) % len(self.replicas)
+                if self._down_until.get(i, 0.0) <= now:
+                    return self.replicas[i]
+
+        return None
+
+    def record_write(self, key: str) -> None:
+        """Pin reads for `key` to the primary for sticky_seconds."""
+        if not self.replicas:
+            return
+
+        now = self._clock()
+        with self._lock:
+            self._sticky_until[key] = now + self.sticky_seconds
+            # Keep the map bounded by dropping expired pins
+            if len(self._sticky_until) > 10_000:
+                self._sticky_until = {
+                    k: until for k, until in self._sticky_until.items() if until > now
+                }
+
+    def mark_down(self, engine: Engine) -> None:
+        i = self.replicas.index(engine)
+        with self._lock:
+            self._down_until[i] = self._clock() + self.retry_seconds
+
+    def healthy_count(self) -> int:
+        now = self._clock()
+        with self._lock:
+            return sum(
+                1 for i in range(len(self.replicas))
+                if self._down_until.get(i, 0.0) <= now
+            )
+
+
+def build_read_session_dependency(router: ReplicaRouter, get_session):
+    """
+    FastAPI dependency yielding a Session for read-only routes.
+
+    Uses the replica chosen by `router` (sticky on the route's
+    employee_id), falling back to the primary `get_session` dependency
+    when the router picks the primary or the replica cannot be reached.
+    """
+    sessionmakers = {
+        id(engine): sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        for engine in router.replicas
+    }
+
+    def get_read_session(request: Request):
+        engine = router.choose(request.path_params.get("employee_id"))
+
+        db = None
+        if engine is not None:
+            db = sessionmakers[id(engine)]()
+            try:
+                # Connect now so an unreachable replica fails over here
+                # instead of surfacing as a DatabaseError in the service
+                db.connection()
+            except OperationalError:
+                log.warning("replica_unavailable", replica=engine.url.host)
+                router.mark_down(engine)
+                db.close()
+                db = None
+
+        if db is None:
+            yield from get_session()
+            return
+
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return get_read_session
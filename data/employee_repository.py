@@ -5,11 +5,13 @@ This module interacts directly with the database using SQLAlchemy ORM.
 All higher-level business logic belongs in the service layer.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 import structlog
 
+from core.timing import span
+from core.vector_utils import signature_bytes
 from data.models import Employee
 from core.errors import (
     EmployeeAlreadyExists,
@@ -31,8 +33,9 @@ def add_employee(db: Session, payload: dict) -> Employee:
     db.add(emp)
 
     try:
-        db.commit()
-        db.refresh(emp)
+        with span("db"):
+            db.commit()
+            db.refresh(emp)
 
         log.debug(
             "repo_add_employee_success",
@@ -68,11 +71,12 @@ def get_employee_by_id(db: Session, employee_id: str) -> Employee:
     Retrieve a single employee by ID.
     """
     try:
-        emp = (
-            db.query(Employee)
-            .filter(Employee.employee_id == employee_id)
-            .first()
-        )
+        with span("db"):
+            emp = (
+                db.query(Employee)
+                .filter(Employee.employee_id == employee_id)
+                .first()
+            )
     except Exception as e:
         log.error(
             "repo_get_employee_db_error",
@@ -91,19 +95,26 @@ def get_employee_by_id(db: Session, employee_id: str) -> Employee:
     return emp
 
 
-def get_employees_by_prefix(db: Session, prefix: str) -> List[Employee]:
+def get_employees_by_prefix(
+    db: Session,
+    prefix: str,
+    site_id: Optional[str] = None,
+) -> List[Employee]:
     """
     Prefix-based search on employee_id or name.
+
+    With site_id, only that site's employees are searched.
     """
     try:
-        employees = (
-            db.query(Employee)
-            .filter(
-                (Employee.name.ilike(f"{prefix}%"))
-                | (Employee.employee_id.ilike(f"{prefix}%"))
-            )
-            .all()
+        query = db.query(Employee).filter(
+            (Employee.name.ilike(f"{prefix}%"))
+            | (Employee.employee_id.ilike(f"{prefix}%"))
         )
+        if site_id is not None:
+            query = query.filter(Employee.site_id == site_id)
+
+        with span("db"):
+            employees = query.all()
 
         if not employees:
             log.debug(
@@ -117,11 +128,90 @@ def get_employees_by_prefix(db: Session, prefix: str) -> List[Employee]:
         log.error(
             "repo_prefix_search_error",
             prefix=prefix,
+            site_id=site_id,
             error=str(e),
         )
         raise DatabaseError(f"Failed to search employees by prefix: {e}") from e
 
 
+def get_gallery_embeddings(
+    db: Session,
+    site_id: Optional[str] = None,
+) -> Tuple[List[str], List[list], List[Optional[bytes]]]:
+    """
+    All employee ids, embeddings and binary signatures, used to build the
+    1:N identification index. With site_id, only that site's employees.
+
+    Signatures may be None for rows written before they were maintained.
+    """
+    try:
+        query = db.query(Employee.employee_id, Employee.embedding, Employee.signature)
+        if site_id is not None:
+            query = query.filter(Employee.site_id == site_id)
+
+        with span("db"):
+            rows = query.order_by(Employee.employee_id).all()
+    except Exception as e:
+        log.error(
+            "repo_get_gallery_embeddings_error",
+            site_id=site_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to load gallery embeddings: {e}") from e
+
+    return (
+        [row[0] for row in rows],
+        [row[1] for row in rows],
+        [row[2] for row in rows],
+    )
+
+
+def get_embeddings_by_ids(db: Session, employee_ids: List[str]) -> Dict[str, list]:
+    """
+    Embeddings for a set of employees, keyed by employee_id.
+
+    Used to re-rank identification candidates with exact vectors.
+    """
+    try:
+        with span("db"):
+            rows = (
+                db.query(Employee.employee_id, Employee.embedding)
+                .filter(Employee.employee_id.in_(employee_ids))
+                .all()
+            )
+    except Exception as e:
+        log.error(
+            "repo_get_embeddings_by_ids_error",
+            count=len(employee_ids),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to retrieve embeddings: {e}") from e
+
+    return {row[0]: row[1] for row in rows}
+
+
+def get_employee_sites(db: Session, employee_ids: List[str]) -> Dict[str, str]:
+    """
+    Site of each existing employee among employee_ids, keyed by employee_id.
+    """
+    try:
+        with span("db"):
+            rows = (
+                db.query(Employee.employee_id, Employee.site_id)
+                .filter(Employee.employee_id.in_(employee_ids))
+                .all()
+            )
+    except Exception as e:
+        log.error(
+            "repo_get_employee_sites_error",
+            count=len(employee_ids),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to retrieve employee sites: {e}") from e
+
+    return {row[0]: row[1] for row in rows}
+
+
 # ---------------------------------------------------------------------------
 # UPDATE
 # ---------------------------------------------------------------------------
@@ -144,11 +234,13 @@ def update_employee(
             emp.name = name
         if embedding is not None:
             emp.embedding = embedding
+            emp.signature = signature_bytes(embedding)
         if role is not None:
             emp.role = role
 
-        db.commit()
-        db.refresh(emp)
+        with span("db"):
+            db.commit()
+            db.refresh(emp)
 
         log.debug(
             "repo_update_employee_success",
@@ -178,8 +270,9 @@ def remove_employee_by_id(db: Session, employee_id: str) -> None:
     emp = get_employee_by_id(db, employee_id)
 
     try:
-        db.delete(emp)
-        db.commit()
+        with span("db"):
+            db.delete(emp)
+            db.commit()
 
         log.debug(
             "repo_delete_employee_success",
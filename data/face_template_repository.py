@@ -0,0 +1,100 @@
+"""
+Repository layer for FaceTemplate persistence.
+
+Stores the additional enrolled embeddings for an employee. Limits and
+normalization are enforced in the service layer.
+"""
+
+from typing import List
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+import structlog
+
+from core.timing import span
+from data.models import FaceTemplate
+from core.errors import DatabaseError
+
+log = structlog.get_logger()
+
+
+# ---------------------------------------------------------------------------
+# CREATE
+# ---------------------------------------------------------------------------
+
+def add_face_template(db: Session, employee_id: str, embedding: list) -> FaceTemplate:
+    """
+    Insert a new face template for an employee.
+    """
+    template = FaceTemplate(employee_id=employee_id, embedding=embedding)
+    db.add(template)
+
+    try:
+        with span("db"):
+            db.commit()
+            db.refresh(template)
+
+        log.debug(
+            "repo_add_face_template_success",
+            employee_id=employee_id,
+            template_id=template.id,
+        )
+
+        return template
+
+    except Exception as e:
+        db.rollback()
+        log.error(
+            "repo_add_face_template_error",
+            employee_id=employee_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Error adding face template: {e}") from e
+
+
+# ---------------------------------------------------------------------------
+# READ
+# ---------------------------------------------------------------------------
+
+def count_face_templates(db: Session, employee_id: str) -> int:
+    """
+    Number of additional templates enrolled for an employee.
+    """
+    try:
+        with span("db"):
+            return (
+                db.query(func.count(FaceTemplate.id))
+                .filter(FaceTemplate.employee_id == employee_id)
+                .scalar()
+            )
+    except Exception as e:
+        log.error(
+            "repo_count_face_templates_error",
+            employee_id=employee_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to count face templates: {e}") from e
+
+
+def get_face_template_embeddings(db: Session, employee_id: str) -> List[list]:
+    """
+    Embeddings of every additional template for an employee, oldest first.
+
+    Returns an empty list when only the primary embedding is enrolled.
+    """
+    try:
+        with span("db"):
+            rows = (
+                db.query(FaceTemplate.embedding)
+                .filter(FaceTemplate.employee_id == employee_id)
+                .order_by(FaceTemplate.id)
+                .all()
+            )
+        return [row[0] for row in rows]
+
+    except Exception as e:
+        log.error(
+            "repo_get_face_templates_error",
+            employee_id=employee_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to retrieve face templates: {e}") from e
@@ -0,0 +1,94 @@
+# data/idempotency_store.py
+
+"""
+Database-backed Idempotency-Key store (idempotency_keys table).
+
+Unlike core.idempotency.MemoryIdempotencyStore it is shared by every
+worker and instance, so a kiosk retry that lands on another worker still
+replays. Costs one primary-key lookup per keyed request and one insert
+per first attempt (plus deleting an expired row left under the same
+key).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+import structlog
+
+from core.idempotency import StoredResponse
+from core.timing import span
+from data.models import IdempotencyKey
+
+log = structlog.get_logger()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class DatabaseIdempotencyStore:
+    """
+    Stores responses in idempotency_keys; rows older than `ttl` seconds
+    are ignored, and deleted every `purge_every` inserts.
+    """
+
+    blocking = True
+
+    def __init__(self, engine: Engine, *, ttl: float = 86_400.0, purge_every: int = 1000):
+        self.ttl = timedelta(seconds=ttl)
+        self.purge_every = purge_every
+        self._sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self._puts = 0
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        with self._sessionmaker() as db, span("db"):
+            row = db.get(IdempotencyKey, key)
+            if row is None or row.created_at <= _utcnow() - self.ttl:
+                return None
+            return StoredResponse(
+                status_code=row.status_code,
+                headers=[tuple(pair) for pair in row.headers],
+                body=row.body,
+                request_hash=row.request_hash or "",
+            )
+
+    def put(self, key: str, response: StoredResponse) -> None:
+        now = _utcnow()
+        with self._sessionmaker() as db, span("db"):
+            # An expired row for this key is ignored by get() but would
+            # still collide with the insert; replace it in the same
+            # transaction
+            db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.created_at <= now - self.ttl,
+                )
+            )
+            db.add(IdempotencyKey(
+                key=key,
+                status_code=response.status_code,
+                headers=[list(pair) for pair in response.headers],
+                body=response.body,
+                request_hash=response.request_hash or None,
+                created_at=now,
+            ))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker stored this key first; its response wins
+                db.rollback()
+
+            self._puts += 1
+            if self._puts % self.purge_every == 0:
+                self.purge(db, now)
+
+    def purge(self, db, now: datetime) -> None:
+        result = db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.created_at <= now - self.ttl)
+        )
+        db.commit()
+        log.info("idempotency_keys_purged", deleted=result.rowcount)
@@ -4,6 +4,10 @@ SQLAlchemy ORM model definitions.
 This module defines:
     • The single shared declarative Base used by all ORM models.
     • The Employee model representing user identity + face embeddings.
+    • The FaceTemplate model holding additional enrolled embeddings.
+    • The ClockSyncEvent model recording kiosk events applied by /clock/sync.
+    • The IdempotencyKey model backing shared Idempotency-Key replay.
+    • The DailyHours rollup of worked time per employee and day.
 
 Every table created by SQLAlchemy comes from Base.metadata.
 """
@@ -14,11 +18,15 @@ from sqlalchemy import (
     String,
     Float,
     Integer,
+    LargeBinary,
+    Date,
     DateTime,
     CheckConstraint,
     ForeignKey,
+    Index,
     JSON,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 
@@ -28,6 +36,10 @@ from sqlalchemy.dialects.postgresql import ARRAY
 
 Base = declarative_base()
 
+# Site assigned to rows created without an explicit site (single-site
+# deployments and the unscoped /employees, /clock routes)
+DEFAULT_SITE = "default"
+
 
 # ---------------------------------------------------------------------------
 # ORM Models
@@ -41,7 +53,9 @@ class Employee(Base):
         • a unique employee ID
         • display name
         • normalized 512-dimensional face embedding
+        • packed binary signature of that embedding (identification prefilter)
         • role for access control
+        • site (tenant partition) the employee belongs to
         • automatic creation/update timestamps
 
     Embedding storage:
@@ -72,6 +86,20 @@ class Employee(Base):
         doc="512-dimensional face embedding used for biometric verification."
     )
 
+    site_id = Column(
+        String(64),
+        nullable=False,
+        default=DEFAULT_SITE,
+        server_default=DEFAULT_SITE,
+        doc="Site (tenant partition) the employee is enrolled at."
+    )
+
+    signature = Column(
+        LargeBinary,
+        nullable=True,
+        doc="Sign bits of the embedding packed into 64 bytes (8 uint64 words)."
+    )
+
     role = Column(
         String(32),
         nullable=False,
@@ -99,12 +127,145 @@ class Employee(Base):
             "role IN ('Admin', 'Employee')",
             name="employees_role_check"
         ),
+        # Site-scoped search / gallery loads
+        Index("ix_employees_site_id_employee_id", "site_id", "employee_id"),
+        Index("ix_employees_site_id_name", "site_id", "name"),
     )
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
     
+    # On PostgreSQL the table is range-partitioned by clock_in and its
+    # primary key is (id, clock_in); id alone stays unique (one sequence)
     id = Column(Integer, primary_key=True, autoincrement=True)
     employee_id = Column(String(128), ForeignKey("employees.employee_id"), nullable=False)
     clock_in = Column(DateTime, nullable=False, server_default=func.now())
     clock_out = Column(DateTime, nullable=True)
+    # Copied from the employee on clock-in so site reports need no join
+    site_id = Column(String(64), nullable=False, default=DEFAULT_SITE, server_default=DEFAULT_SITE)
+
+    __table_args__ = (
+        Index("ix_time_entries_site_id_employee_id", "site_id", "employee_id"),
+        Index("ix_time_entries_site_id_clock_in", "site_id", "clock_in"),
+        # Status lookups probe every partition; this keeps each probe tiny
+        # (created by migration b6f3d2a9e184)
+        Index(
+            "ix_time_entries_open_employee_id", "employee_id",
+            postgresql_where=text("clock_out IS NULL"),
+        ),
+        # Roster / status lookups only ever touch open entries
+        Index(
+            "ix_time_entries_open_site_id_employee_id", "site_id", "employee_id",
+            postgresql_where=text("clock_out IS NULL"),
+            sqlite_where=text("clock_out IS NULL"),
+        ),
+    )
+
+
+class FaceTemplate(Base):
+    """
+    Additional face embedding enrolled for an employee.
+
+    Employee.embedding stays the primary template; rows here cover lighting,
+    glasses, beard, etc. Verification scores the probe against the primary
+    embedding and every template in a single matrix-vector product.
+
+    Embeddings are stored normalized, with the same ARRAY / JSON variant
+    as Employee.embedding.
+    """
+
+    __tablename__ = "face_templates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    employee_id = Column(
+        String(128),
+        ForeignKey("employees.employee_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    embedding = Column(
+        ARRAY(Float).with_variant(JSON, "sqlite"),
+        nullable=False,
+        doc="Normalized 512-dimensional face embedding."
+    )
+
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_face_templates_employee_id", "employee_id"),
+    )
+
+
+class ClockSyncEvent(Base):
+    """
+    Offline kiosk clock event received through POST /clock/sync.
+
+    event_id is generated by the kiosk, so a re-sent batch is recognized
+    and answered with the stored outcome instead of being applied twice.
+    Rejected events are recorded too, keeping replays deterministic.
+    """
+
+    __tablename__ = "clock_sync_events"
+
+    event_id = Column(String(64), primary_key=True)
+    employee_id = Column(String(128), nullable=False)
+    action = Column(String(8), nullable=False)
+    occurred_at = Column(DateTime, nullable=False)
+
+    # "applied" | "rejected", with the ErrorCode value for rejections
+    status = Column(String(16), nullable=False)
+    code = Column(String(32), nullable=True)
+
+    # No foreign key: on PostgreSQL time_entries is partitioned and its
+    # primary key is (id, clock_in) (see data.partitions)
+    time_entry_id = Column(Integer, nullable=True)
+    received_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class IdempotencyKey(Base):
+    """
+    Stored response for an Idempotency-Key (see core.idempotency).
+
+    key is a SHA-256 of method, path and the client's key; request_hash
+    is a SHA-256 of the request body it was first used with. Rows past
+    the TTL are ignored on read and purged periodically.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(64), primary_key=True)
+    status_code = Column(Integer, nullable=False)
+    headers = Column(JSON, nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    request_hash = Column(String(64), nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+
+class DailyHours(Base):
+    """
+    Seconds worked per employee and calendar day
+    (see data.daily_hours_repository).
+
+    Maintained incrementally in the same transaction as every clock-out;
+    a shift crossing midnight adds to each day it covers. entries counts
+    shifts by the day they started, so sums over a range count each shift
+    once. Hours reports read this table instead of time_entries.
+    """
+
+    __tablename__ = "daily_hours"
+
+    employee_id = Column(String(128), primary_key=True)
+    day = Column(Date, primary_key=True)
+    site_id = Column(String(64), nullable=False, default=DEFAULT_SITE, server_default=DEFAULT_SITE)
+    seconds = Column(Integer, nullable=False, default=0)
+    entries = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_daily_hours_site_id_day", "site_id", "day"),
+        Index("ix_daily_hours_day", "day"),
+    )
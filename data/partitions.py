@@ -0,0 +1,182 @@
+# data/partitions.py
+
+"""
+Monthly range partitions of time_entries (PostgreSQL only).
+
+Migration b6f3d2a9e184 turns time_entries into a table partitioned by
+RANGE (clock_in), one partition per calendar month named
+time_entries_yYYYYmMM, plus time_entries_default for rows outside every
+monthly range. Repository queries are unchanged: they address the parent
+table and PostgreSQL prunes partitions by clock_in.
+
+Maintenance (scripts/time_entry_partitions.py, run from cron):
+    • ensure – create the next N months' partitions ahead of time; rows
+               that already landed in the default partition for such a
+               month are moved into it
+    • detach – detach partitions older than a cutoff and move them to the
+               `archive` schema (or drop them), keeping the live table
+               and its indexes small
+
+The functions below build SQL statements so they can be reviewed
+(--dry-run) and tested without a PostgreSQL server.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+PARENT = "time_entries"
+DEFAULT_PARTITION = f"{PARENT}_default"
+ARCHIVE_SCHEMA = "archive"
+
+
+# ---------------------------------------------------------------------------
+# NAMING / RANGES
+# ---------------------------------------------------------------------------
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def iter_months(start: date, stop: date) -> Iterator[date]:
+    """First day of every month from start's month up to (excluding) stop's."""
+    month = month_start(start)
+    while month < month_start(stop):
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Inverse of partition_name; None for the default or foreign tables."""
+    prefix = f"{PARENT}_y"
+    if not name.startswith(prefix) or len(name) != len(prefix) + 7:
+        return None
+    try:
+        return date(int(name[-7:-3]), int(name[-2:]), 1)
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# SQL BUILDERS
+# ---------------------------------------------------------------------------
+
+def create_partition_sql(month: date) -> List[str]:
+    """
+    Statements creating one month's partition.
+
+    Rows for that month sitting in the default partition would make a
+    plain CREATE ... PARTITION OF fail, so the table is created
+    standalone, filled from the default partition, then attached.
+    """
+    name = partition_name(month)
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    return [
+        f"CREATE TABLE IF NOT EXISTS {name} "
+        f"(LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE clock_in >= '{lower}' AND clock_in < '{upper}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')",
+    ]
+
+
+def detach_partition_sql(month: date, *, drop: bool = False) -> List[str]:
+    name = partition_name(month)
+    statements = [f"ALTER TABLE {PARENT} DETACH PARTITION {name}"]
+    if drop:
+        statements.append(f"DROP TABLE {name}")
+    else:
+        statements += [
+            f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}",
+            f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}",
+        ]
+    return statements
+
+
+# ---------------------------------------------------------------------------
+# OPERATIONS
+# ---------------------------------------------------------------------------
+
+def list_partitions(conn: Connection) -> List[date]:
+    """Months that currently have an attached partition, oldest first."""
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": PARENT}).scalars()
+    return sorted(m for m in map(partition_month, rows) if m is not None)
+
+
+def ensure_partitions(
+    conn: Connection,
+    *,
+    months_ahead: int = 3,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Create any missing partition from the current month through
+    `months_ahead` months ahead. Returns the executed (or planned)
+    statements.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    existing = set(list_partitions(conn))
+
+    statements = []
+    for month in iter_months(today, add_months(today, months_ahead + 1)):
+        if month not in existing:
+            statements += create_partition_sql(month)
+
+    if not dry_run:
+        for statement in statements:
+            conn.execute(text(statement))
+    return statements
+
+
+def open_entries_in(conn: Connection, month: date) -> int:
+    return conn.execute(text(
+        f"SELECT count(*) FROM {partition_name(month)} WHERE clock_out IS NULL"
+    )).scalar()
+
+
+def detach_partitions(
+    conn: Connection,
+    *,
+    before: date,
+    drop: bool = False,
+    force: bool = False,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Detach every monthly partition that ends on or before `before`.
+
+    Partitions still holding open entries (a shift that never clocked
+    out) are skipped unless force=True, since detaching them would hide
+    the entry from status lookups.
+    """
+    statements = []
+    for month in list_partitions(conn):
+        if add_months(month, 1) > month_start(before):
+            continue
+        if not force and open_entries_in(conn, month):
+            continue
+        statements += detach_partition_sql(month, drop=drop)
+
+    if not dry_run:
+        for statement in statements:
+            conn.execute(text(statement))
+    return statements
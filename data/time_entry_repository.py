@@ -5,13 +5,15 @@ Handles clock-in/clock-out database operations. Business logic
 (e.g., "reject if already clocked in") belongs in the service layer.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 import structlog
 
-from data.models import TimeEntry
+from core.timing import span
+from data.daily_hours_repository import record_shifts
+from data.models import DEFAULT_SITE, Employee, TimeEntry
 from core.errors import DatabaseError
 
 log = structlog.get_logger()
@@ -28,14 +30,15 @@ def get_open_entry(db: Session, employee_id: str) -> Optional[TimeEntry]:
     Returns None if the employee is not currently clocked in.
     """
     try:
-        entry = (
-            db.query(TimeEntry)
-            .filter(
-                TimeEntry.employee_id == employee_id,
-                TimeEntry.clock_out.is_(None)
+        with span("db"):
+            entry = (
+                db.query(TimeEntry)
+                .filter(
+                    TimeEntry.employee_id == employee_id,
+                    TimeEntry.clock_out.is_(None)
+                )
+                .first()
             )
-            .first()
-        )
         return entry
 
     except Exception as e:
@@ -47,6 +50,131 @@ def get_open_entry(db: Session, employee_id: str) -> Optional[TimeEntry]:
         raise DatabaseError(f"Failed to query open entry: {e}") from e
 
 
+def get_open_entries(db: Session, employee_ids: List[str]) -> Dict[str, TimeEntry]:
+    """
+    Open time entries for several employees in one query, keyed by
+    employee_id. Employees who are not clocked in are absent.
+    """
+    try:
+        with span("db"):
+            entries = (
+                db.query(TimeEntry)
+                .filter(
+                    TimeEntry.employee_id.in_(employee_ids),
+                    TimeEntry.clock_out.is_(None)
+                )
+                .all()
+            )
+    except Exception as e:
+        log.error(
+            "repo_get_open_entries_error",
+            count=len(employee_ids),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query open entries: {e}") from e
+
+    return {entry.employee_id: entry for entry in entries}
+
+
+def get_shifts_ending_after(
+    db: Session,
+    employee_ids: List[str],
+    after: datetime,
+) -> Dict[str, List[tuple]]:
+    """
+    Closed shifts of several employees with clock_out > after, as
+    employee_id -> [(clock_in, clock_out), ...] ordered by clock_in.
+    """
+    try:
+        with span("db"):
+            rows = (
+                db.query(TimeEntry.employee_id, TimeEntry.clock_in, TimeEntry.clock_out)
+                .filter(
+                    TimeEntry.employee_id.in_(employee_ids),
+                    TimeEntry.clock_out.is_not(None),
+                    TimeEntry.clock_out > after,
+                )
+                .order_by(TimeEntry.employee_id, TimeEntry.clock_in)
+                .all()
+            )
+    except Exception as e:
+        log.error(
+            "repo_get_shifts_ending_after_error",
+            count=len(employee_ids),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query closed shifts: {e}") from e
+
+    shifts: Dict[str, List[tuple]] = {}
+    for employee_id, clock_in, clock_out in rows:
+        shifts.setdefault(employee_id, []).append((clock_in, clock_out))
+    return shifts
+
+
+def get_roster(
+    db: Session,
+    site_id: Optional[str] = None,
+    employee_ids: Optional[List[str]] = None,
+    after: Optional[str] = None,
+    limit: int = 100,
+) -> List[TimeEntry]:
+    """
+    Open time entries ordered by employee_id, starting after `after`
+    (keyset pagination; an employee has at most one open entry).
+
+    Served by the partial index on open entries, so the cost follows the
+    number of people on site rather than the size of time_entries.
+    """
+    try:
+        query = db.query(TimeEntry).filter(TimeEntry.clock_out.is_(None))
+        if site_id is not None:
+            query = query.filter(TimeEntry.site_id == site_id)
+        if employee_ids is not None:
+            query = query.filter(TimeEntry.employee_id.in_(employee_ids))
+        if after is not None:
+            query = query.filter(TimeEntry.employee_id > after)
+
+        with span("db"):
+            return query.order_by(TimeEntry.employee_id).limit(limit).all()
+
+    except Exception as e:
+        log.error(
+            "repo_get_roster_error",
+            site_id=site_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query roster: {e}") from e
+
+
+# ---------------------------------------------------------------------------
+# LOCKING
+# ---------------------------------------------------------------------------
+
+def lock_employee(db: Session, employee_id: str) -> bool:
+    """
+    Lock the employee row (SELECT ... FOR UPDATE) until the session's
+    transaction ends, so a check-then-write on the employee's entries
+    cannot interleave with another one. False if there is no such
+    employee. SQLite, which serializes writers itself, ignores the lock.
+    """
+    try:
+        with span("db"):
+            found = db.execute(
+                select(Employee.employee_id)
+                .where(Employee.employee_id == employee_id)
+                .with_for_update()
+            ).first()
+    except Exception as e:
+        log.error(
+            "repo_lock_employee_error",
+            employee_id=employee_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to lock employee: {e}") from e
+
+    return found is not None
+
+
 # ---------------------------------------------------------------------------
 # CREATE
 # ---------------------------------------------------------------------------
@@ -55,14 +183,24 @@ def create_entry(db: Session, employee_id: str) -> TimeEntry:
     """
     Create a new time entry (clock in).
     
-    The clock_in timestamp is set automatically via server_default.
+    The clock_in timestamp is set automatically via server_default, and
+    site_id is copied from the employee in the same INSERT.
     """
-    entry = TimeEntry(employee_id=employee_id)
+    employee_site = (
+        select(Employee.site_id)
+        .where(Employee.employee_id == employee_id)
+        .scalar_subquery()
+    )
+    entry = TimeEntry(
+        employee_id=employee_id,
+        site_id=func.coalesce(employee_site, DEFAULT_SITE),
+    )
     db.add(entry)
 
     try:
-        db.commit()
-        db.refresh(entry)
+        with span("db"):
+            db.commit()
+            db.refresh(entry)
 
         log.debug(
             "repo_create_entry_success",
@@ -91,12 +229,26 @@ def close_entry(db: Session, entry: TimeEntry) -> TimeEntry:
     """
     Close an open time entry (clock out).
     
-    Sets clock_out to the current time.
+    Sets clock_out to the current time and adds the shift to the
+    daily_hours rollup in the same transaction.
     """
     try:
-        entry.clock_out = func.now()
-        db.commit()
-        db.refresh(entry)
+        with span("db"):
+            closed = db.execute(
+                update(TimeEntry)
+                .where(TimeEntry.id == entry.id)
+                .values(clock_out=func.now())
+                .returning(
+                    TimeEntry.employee_id,
+                    TimeEntry.site_id,
+                    TimeEntry.clock_in,
+                    TimeEntry.clock_out,
+                ),
+                execution_options={"synchronize_session": False},
+            ).one()
+            record_shifts(db, [closed])
+            db.commit()
+            db.refresh(entry)
 
         log.debug(
             "repo_close_entry_success",
@@ -114,4 +266,100 @@ def close_entry(db: Session, entry: TimeEntry) -> TimeEntry:
             entry_id=entry.id,
             error=str(e),
         )
-        raise DatabaseError(f"Failed to close time entry: {e}") from e
\ No newline at end of file
+        raise DatabaseError(f"Failed to close time entry: {e}") from e
+
+
+# ---------------------------------------------------------------------------
+# RANGE READS / ARCHIVAL
+# ---------------------------------------------------------------------------
+
+def get_entries_between(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    employee_id: Optional[str] = None,
+    site_id: Optional[str] = None,
+) -> List[TimeEntry]:
+    """
+    Live entries with start <= clock_in < end, oldest first.
+
+    The clock_in range lets PostgreSQL prune to the matching monthly
+    partitions (see data.partitions).
+    """
+    try:
+        query = db.query(TimeEntry).filter(
+            TimeEntry.clock_in >= start,
+            TimeEntry.clock_in < end,
+        )
+        if employee_id is not None:
+            query = query.filter(TimeEntry.employee_id == employee_id)
+        if site_id is not None:
+            query = query.filter(TimeEntry.site_id == site_id)
+
+        with span("db"):
+            return query.order_by(TimeEntry.clock_in).all()
+
+    except Exception as e:
+        log.error(
+            "repo_get_entries_between_error",
+            employee_id=employee_id,
+            site_id=site_id,
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query time entries: {e}") from e
+
+
+def get_closed_entries_before(
+    db: Session,
+    cutoff: datetime,
+    after_id: int = 0,
+    limit: int = 10_000,
+) -> List[TimeEntry]:
+    """
+    Up to `limit` closed entries that clocked in before `cutoff`, in id
+    order starting after `after_id` (keyset pagination for archival).
+    """
+    try:
+        with span("db"):
+            return (
+                db.query(TimeEntry)
+                .filter(
+                    TimeEntry.clock_in < cutoff,
+                    TimeEntry.clock_out.is_not(None),
+                    TimeEntry.id > after_id,
+                )
+                .order_by(TimeEntry.id)
+                .limit(limit)
+                .all()
+            )
+    except Exception as e:
+        log.error(
+            "repo_get_closed_entries_before_error",
+            cutoff=cutoff.isoformat(),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to query closed entries: {e}") from e
+
+
+def delete_entries(db: Session, entry_ids: List[int]) -> int:
+    """
+    Delete entries by id (after they were archived). Returns the count.
+    """
+    try:
+        with span("db"):
+            deleted = (
+                db.query(TimeEntry)
+                .filter(TimeEntry.id.in_(entry_ids))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+        return deleted
+
+    except Exception as e:
+        db.rollback()
+        log.error(
+            "repo_delete_entries_error",
+            count=len(entry_ids),
+            error=str(e),
+        )
+        raise DatabaseError(f"Failed to delete time entries: {e}") from e
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for production (preload mode).
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is built once in the master (main.preload) and workers are forked
+from it, sharing imported modules and the constructed app copy-on-write.
+New workers skip imports entirely, so scale-out is bounded by fork time.
+"""
+
+import os
+
+import main
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def on_starting(server):
+    main.preload()
+
+
+def post_fork(server, worker):
+    # Pooled connections must never be shared across processes: drop the
+    # inherited pools of the primary and every replica engine
+    for engine in main.app.state.engines:
+        engine.dispose(close=False)
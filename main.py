@@ -1,27 +1,16 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine
-
-from slowapi import Limiter
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
-
-from core.settings import Settings
-from core.security import build_admin_required
-from core.error_handler import add_exception_handlers
-from core.logging import init_logging
-from core.request_id import RequestIDMiddleware
-from data.database import make_get_session
-from routers.employee import create_employee_router
-from routers.health import router as health_router
-from routers.clock import create_clock_router
+import gc
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from core.settings import Settings
 
 
 def create_app(
-    settings: Settings | None = None,
+    settings: "Settings | None" = None,
     engine=None,
-    get_session_maker=make_get_session,
+    get_session_maker=None,
+    replica_engines=None,
 ):
     """
     Application factory for the TradeTrack backend API.
@@ -45,49 +34,153 @@ def create_app(
     ----------
     settings : Settings | None
         Explicit application configuration (DB URL, thresholds, admin key).
-        If omitted, a new Settings() instance is created automatically.
+        If omitted, the process-wide get_settings() instance is used.
 
     engine : sqlalchemy.Engine | None
         Optional SQLAlchemy engine. Tests inject a custom in-memory engine.
         In production, the engine is created from settings.database_url.
 
-    get_session_maker : callable
-        Factory that produces a FastAPI-compatible get_session dependency.
-        Tests override this to ensure isolated DB state per test.
+    get_session_maker : callable | None
+        Factory that produces a FastAPI-compatible get_session dependency
+        (default: data.database.make_get_session). Tests override this to
+        ensure isolated DB state per test.
+
+    replica_engines : list[sqlalchemy.Engine] | None
+        Optional read-replica engines. In production, they are created
+        from settings.database_replica_urls.
 
     Returns
     -------
     FastAPI
         A fully initialized FastAPI application, ready to be served by Uvicorn.
     """
+    # Imported here rather than at module top, so `import main` (gunicorn
+    # config, tooling) does not pay for fastapi, sqlalchemy and the routers
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from sqlalchemy import create_engine
+
+    from slowapi import Limiter
+    from slowapi.middleware import SlowAPIMiddleware
+    from slowapi.util import get_remote_address
+
+    from core.settings import get_settings
+    from core.security import build_admin_required
+    from core.error_handler import add_exception_handlers
+    from core.logging import init_logging, shutdown_logging
+    from core.request_id import RequestIDMiddleware
+    from core.timing import ServerTimingMiddleware
+    from core.face_index import FaceGallery, SiteGalleries
+    from core.etag import ValidatorCache
+    from core.idempotency import IDEMPOTENCY_HEADER, IdempotencyMiddleware, MemoryIdempotencyStore
+    from core.status_broker import StatusBroker
+    from data.archive import TimeEntryArchive
+    from data.clock_writer import GroupCommitWriter
+    from data.idempotency_store import DatabaseIdempotencyStore
+    from data.database import ReplicaRouter, build_read_session_dependency, make_get_session
+    from data.employee_repository import get_gallery_embeddings
+    from routers.employee import create_employee_router
+    from routers.health import router as health_router
+    from routers.clock import create_clock_router
+    from routers.admin import create_admin_router
+
     # -----------------------------------------------------------------------
     # Resolve settings and database engine
     # -----------------------------------------------------------------------
     if settings is None:
-        settings = Settings()
+        settings = get_settings()
+
+    if get_session_maker is None:
+        get_session_maker = make_get_session
 
     # -----------------------------------------------------------------------
     # Initialize structured logging
     # Uses settings.env to decide JSON vs pretty logs.
     # -----------------------------------------------------------------------
-    init_logging(settings.env)
+    init_logging(
+        settings.env,
+        async_logging=settings.log_async,
+        queue_size=settings.log_queue_size,
+        batch_size=settings.log_batch_size,
+        drop_policy=settings.log_drop_policy,
+        sample_rates=settings.log_sample_rates,
+        rate_limits=settings.log_rate_limits,
+        quiet_exceptions=settings.log_quiet_exceptions,
+    )
 
     if engine is None:
         engine = create_engine(settings.database_url, future=True)
 
-    # Build the FastAPI DB session dependency
+    if replica_engines is None:
+        replica_engines = [
+            create_engine(url.strip(), future=True)
+            for url in settings.database_replica_urls.split(",")
+            if url.strip()
+        ]
+
+    # Build the FastAPI DB session dependencies (reads may use a replica)
     get_session = get_session_maker(engine)
 
+    replicas = ReplicaRouter(
+        replica_engines,
+        sticky_seconds=settings.replica_sticky_seconds,
+        retry_seconds=settings.replica_retry_seconds,
+    )
+    get_read_session = build_read_session_dependency(replicas, get_session)
+
+    clock_writer = None
+    if settings.clock_group_commit:
+        clock_writer = GroupCommitWriter(
+            engine,
+            window_ms=settings.clock_group_commit_window_ms,
+            max_batch=settings.clock_group_commit_max_batch,
+        )
+
+    status_broker = StatusBroker(max_subscribers=settings.status_stream_max_subscribers)
+
+    # Remembered ETags for conditional GETs; a status change drops the
+    # employee's status ETags
+    etags = ValidatorCache(
+        ttl=settings.etag_cache_seconds,
+        max_groups=settings.etag_cache_max_groups,
+        max_variants=settings.etag_cache_max_variants,
+    )
+    status_broker.add_listener(lambda change: etags.invalidate(("status", change.employee_id)))
+
+    archive = None
+    if settings.time_entry_archive_dir:
+        archive = TimeEntryArchive(settings.time_entry_archive_dir)
+
     # -----------------------------------------------------------------------
     # Base FastAPI application
     # -----------------------------------------------------------------------
-    app = FastAPI()
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        # Commit queued clock events, then flush queued log records
+        if clock_writer is not None:
+            clock_writer.stop()
+        shutdown_logging()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.engine = engine
+    # Every engine the app opens connections with (primary first); a
+    # forked worker must dispose all of them
+    app.state.engines = [engine, *replica_engines]
+    app.state.replicas = replicas
+    app.state.status_broker = status_broker
 
     # ---------------------------
     # Request ID middleware (MUST come first so logs have the ID)
     # ---------------------------
     app.add_middleware(RequestIDMiddleware)
 
+    # ---------------------------
+    # Server-Timing phase breakdown (opt-in; zero cost when not installed)
+    # ---------------------------
+    if settings.server_timing_enabled:
+        app.add_middleware(ServerTimingMiddleware)
+
     # -----------------------------------------------------------------------
     # Global exception handlers
     #
@@ -110,7 +203,8 @@ def create_app(
         CORSMiddleware,
         allow_origins=cors_origins_list,
         allow_methods=["GET", "POST"],
-        allow_headers=["Content-Type", "X-Admin-Key"],
+        allow_headers=["Content-Type", "X-Admin-Key", IDEMPOTENCY_HEADER, "If-None-Match"],
+        expose_headers=["ETag"],
     )
 
     # -----------------------------------------------------------------------
@@ -123,6 +217,28 @@ def create_app(
     app.state.limiter = limiter
     app.add_middleware(SlowAPIMiddleware)
 
+    # -----------------------------------------------------------------------
+    # Idempotency-Key replay for clock actions
+    #
+    # Added last so it is the outermost middleware: a replayed retry does
+    # no work at all and does not count against the rate limits.
+    # -----------------------------------------------------------------------
+    if settings.idempotency_store == "memory":
+        idempotency_store = MemoryIdempotencyStore(
+            max_keys=settings.idempotency_max_keys,
+            ttl=settings.idempotency_ttl_seconds,
+        )
+    elif settings.idempotency_store == "database":
+        idempotency_store = DatabaseIdempotencyStore(
+            engine,
+            ttl=settings.idempotency_ttl_seconds,
+        )
+    else:
+        idempotency_store = None
+
+    if idempotency_store is not None:
+        app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
     # -----------------------------------------------------------------------
     # Security dependencies
     #
@@ -130,6 +246,37 @@ def create_app(
     # -----------------------------------------------------------------------
     admin_required = build_admin_required(settings)
 
+    # -----------------------------------------------------------------------
+    # Identification indexes
+    #
+    # One lazily built index per site (plus one company-wide) per worker,
+    # shared by all requests and dropped when the site goes idle.
+    # -----------------------------------------------------------------------
+    index_options = {
+        "exact": None,
+        "int8": {"rerank": settings.identify_rerank},
+        "binary": {"shortlist": settings.identify_shortlist},
+        "ivf": {
+            "nlist": settings.identify_nlist,
+            "nprobe": settings.identify_nprobe,
+            "retrain_fraction": settings.identify_retrain_fraction,
+        },
+    }[settings.identify_index]
+
+    def build_site_gallery(site_id):
+        return FaceGallery(
+            lambda db: get_gallery_embeddings(db, site_id),
+            kind=settings.identify_index,
+            ttl=settings.identify_cache_ttl_seconds,
+            index_options=index_options,
+        )
+
+    galleries = SiteGalleries(
+        build_site_gallery,
+        idle_ttl=settings.site_gallery_idle_seconds,
+    )
+    app.state.face_galleries = galleries
+
     # -----------------------------------------------------------------------
     # Route registration
     #
@@ -140,22 +287,68 @@ def create_app(
         settings=settings,
         limiter=limiter,
         get_session=get_session,
+        get_read_session=get_read_session,
         admin_required=admin_required,
+        galleries=galleries,
+        archive=archive,
+        etags=etags,
     )
 
     clock_router = create_clock_router(
+        settings=settings,
         limiter=limiter,
         get_session=get_session,
+        get_read_session=get_read_session,
+        replicas=replicas,
+        writer=clock_writer,
+        broker=status_broker,
+        stream_heartbeat=settings.status_stream_heartbeat_seconds,
+        stream_resync=settings.status_stream_resync_seconds,
+        etags=etags,
     )
 
     app.include_router(employee_router, prefix="/employees")
 
     app.include_router(clock_router, prefix="/clock")
 
+    # Site-scoped mounts of the same routers (see core.sites)
+    app.include_router(employee_router, prefix="/sites/{site_id}/employees")
+
+    app.include_router(clock_router, prefix="/sites/{site_id}/clock")
+
     app.include_router(health_router)
 
+    app.include_router(create_admin_router(admin_required), prefix="/admin")
+
     return app
 
 
-# Uvicorn entrypoint for local development and production
-app = create_app()
+def preload() -> None:
+    """
+    Prepare the process for forking servers (gunicorn --preload).
+
+    Builds the app and resolves every lazily imported module in the master
+    process, then freezes the GC so the objects stay in shared
+    copy-on-write pages instead of being touched by each worker's
+    collector. See gunicorn.conf.py.
+    """
+    import numpy  # noqa: F401 — resolves core.lazy placeholders
+
+    __getattr__("app")
+    gc.collect()
+    gc.freeze()
+
+
+def __getattr__(name: str):
+    """
+    Uvicorn/Gunicorn entrypoint (`main:app`), built on first access.
+
+    Importing this module no longer constructs the app, reads `.env` or
+    opens an engine, so tests and tooling that only need create_app()
+    import quickly.
+    """
+    if name == "app":
+        app = create_app()
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,7 @@ from logging.config import fileConfig
 from sqlalchemy import create_engine
 from alembic import context
 
-from core.settings import settings
+from core.settings import get_settings
 from data.models import Base
 
 # ---------------------------------------------------------
@@ -12,6 +12,8 @@ from data.models import Base
 config = context.config
 fileConfig(config.config_file_name)
 
+settings = get_settings()
+
 # Metadata for autogenerate
 target_metadata = Base.metadata
 
@@ -0,0 +1,38 @@
+"""add_face_templates_table
+
+Revision ID: 3f1a9c2d7b44
+Revises: e4166470b24a
+Create Date: 2026-10-19 10:12:41.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7b44'
+down_revision: Union[str, Sequence[str], None] = 'e4166470b24a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('face_templates',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('employee_id', sa.String(length=128), nullable=False),
+    sa.Column('embedding', postgresql.ARRAY(sa.Float()), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.employee_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_face_templates_employee_id', 'face_templates', ['employee_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_face_templates_employee_id', table_name='face_templates')
+    op.drop_table('face_templates')
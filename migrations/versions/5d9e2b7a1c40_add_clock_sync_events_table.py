@@ -0,0 +1,39 @@
+"""add_clock_sync_events_table
+
+Revision ID: 5d9e2b7a1c40
+Revises: c71d0e5a2f86
+Create Date: 2026-10-19 18:02:27.640913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9e2b7a1c40'
+down_revision: Union[str, Sequence[str], None] = 'c71d0e5a2f86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('clock_sync_events',
+    sa.Column('event_id', sa.String(length=64), nullable=False),
+    sa.Column('employee_id', sa.String(length=128), nullable=False),
+    sa.Column('action', sa.String(length=8), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('code', sa.String(length=32), nullable=True),
+    sa.Column('time_entry_id', sa.Integer(), nullable=True),
+    sa.Column('received_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['time_entry_id'], ['time_entries.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('clock_sync_events')
@@ -0,0 +1,54 @@
+"""add_employee_signature
+
+Revision ID: 8b2e4f1c9d03
+Revises: 3f1a9c2d7b44
+Create Date: 2026-10-19 14:03:27.550912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f1c9d03'
+down_revision: Union[str, Sequence[str], None] = '3f1a9c2d7b44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('employees', sa.Column('signature', sa.LargeBinary(), nullable=True))
+
+    # Backfill: sign bits of the stored embedding, packed (same as
+    # core.vector_utils.signature_bytes)
+    employees = sa.table(
+        'employees',
+        sa.column('employee_id', sa.String),
+        sa.column('embedding', sa.ARRAY(sa.Float)),
+        sa.column('signature', sa.LargeBinary),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(employees.c.employee_id, employees.c.embedding)).fetchall()
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        conn.execute(
+            employees.update()
+            .where(employees.c.employee_id == sa.bindparam('eid'))
+            .values(signature=sa.bindparam('sig')),
+            [
+                {'eid': eid, 'sig': np.packbits(np.asarray(emb) > 0).tobytes()}
+                for eid, emb in batch
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('employees', 'signature')
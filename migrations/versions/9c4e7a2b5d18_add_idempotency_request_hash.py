@@ -0,0 +1,29 @@
+"""add_idempotency_request_hash
+
+Revision ID: 9c4e7a2b5d18
+Revises: f2b7c4d9a613
+Create Date: 2026-10-20 09:12:44.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e7a2b5d18'
+down_revision: Union[str, Sequence[str], None] = 'f2b7c4d9a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable: keys stored before this revision replay without a body check
+    op.add_column('idempotency_keys', sa.Column('request_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'request_hash')
@@ -0,0 +1,149 @@
+"""partition_time_entries_by_month
+
+Revision ID: b6f3d2a9e184
+Revises: a4c8e1f07b52
+Create Date: 2026-10-19 20:14:03.552190
+
+PostgreSQL only (other dialects keep the plain table). Rebuilds
+time_entries as a table partitioned by RANGE (clock_in) with one
+partition per month from the oldest entry through three months ahead,
+plus a default partition, and copies the rows across. The primary key
+becomes (id, clock_in) because a partitioned table's unique constraints
+must include the partition key; ids still come from the same sequence.
+clock_sync_events.time_entry_id loses its foreign key for the same
+reason.
+
+Takes an exclusive lock on time_entries for the duration of the copy;
+run it in a maintenance window. See data/partitions.py for the ongoing
+maintenance commands; the partition DDL below is a frozen copy of its
+helpers as of this revision, so later changes there do not alter what
+this migration does.
+"""
+from datetime import date, datetime, timezone
+from typing import Iterator, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f3d2a9e184'
+down_revision: Union[str, Sequence[str], None] = 'a4c8e1f07b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_PARTITION = 'time_entries_default'
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _iter_months(start: date, stop: date) -> Iterator[date]:
+    month, stop = date(start.year, start.month, 1), date(stop.year, stop.month, 1)
+    while month < stop:
+        yield month
+        month = _add_months(month, 1)
+
+
+def _create_partition_sql(month: date) -> List[str]:
+    """One month's partition, filled from the default partition, then attached."""
+    name = f"time_entries_y{month.year:04d}m{month.month:02d}"
+    lower, upper = month.isoformat(), _add_months(month, 1).isoformat()
+    return [
+        f"CREATE TABLE IF NOT EXISTS {name} "
+        f"(LIKE time_entries INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE clock_in >= '{lower}' AND clock_in < '{upper}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE time_entries ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.drop_constraint('clock_sync_events_time_entry_id_fkey', 'clock_sync_events', type_='foreignkey')
+
+    op.execute("ALTER TABLE time_entries RENAME TO time_entries_unpartitioned")
+    op.execute("ALTER TABLE time_entries_unpartitioned RENAME CONSTRAINT time_entries_pkey TO time_entries_unpartitioned_pkey")
+    op.drop_index('ix_time_entries_site_id_employee_id', table_name='time_entries_unpartitioned')
+    op.drop_index('ix_time_entries_site_id_clock_in', table_name='time_entries_unpartitioned')
+
+    op.execute("""
+        CREATE TABLE time_entries (
+            id INTEGER NOT NULL DEFAULT nextval('time_entries_id_seq'),
+            employee_id VARCHAR(128) NOT NULL REFERENCES employees (employee_id),
+            clock_in TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            clock_out TIMESTAMP WITHOUT TIME ZONE,
+            site_id VARCHAR(64) NOT NULL DEFAULT 'default',
+            CONSTRAINT time_entries_pkey PRIMARY KEY (id, clock_in)
+        ) PARTITION BY RANGE (clock_in)
+    """)
+    op.execute("ALTER SEQUENCE time_entries_id_seq OWNED BY time_entries.id")
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF time_entries DEFAULT")
+
+    # Partitioned indexes; each partition gets its own copy
+    op.create_index('ix_time_entries_site_id_employee_id', 'time_entries', ['site_id', 'employee_id'], unique=False)
+    op.create_index('ix_time_entries_site_id_clock_in', 'time_entries', ['site_id', 'clock_in'], unique=False)
+    # Status lookups probe every partition; this keeps each probe tiny
+    op.create_index(
+        'ix_time_entries_open_employee_id', 'time_entries', ['employee_id'],
+        unique=False, postgresql_where=sa.text('clock_out IS NULL'),
+    )
+
+    oldest = bind.execute(sa.text("SELECT min(clock_in) FROM time_entries_unpartitioned")).scalar()
+    today = datetime.now(timezone.utc).date()
+    first = oldest.date() if oldest is not None else today
+    for month in _iter_months(first, _add_months(today, 4)):
+        for statement in _create_partition_sql(month):
+            op.execute(statement)
+
+    op.execute(
+        "INSERT INTO time_entries (id, employee_id, clock_in, clock_out, site_id) "
+        "SELECT id, employee_id, clock_in, clock_out, site_id FROM time_entries_unpartitioned"
+    )
+    op.execute("DROP TABLE time_entries_unpartitioned")
+    op.execute("ANALYZE time_entries")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE time_entries RENAME TO time_entries_partitioned")
+    op.execute("ALTER TABLE time_entries_partitioned RENAME CONSTRAINT time_entries_pkey TO time_entries_partitioned_pkey")
+    op.drop_index('ix_time_entries_site_id_employee_id', table_name='time_entries_partitioned')
+    op.drop_index('ix_time_entries_site_id_clock_in', table_name='time_entries_partitioned')
+    op.drop_index('ix_time_entries_open_employee_id', table_name='time_entries_partitioned')
+
+    op.execute("""
+        CREATE TABLE time_entries (
+            id INTEGER NOT NULL DEFAULT nextval('time_entries_id_seq'),
+            employee_id VARCHAR(128) NOT NULL REFERENCES employees (employee_id),
+            clock_in TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            clock_out TIMESTAMP WITHOUT TIME ZONE,
+            site_id VARCHAR(64) NOT NULL DEFAULT 'default',
+            CONSTRAINT time_entries_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(
+        "INSERT INTO time_entries (id, employee_id, clock_in, clock_out, site_id) "
+        "SELECT id, employee_id, clock_in, clock_out, site_id FROM time_entries_partitioned"
+    )
+    op.execute("ALTER SEQUENCE time_entries_id_seq OWNED BY time_entries.id")
+    op.execute("DROP TABLE time_entries_partitioned")
+
+    op.create_index('ix_time_entries_site_id_employee_id', 'time_entries', ['site_id', 'employee_id'], unique=False)
+    op.create_index('ix_time_entries_site_id_clock_in', 'time_entries', ['site_id', 'clock_in'], unique=False)
+    op.create_foreign_key(
+        'clock_sync_events_time_entry_id_fkey', 'clock_sync_events', 'time_entries',
+        ['time_entry_id'], ['id'], ondelete='SET NULL',
+    )
@@ -0,0 +1,40 @@
+"""add_site_partitioning
+
+Revision ID: c71d0e5a2f86
+Revises: 8b2e4f1c9d03
+Create Date: 2026-10-19 16:41:09.302117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d0e5a2f86'
+down_revision: Union[str, Sequence[str], None] = '8b2e4f1c9d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('employees', sa.Column('site_id', sa.String(length=64), server_default='default', nullable=False))
+    op.add_column('time_entries', sa.Column('site_id', sa.String(length=64), server_default='default', nullable=False))
+
+    op.create_index('ix_employees_site_id_employee_id', 'employees', ['site_id', 'employee_id'], unique=False)
+    op.create_index('ix_employees_site_id_name', 'employees', ['site_id', 'name'], unique=False)
+    op.create_index('ix_time_entries_site_id_employee_id', 'time_entries', ['site_id', 'employee_id'], unique=False)
+    op.create_index('ix_time_entries_site_id_clock_in', 'time_entries', ['site_id', 'clock_in'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_time_entries_site_id_clock_in', table_name='time_entries')
+    op.drop_index('ix_time_entries_site_id_employee_id', table_name='time_entries')
+    op.drop_index('ix_employees_site_id_name', table_name='employees')
+    op.drop_index('ix_employees_site_id_employee_id', table_name='employees')
+
+    op.drop_column('time_entries', 'site_id')
+    op.drop_column('employees', 'site_id')
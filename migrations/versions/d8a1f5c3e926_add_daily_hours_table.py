@@ -0,0 +1,43 @@
+"""add_daily_hours_table
+
+Revision ID: d8a1f5c3e926
+Revises: b6f3d2a9e184
+Create Date: 2026-10-19 21:04:12.377519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a1f5c3e926'
+down_revision: Union[str, Sequence[str], None] = 'b6f3d2a9e184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    The table starts empty; fill it from existing entries with
+    `python -m scripts.rebuild_daily_hours`.
+    """
+    op.create_table('daily_hours',
+    sa.Column('employee_id', sa.String(length=128), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('site_id', sa.String(length=64), server_default='default', nullable=False),
+    sa.Column('seconds', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('employee_id', 'day')
+    )
+    op.create_index('ix_daily_hours_site_id_day', 'daily_hours', ['site_id', 'day'], unique=False)
+    op.create_index('ix_daily_hours_day', 'daily_hours', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_daily_hours_day', table_name='daily_hours')
+    op.drop_index('ix_daily_hours_site_id_day', table_name='daily_hours')
+    op.drop_table('daily_hours')
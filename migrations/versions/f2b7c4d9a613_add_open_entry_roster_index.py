@@ -0,0 +1,34 @@
+"""add_open_entry_roster_index
+
+Revision ID: f2b7c4d9a613
+Revises: d8a1f5c3e926
+Create Date: 2026-10-19 21:48:30.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c4d9a613'
+down_revision: Union[str, Sequence[str], None] = 'd8a1f5c3e926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Partial: holds only the entries of people currently on site
+    op.create_index(
+        'ix_time_entries_open_site_id_employee_id', 'time_entries', ['site_id', 'employee_id'],
+        unique=False,
+        postgresql_where=sa.text('clock_out IS NULL'),
+        sqlite_where=sa.text('clock_out IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_time_entries_open_site_id_employee_id', table_name='time_entries')
@@ -0,0 +1,74 @@
+"""
+Admin-only operational endpoints.
+
+Provides routes for:
+    - on-demand sampling profile of the serving worker
+"""
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+from structlog import get_logger
+
+from core import profiler
+
+
+log = get_logger()
+
+MAX_PROFILE_SECONDS = 120
+
+
+def create_admin_router(admin_required) -> APIRouter:
+    """
+    Build the admin router. Every route requires a valid X-Admin-Key.
+    """
+    router = APIRouter(tags=["Admin"], dependencies=[Depends(admin_required)])
+
+    # ------------------------------------------------------------------
+    # POST /admin/profile  → Sample this worker for N seconds
+    # ------------------------------------------------------------------
+    @router.post("/profile")
+    def profile_worker(
+        seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+        interval_ms: float = Query(5.0, ge=1, le=100),
+        format: Literal["collapsed", "speedscope"] = Query("collapsed"),
+        route: Optional[str] = Query(None, description="Only sample requests whose path starts with this."),
+        header: Optional[str] = Query(None, description="Only sample requests carrying this header ('name' or 'name=value')."),
+        include_idle: bool = Query(False),
+    ):
+        """
+        Run the sampling profiler inside the worker that receives this
+        request and return the result.
+
+        Note that with several workers, only the one serving this call is
+        profiled.
+        """
+        log.info(
+            "profile_request",
+            seconds=seconds,
+            interval_ms=interval_ms,
+            format=format,
+            route=route,
+            header=header,
+        )
+
+        result = profiler.sample(
+            seconds,
+            interval=interval_ms / 1000,
+            matcher=profiler.build_request_matcher(route=route, header=header),
+            include_idle=include_idle,
+        )
+
+        log.info(
+            "profile_complete",
+            samples=result.total_samples,
+            unique_stacks=len(result.counts),
+        )
+
+        if format == "speedscope":
+            return JSONResponse(result.speedscope())
+
+        return PlainTextResponse(result.collapsed())
+
+    return router
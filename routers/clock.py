@@ -1,30 +1,84 @@
 """
 Clock-in/clock-out API endpoints.
 
-Provides routes for:
+Mounted at /clock (all sites) and /sites/{site_id}/clock (the employee
+must be enrolled at that site). Provides routes for:
     - clock in (start shift)
     - clock out (end shift)
-    - status check (are they clocked in?)
+    - punch (verify face, then clock in or out)
+    - status check (are they clocked in?), with ETag / If-None-Match
+    - on-site roster (everyone clocked in, paginated)
+    - status stream (Server-Sent Events pushed on every change)
+    - offline kiosk sync (batch of buffered clock events)
 """
 
-from fastapi import APIRouter, Depends, Path, Request
+from contextlib import contextmanager
+from functools import partial
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from structlog import get_logger
 
 from core.api_response import ApiResponse, ok
-from schemas import ClockStatus
-from services.clock_service import clock_in, clock_out, get_clock_status
+from core.etag import ValidatorCache, if_none_match, make_etag, not_modified
+from core.settings import Settings
+from core.sites import current_site
+from core.status_broker import StatusBroker
+from data.clock_writer import GroupCommitWriter
+from data.database import ReplicaRouter
+from schemas import (
+    ClockStatus,
+    ClockSyncOutcome,
+    ClockSyncRequest,
+    FaceProbe,
+    PunchResult,
+    RosterPage,
+)
+from services.clock_service import clock_in, clock_out, get_clock_status, get_roster, punch
+from services.status_stream import StatusStreamResponse, status_events
+from services.sync_clock_events import sync_clock_events
 
 
 log = get_logger()
 
+MAX_ROSTER_PAGE = 1000
+MAX_ROSTER_IDS = 500
+
+# Status must be revalidated on every poll; 304s keep that cheap
+STATUS_CACHE_CONTROL = "private, no-cache"
+
 
 def create_clock_router(
+    settings: Settings,
     limiter: Limiter,
     get_session,
+    get_read_session,
+    replicas: ReplicaRouter,
+    writer: Optional[GroupCommitWriter] = None,
+    broker: Optional[StatusBroker] = None,
+    stream_heartbeat: float = 15.0,
+    stream_resync: float = 30.0,
+    etags: Optional[ValidatorCache] = None,
 ) -> APIRouter:
+    """
+    Clock actions write to the primary (get_session, or the group-commit
+    `writer` when enabled) and pin the employee's status reads to it for
+    a few seconds (replicas); status checks otherwise use
+    get_read_session. `settings` supplies the face match configuration
+    for punches.
+
+    With a `broker`, clock actions publish status changes and
+    GET /clock/stream pushes them to subscribers (heartbeat comment every
+    `stream_heartbeat` seconds, database resync every `stream_resync`).
+
+    Status ETags are remembered in `etags` under ("status", employee_id);
+    the caller invalidates that group when the employee's status changes.
+    """
     router = APIRouter(tags=["Clock"])
+    etags = etags if etags is not None else ValidatorCache(ttl=0)
 
     # ------------------------------------------------------------------
     # POST /clock/{employee_id}/in  → Clock in
@@ -35,11 +89,13 @@ def create_clock_router(
         request: Request,
         employee_id: str = Path(..., min_length=1),
         db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
     ):
         """Clock in an employee. Returns the new clock status."""
         log.info("clock_in_request", employee_id=employee_id)
 
-        entry = clock_in(employee_id, db)
+        entry = clock_in(employee_id, db, site_id, writer, broker)
+        replicas.record_write(employee_id)
 
         log.info("clock_in_complete", employee_id=employee_id)
 
@@ -57,11 +113,13 @@ def create_clock_router(
         request: Request,
         employee_id: str = Path(..., min_length=1),
         db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
     ):
         """Clock out an employee. Returns the updated clock status."""
         log.info("clock_out_request", employee_id=employee_id)
 
-        clock_out(employee_id, db)
+        clock_out(employee_id, db, site_id, writer, broker)
+        replicas.record_write(employee_id)
 
         log.info("clock_out_complete", employee_id=employee_id)
 
@@ -70,6 +128,58 @@ def create_clock_router(
             clock_in_time=None
         ))
 
+    # ------------------------------------------------------------------
+    # POST /clock/{employee_id}/punch  → Verify face, then clock in/out
+    # ------------------------------------------------------------------
+    @router.post("/{employee_id}/punch", response_model=ApiResponse[PunchResult])
+    @limiter.limit("10/minute")
+    def do_punch(
+        request: Request,
+        probe: FaceProbe,
+        employee_id: str = Path(..., min_length=1),
+        db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Verify a face embedding for the employee and, if it matches, clock
+        them in (no open entry) or out (open entry). Returns the
+        similarity and the new clock status.
+        """
+        log.info("punch_request", employee_id=employee_id)
+
+        result = punch(employee_id, probe, db, settings, site_id, broker)
+        replicas.record_write(employee_id)
+
+        log.info("punch_complete", employee_id=employee_id, action=result.action)
+
+        return ok(result)
+
+    # ------------------------------------------------------------------
+    # POST /clock/sync  → Apply a kiosk's buffered offline events
+    # ------------------------------------------------------------------
+    @router.post("/sync", response_model=ApiResponse[List[ClockSyncOutcome]])
+    @limiter.limit("30/minute")
+    def sync_events(
+        request: Request,
+        req: ClockSyncRequest,
+        db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Apply clock events recorded while a kiosk was offline, in one
+        transaction. Returns one outcome per event, in request order;
+        rejected events do not fail the request.
+        """
+        log.info("clock_sync_request", events=len(req.events))
+
+        outcomes = sync_clock_events(req, db, site_id, broker)
+
+        for outcome in outcomes:
+            if outcome.status == "applied" and not outcome.duplicate:
+                replicas.record_write(outcome.employee_id)
+
+        return ok(outcomes)
+
     # ------------------------------------------------------------------
     # GET /clock/{employee_id}/status  → Check clock status
     # ------------------------------------------------------------------
@@ -77,13 +187,30 @@ def create_clock_router(
     @limiter.limit("30/minute")
     def get_status(
         request: Request,
+        response: Response,
         employee_id: str = Path(..., min_length=1),
-        db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
     ):
-        """Check if an employee is currently clocked in."""
+        """
+        Check if an employee is currently clocked in.
+
+        Sends an ETag; a poll repeating it in If-None-Match gets 304,
+        without a database read while this worker's copy is fresh.
+        """
         log.info("clock_status_request", employee_id=employee_id)
 
-        status = get_clock_status(employee_id, db)
+        group = ("status", employee_id)
+        cached = etags.get(group, site_id)
+        if if_none_match(request, cached):
+            return not_modified(cached, STATUS_CACHE_CONTROL)
+
+        # The session is opened only when the status must be read
+        generation = etags.generation(group)
+        with contextmanager(get_read_session)(request) as db:
+            status = get_clock_status(employee_id, db, site_id)
+
+        etag = make_etag(status.is_clocked_in, status.clock_in_time)
+        etags.put(group, site_id, etag, generation)
 
         log.info(
             "clock_status_response",
@@ -91,6 +218,68 @@ def create_clock_router(
             is_clocked_in=status.is_clocked_in,
         )
 
+        if if_none_match(request, etag):
+            return not_modified(etag, STATUS_CACHE_CONTROL)
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = STATUS_CACHE_CONTROL
         return ok(status)
 
+    # ------------------------------------------------------------------
+    # GET /clock/roster  → Everyone currently clocked in
+    # ------------------------------------------------------------------
+    @router.get("/roster", response_model=ApiResponse[RosterPage])
+    @limiter.limit("30/minute")
+    def roster(
+        request: Request,
+        employee_id: Optional[List[str]] = Query(None, max_length=MAX_ROSTER_IDS),
+        after: Optional[str] = Query(None, description="next_after of the previous page."),
+        limit: int = Query(100, ge=1, le=MAX_ROSTER_PAGE),
+        db: Session = Depends(get_read_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        List open entries by employee_id, optionally only for the given
+        employee_id values (repeat the parameter). Follow next_after to
+        page through large sites.
+        """
+        log.info("clock_roster_request", site_id=site_id, after=after, limit=limit)
+
+        return ok(get_roster(db, site_id, employee_id, after, limit))
+
+    if broker is None:
+        return router
+
+    # ------------------------------------------------------------------
+    # GET /clock/stream  → Push status changes (Server-Sent Events)
+    # ------------------------------------------------------------------
+    @router.get("/stream", response_class=StreamingResponse)
+    @limiter.limit("10/minute")
+    async def stream_status(
+        request: Request,
+        employee_id: Optional[List[str]] = Query(None, max_length=MAX_ROSTER_IDS),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Stream `status` events: first the current status of the given
+        employee_id values (repeat the parameter; without any, everyone
+        clocked in), then every change. Replaces polling the status route.
+        """
+        log.info("clock_stream_request", site_id=site_id)
+
+        # Subscribe before responding: a full broker is a 503, not a
+        # stream that ends at once. The response closes the subscription.
+        subscription = broker.subscribe(employee_id, site_id)
+
+        return StatusStreamResponse(
+            subscription,
+            status_events(
+                subscription,
+                partial(contextmanager(get_read_session), request),
+                heartbeat=stream_heartbeat,
+                resync=stream_resync,
+            ),
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     return router
\ No newline at end of file
@@ -1,47 +1,86 @@
 """
 Employee-related API endpoints.
 
-Provides routes for:
+Mounted at /employees (all sites) and /sites/{site_id}/employees
+(scoped to one site). Provides routes for:
     - employee registration (admin-only)
+    - additional face template enrollment (admin-only)
     - face verification (public, rate-limited)
-    - prefix-based employee search (public, rate-limited)
+    - 1:N face identification (public, rate-limited)
+    - prefix-based employee search (public, rate-limited, ETag / If-None-Match)
+    - timesheets over live and archived entries (admin-only)
+    - hours reports from the daily_hours rollup (admin-only)
 """
 
-from typing import List
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from structlog import get_logger
 
 from core.api_response import ApiResponse, ok
+from core.etag import ValidatorCache, if_none_match, make_etag, not_modified
 from core.settings import Settings
-from schemas import EmployeeInput, VerifyFaceRequest, EmployeeResult
+from core.face_index import SiteGalleries
+from core.sites import current_site
+from data.archive import TimeEntryArchive
+from data.models import DEFAULT_SITE
+from schemas import (
+    EmployeeInput,
+    VerifyFaceRequest,
+    EmployeeResult,
+    FaceTemplateInput,
+    IdentifyFaceRequest,
+    IdentifyResult,
+    TimeEntryResult,
+    DailyHoursResult,
+    HoursTotalResult,
+)
 from services.verify_face import verify_face_embedding
+from services.identify_face import identify_face
 from services.register_employee import register_employee
+from services.enroll_face_template import enroll_face_template
 from services.search_employees import search_employees_by_prefix
+from services.timesheet import get_timesheet
+from services.hours_report import get_employee_daily_hours, get_hours_summary
 
 
 log = get_logger()
 
+# ValidatorCache group holding every search ETag of this worker
+SEARCH_ETAGS = ("search",)
+
 
 def create_employee_router(
     settings: Settings,
     limiter: Limiter,
     get_session,
+    get_read_session,
     admin_required,
+    galleries: SiteGalleries,
+    archive: Optional[TimeEntryArchive] = None,
+    etags: Optional[ValidatorCache] = None,
 ) -> APIRouter:
     """
     Build a fresh APIRouter for employee endpoints, wired to:
 
-        • settings       – app configuration (reserved for future use)
+        • settings       – app configuration (thresholds, template limits)
         • limiter        – SlowAPI limiter instance
-        • get_session    – FastAPI DB dependency
+        • get_session    – FastAPI DB dependency (primary)
+        • get_read_session – DB dependency for read-only routes (replica)
         • admin_required – dependency enforcing X-Admin-Key
+        • galleries      – per-site identification index caches
+        • archive        – cold archive of old time entries (optional)
+        • etags          – remembered search ETags (optional)
 
     This keeps the router completely decoupled from global state.
     """
     router = APIRouter(tags=["Employees"])
+    etags = etags if etags is not None else ValidatorCache(ttl=0)
+    search_cache_control = f"private, max-age={settings.search_cache_max_age_seconds}"
 
     # ------------------------------------------------------------------
     # POST /employees/  → Admin-only registration
@@ -54,18 +93,26 @@ def create_employee_router(
     def add_employee(
         employee: EmployeeInput,
         db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
     ):
         """
         Register a new employee with normalized face embedding.
+        A face already enrolled for another employee is rejected (409) or
+        logged, per settings.duplicate_enrollment_check.
         Requires a valid X-Admin-Key header.
         """
         log.info(
             "employee_register_request",
             employee_id=employee.employee_id,
             role=employee.role,
+            site_id=site_id,
         )
 
-        register_employee(employee, db)
+        # Checked against every site: the same person at two sites is
+        # still a duplicate
+        register_employee(employee, db, site_id, settings, galleries.get(None))
+        galleries.add(site_id or DEFAULT_SITE, employee.employee_id, employee.embedding)
+        etags.invalidate(SEARCH_ETAGS)
 
         log.info(
             "employee_registered",
@@ -74,6 +121,40 @@ def create_employee_router(
 
         return ok()
 
+    # ------------------------------------------------------------------
+    # POST /employees/{employee_id}/templates  → Admin-only enrollment
+    # ------------------------------------------------------------------
+    @router.post(
+        "/{employee_id}/templates",
+        response_model=ApiResponse[None],
+        dependencies=[Depends(admin_required)],
+    )
+    def add_face_template(
+        employee_id: str,
+        template: FaceTemplateInput,
+        db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Enroll an additional face template (different lighting, glasses,
+        beard, ...) for an existing employee.
+        Requires a valid X-Admin-Key header.
+        """
+        log.info(
+            "face_template_enroll_request",
+            employee_id=employee_id,
+        )
+
+        count = enroll_face_template(employee_id, template, db, settings, site_id)
+
+        log.info(
+            "face_template_enrolled",
+            employee_id=employee_id,
+            templates=count,
+        )
+
+        return ok()
+
     # ------------------------------------------------------------------
     # POST /employees/verify  → Public, rate-limited
     # ------------------------------------------------------------------
@@ -82,7 +163,8 @@ def create_employee_router(
     def verify_face(
         request: Request,  # required for SlowAPI
         req: VerifyFaceRequest,
-        db: Session = Depends(get_session),
+        db: Session = Depends(get_read_session),
+        site_id: Optional[str] = Depends(current_site),
     ):
         """
         Verify a submitted face embedding against the stored employee embedding.
@@ -93,7 +175,7 @@ def create_employee_router(
             employee_id=req.employee_id,
         )
 
-        verify_face_embedding(req, db, settings=settings)
+        verify_face_embedding(req, db, settings=settings, site_id=site_id)
 
         log.info(
             "face_verification_success",
@@ -102,6 +184,32 @@ def create_employee_router(
 
         return ok()
 
+    # ------------------------------------------------------------------
+    # POST /employees/identify  → Public, rate-limited
+    # ------------------------------------------------------------------
+    @router.post("/identify", response_model=ApiResponse[IdentifyResult])
+    @limiter.limit("10/second")
+    def identify(
+        request: Request,  # required for SlowAPI
+        req: IdentifyFaceRequest,
+        db: Session = Depends(get_read_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Identify which enrolled employee a face embedding belongs to.
+        Public endpoint, protected by rate limiting.
+        """
+        log.info("face_identification_request", site_id=site_id)
+
+        result = identify_face(req, db, settings, galleries.get(site_id))
+
+        log.info(
+            "face_identification_success",
+            employee_id=result.employee_id,
+        )
+
+        return ok(result)
+
     # ------------------------------------------------------------------
     # GET /employees/search  → Public, rate-limited
     # ------------------------------------------------------------------
@@ -109,18 +217,32 @@ def create_employee_router(
     @limiter.limit("5/second")
     def get_employees(
         request: Request,  # required for SlowAPI
+        response: Response,
         prefix: str = Query(..., min_length=3),
-        db: Session = Depends(get_session),
+        site_id: Optional[str] = Depends(current_site),
     ):
         """
         Search for employees whose name or ID begins with a given prefix.
+
+        Sends an ETag; a repeated search with If-None-Match gets 304,
+        without a database read while this worker's copy is fresh.
         """
         log.info(
             "employee_search_request",
             prefix=prefix,
         )
 
-        results = search_employees_by_prefix(prefix, db)
+        cached = etags.get(SEARCH_ETAGS, (site_id, prefix))
+        if if_none_match(request, cached):
+            return not_modified(cached, search_cache_control)
+
+        # The session is opened only when the search must run
+        generation = etags.generation(SEARCH_ETAGS)
+        with contextmanager(get_read_session)(request) as db:
+            results = search_employees_by_prefix(prefix, db, site_id)
+
+        etag = make_etag([(r.employee_id, r.name, r.role) for r in results])
+        etags.put(SEARCH_ETAGS, (site_id, prefix), etag, generation)
 
         log.info(
             "employee_search_results",
@@ -128,6 +250,96 @@ def create_employee_router(
             count=len(results),
         )
 
+        if if_none_match(request, etag):
+            return not_modified(etag, search_cache_control)
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = search_cache_control
+        return ok(results)
+
+    # ------------------------------------------------------------------
+    # GET /employees/{employee_id}/timesheet  → Admin-only
+    # ------------------------------------------------------------------
+    @router.get(
+        "/{employee_id}/timesheet",
+        response_model=ApiResponse[List[TimeEntryResult]],
+        dependencies=[Depends(admin_required)],
+    )
+    def timesheet(
+        employee_id: str,
+        start: datetime = Query(...),
+        end: datetime = Query(...),
+        db: Session = Depends(get_read_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Shifts clocked in within [start, end), including archived ones.
+        Requires a valid X-Admin-Key header.
+        """
+        log.info(
+            "timesheet_request",
+            employee_id=employee_id,
+            start=start.isoformat(),
+            end=end.isoformat(),
+        )
+
+        results = get_timesheet(employee_id, start, end, db, archive, site_id)
+
         return ok(results)
 
+    # ------------------------------------------------------------------
+    # GET /employees/hours  → Admin-only, totals per employee
+    # ------------------------------------------------------------------
+    @router.get(
+        "/hours",
+        response_model=ApiResponse[List[HoursTotalResult]],
+        dependencies=[Depends(admin_required)],
+    )
+    def hours_summary(
+        start: date = Query(...),
+        end: date = Query(...),
+        db: Session = Depends(get_read_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Seconds worked per employee over the days in [start, end).
+        Requires a valid X-Admin-Key header.
+        """
+        log.info(
+            "hours_summary_request",
+            start=start.isoformat(),
+            end=end.isoformat(),
+            site_id=site_id,
+        )
+
+        return ok(get_hours_summary(start, end, db, site_id))
+
+    # ------------------------------------------------------------------
+    # GET /employees/{employee_id}/hours  → Admin-only, per day
+    # ------------------------------------------------------------------
+    @router.get(
+        "/{employee_id}/hours",
+        response_model=ApiResponse[List[DailyHoursResult]],
+        dependencies=[Depends(admin_required)],
+    )
+    def daily_hours(
+        employee_id: str,
+        start: date = Query(...),
+        end: date = Query(...),
+        db: Session = Depends(get_read_session),
+        site_id: Optional[str] = Depends(current_site),
+    ):
+        """
+        Seconds worked on each day in [start, end).
+        Requires a valid X-Admin-Key header.
+        """
+        log.info(
+            "daily_hours_request",
+            employee_id=employee_id,
+            start=start.isoformat(),
+            end=end.isoformat(),
+        )
+
+        return ok(get_employee_daily_hours(employee_id, start, end, db, site_id))
+
     return router
@@ -1,9 +1,37 @@
 from .input.employee_input import EmployeeInput
-from .input.verify_face_request import VerifyFaceRequest
+from .input.verify_face_request import FaceProbe, VerifyFaceRequest
+from .input.face_template_input import FaceTemplateInput
+from .input.identify_face_request import IdentifyFaceRequest
+from .input.clock_sync_request import ClockSyncRequest, ClockSyncEventInput
 from .output.employee_result import EmployeeResult
-from .output.clock_status import ClockStatus
+from .output.clock_status import ClockStatus, EmployeeClockStatus
+from .output.identify_result import IdentifyResult
+from .output.clock_sync_result import ClockSyncOutcome
+from .output.time_entry_result import TimeEntryResult
+from .output.hours_result import DailyHoursResult, HoursTotalResult
+from .output.roster import RosterEntry, RosterPage
+from .output.punch_result import PunchResult
 
-__all__ = ["EmployeeInput", "VerifyFaceRequest", "EmployeeResult", "ClockStatus"]
+__all__ = [
+    "EmployeeInput",
+    "VerifyFaceRequest",
+    "FaceProbe",
+    "FaceTemplateInput",
+    "IdentifyFaceRequest",
+    "ClockSyncRequest",
+    "ClockSyncEventInput",
+    "EmployeeResult",
+    "ClockStatus",
+    "EmployeeClockStatus",
+    "IdentifyResult",
+    "ClockSyncOutcome",
+    "TimeEntryResult",
+    "DailyHoursResult",
+    "HoursTotalResult",
+    "RosterEntry",
+    "RosterPage",
+    "PunchResult",
+]
 """
 Public schema exports for the `schemas` package.
 
@@ -15,12 +43,41 @@ Exposed models:
     EmployeeInput:
         Payload for creating or updating an employee.
 
-    VerifyFaceRequest:
-        Payload for verifying a live face embedding against a stored one.
+    VerifyFaceRequest / FaceProbe:
+        Payload for verifying a live face embedding against a stored one
+        (FaceProbe alone is the body of a punch).
+
+    FaceTemplateInput:
+        Payload for enrolling an additional face template for an employee.
+
+    IdentifyFaceRequest:
+        Payload for 1:N identification of an unknown face.
+
+    ClockSyncRequest / ClockSyncEventInput:
+        Batch of offline kiosk clock events.
 
     EmployeeResult:
         Simplified employee representation returned by search endpoints.
 
-    ClockStatus:
-        Current clock-in state for an employee.
+    ClockStatus / EmployeeClockStatus:
+        Current clock-in state for an employee (the latter names the
+        employee, for status streams).
+
+    IdentifyResult:
+        Best identification match and its similarity score.
+
+    ClockSyncOutcome:
+        Per-event result of a kiosk sync.
+
+    TimeEntryResult:
+        One shift in a timesheet, live or archived.
+
+    DailyHoursResult / HoursTotalResult:
+        Worked time per day, and per employee over a range.
+
+    RosterEntry / RosterPage:
+        Page of employees currently clocked in.
+
+    PunchResult:
+        Verified clock action performed by a punch, with the new status.
 """
@@ -0,0 +1,47 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+from core.timing import TimedModel
+
+# Upper bound on events a kiosk may upload in one sync request
+MAX_SYNC_EVENTS = 500
+
+
+class ClockSyncEventInput(BaseModel):
+    """
+    One clock tap recorded by a kiosk while offline.
+
+    Fields:
+        event_id (str):
+            Kiosk-generated unique id (e.g. a UUID). Re-sending an event
+            returns its original outcome instead of applying it again.
+
+        employee_id (str):
+            Employee who tapped.
+
+        action ("in" | "out"):
+            Clock in or clock out.
+
+        occurred_at (datetime):
+            When the tap happened on the kiosk. Timezone-aware values are
+            converted to UTC.
+    """
+
+    event_id: str = Field(..., min_length=1, max_length=64)
+    employee_id: str = Field(..., min_length=1, max_length=128)
+    action: Literal["in", "out"]
+    occurred_at: datetime
+
+
+class ClockSyncRequest(TimedModel):
+    """
+    Schema for POST /clock/sync.
+
+    Fields:
+        events (List[ClockSyncEventInput]):
+            Buffered events in any order (1 to MAX_SYNC_EVENTS). They are
+            applied per employee in occurred_at order.
+    """
+
+    events: List[ClockSyncEventInput] = Field(..., min_length=1, max_length=MAX_SYNC_EVENTS)
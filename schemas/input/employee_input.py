@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import Field
 from typing import List, Literal, Optional
 
-class EmployeeInput(BaseModel):
+from core.timing import TimedModel
+
+class EmployeeInput(TimedModel):
     """
     Schema for incoming employee registration requests.
 
@@ -0,0 +1,17 @@
+from pydantic import Field
+from typing import List
+
+from core.timing import TimedModel
+
+class FaceTemplateInput(TimedModel):
+    """
+    Schema for enrolling an additional face template for an existing employee.
+
+    Fields:
+        embedding (List[float]):
+            Face embedding captured under different conditions than the
+            primary one (lighting, glasses, beard, ...). Must contain
+            exactly 512 floating-point values.
+    """
+
+    embedding: List[float] = Field(..., min_length=512, max_length=512)
@@ -0,0 +1,17 @@
+from typing import List
+
+from core.timing import TimedModel
+
+class IdentifyFaceRequest(TimedModel):
+    """
+    Schema for 1:N identification requests.
+
+    Unlike VerifyFaceRequest no employee_id is given; the probe is searched
+    against every enrolled employee.
+
+    Fields:
+        embedding (List[float]):
+            Probe face embedding from the kiosk.
+    """
+
+    embedding: List[float]
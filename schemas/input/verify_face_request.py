@@ -1,6 +1,47 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import Field, model_validator
+from typing import List, Optional
+
+from core.timing import TimedModel
+
+# Upper bound on frames a kiosk may submit in one scan
+MAX_PROBE_FRAMES = 10
+
+
+class FaceProbe(TimedModel):
+    """
+    Face probe submitted by a kiosk.
+
+    Exactly one of `embedding` or `embeddings` must be given:
+
+        embedding (List[float]):
+            A single probe embedding.
+
+        embeddings (List[List[float]]):
+            Several probe embeddings from the same scan (one per captured
+            frame, at most MAX_PROBE_FRAMES). They are scored together and
+            combined per settings.probe_aggregate.
+    """
+
+    embedding: Optional[List[float]] = None
+    embeddings: Optional[List[List[float]]] = Field(
+        None, min_length=1, max_length=MAX_PROBE_FRAMES
+    )
+
+    @model_validator(mode="after")
+    def _exactly_one_probe_field(self):
+        if (self.embedding is None) == (self.embeddings is None):
+            raise ValueError("Provide exactly one of 'embedding' or 'embeddings'.")
+        return self
+
+    @property
+    def probes(self) -> List[List[float]]:
+        """All submitted probe embeddings, one per frame."""
+        return self.embeddings if self.embeddings is not None else [self.embedding]
+
+
+class VerifyFaceRequest(FaceProbe):
+    """
+    Schema for face verification requests: a FaceProbe for `employee_id`.
+    """
 
-class VerifyFaceRequest(BaseModel):
     employee_id: str
-    embedding: List[float]
@@ -11,4 +11,10 @@ class ClockStatus(BaseModel):
     whether to show "Clock In" or "Clock Out" button.
     """
     is_clocked_in: bool
-    clock_in_time: Optional[datetime] = None
\ No newline at end of file
+    clock_in_time: Optional[datetime] = None
+
+class EmployeeClockStatus(ClockStatus):
+    """
+    ClockStatus of a named employee, as pushed by GET /clock/stream.
+    """
+    employee_id: str
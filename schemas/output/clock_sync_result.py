@@ -0,0 +1,22 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+
+class ClockSyncOutcome(BaseModel):
+    """
+    Result of one event from a POST /clock/sync request.
+
+    Fields:
+        status:    "applied" or "rejected".
+        code:      ErrorCode value explaining a rejection (e.g.
+                   ALREADY_CLOCKED_IN), otherwise None.
+        duplicate: True when the event_id was already synced; status and
+                   code are then those of the original attempt.
+        time_entry_id: Time entry created or closed by the event.
+    """
+    event_id: str
+    employee_id: str
+    status: Literal["applied", "rejected"]
+    code: Optional[str] = None
+    duplicate: bool = False
+    time_entry_id: Optional[int] = None
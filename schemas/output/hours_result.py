@@ -0,0 +1,27 @@
+from datetime import date
+from pydantic import BaseModel
+
+
+class DailyHoursResult(BaseModel):
+    """
+    Time one employee worked on one calendar day (daily_hours rollup).
+
+    entries counts the shifts that started that day; a shift crossing
+    midnight contributes seconds to both days.
+    """
+    employee_id: str
+    site_id: str
+    day: date
+    seconds: int
+    entries: int
+
+
+class HoursTotalResult(BaseModel):
+    """
+    One employee's totals over a report range (payroll view).
+    """
+    employee_id: str
+    site_id: str
+    seconds: int
+    entries: int
+    days: int
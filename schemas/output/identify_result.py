@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+class IdentifyResult(BaseModel):
+    """
+    Best match returned by the identification endpoint.
+
+    Fields:
+        employee_id (str):
+            Identifier of the matched employee.
+
+        name (str):
+            Human-readable display name.
+
+        score (float):
+            Cosine similarity of the probe to the employee's embedding.
+    """
+
+    employee_id: str
+    name: str
+    score: float
@@ -0,0 +1,17 @@
+from typing import Literal
+from pydantic import BaseModel
+
+from .clock_status import ClockStatus
+
+
+class PunchResult(BaseModel):
+    """
+    Outcome of POST /clock/{employee_id}/punch.
+
+    action is the clock action the punch performed ("in" when the
+    employee had no open entry, "out" otherwise); similarity is the
+    verified face match score; status is the resulting clock status.
+    """
+    action: Literal["in", "out"]
+    similarity: float
+    status: ClockStatus
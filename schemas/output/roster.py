@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class RosterEntry(BaseModel):
+    """
+    One employee currently clocked in.
+    """
+    employee_id: str
+    site_id: str
+    time_entry_id: int
+    clock_in: datetime
+
+
+class RosterPage(BaseModel):
+    """
+    One page of the on-site roster, ordered by employee_id.
+
+    next_after is the `after` value for the next page, or None on the
+    last page.
+    """
+    entries: List[RosterEntry]
+    next_after: Optional[str] = None
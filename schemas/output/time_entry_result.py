@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class TimeEntryResult(BaseModel):
+    """
+    One shift in a timesheet.
+
+    archived is True for entries served from the cold archive
+    (data.archive) instead of the live table.
+    """
+    id: int
+    employee_id: str
+    site_id: str
+    clock_in: datetime
+    clock_out: Optional[datetime] = None
+    archived: bool = False
@@ -0,0 +1,76 @@
+"""
+Move closed time entries older than a cutoff into the cold archive.
+
+Usage:
+    python -m scripts.archive_time_entries --before 2025-01-01
+    python -m scripts.archive_time_entries --before 2025-01-01 --archive-dir /var/lib/tradetrack/archive
+
+Entries that clocked in before --before and have clocked out are read in
+id order, --batch-size rows at a time. Each batch is written as one
+compressed segment (data.archive) and registered in the manifest before
+its rows are deleted, so an interrupted run leaves rows in both places
+at worst; timesheets report such rows once. Open entries are never
+archived. --dry-run only counts the rows that would move.
+
+The archive directory defaults to TIME_ENTRY_ARCHIVE_DIR and the database
+URL to DATABASE_URL (core.settings).
+"""
+
+import argparse
+import sys
+from datetime import date, datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from data.archive import TimeEntryArchive
+from data.time_entry_repository import delete_entries, get_closed_entries_before
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Archive closed time entries.")
+    parser.add_argument("--before", type=date.fromisoformat, required=True, help="YYYY-MM-DD; clock_in cutoff.")
+    parser.add_argument("--archive-dir", help="Defaults to TIME_ENTRY_ARCHIVE_DIR.")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL.")
+    parser.add_argument("--dry-run", action="store_true", help="Count rows without archiving them.")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None or args.archive_dir is None:
+        from core.settings import get_settings
+        settings = get_settings()
+        args.database_url = args.database_url or settings.database_url
+        args.archive_dir = args.archive_dir or settings.time_entry_archive_dir
+
+    if not args.archive_dir:
+        print("No archive directory (set TIME_ENTRY_ARCHIVE_DIR or --archive-dir).", file=sys.stderr)
+        return 2
+
+    cutoff = datetime.combine(args.before, datetime.min.time())
+    archive = TimeEntryArchive(args.archive_dir)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=create_engine(args.database_url, future=True))
+
+    total, after_id = 0, 0
+    with Session() as db:
+        while True:
+            entries = get_closed_entries_before(db, cutoff, after_id, args.batch_size)
+            if not entries:
+                break
+            after_id = entries[-1].id
+            total += len(entries)
+
+            if args.dry_run:
+                continue
+
+            segment = archive.append(entries)
+            delete_entries(db, [e.id for e in entries])
+            db.expunge_all()
+            print(f"{segment['file']}: {segment['rows']} entries")
+
+    verb = "Would archive" if args.dry_run else "Archived"
+    print(f"{verb} {total} entries clocked in before {args.before.isoformat()}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+List employees enrolled more than once under different ids.
+
+Usage:
+    python -m scripts.audit_duplicate_enrollments
+    python -m scripts.audit_duplicate_enrollments --threshold 0.85 --site north
+
+Every pair of primary embeddings (additional face templates are not
+compared) scoring at least --threshold (default
+DUPLICATE_ENROLLMENT_THRESHOLD) is printed as a tab-separated line,
+most similar first. Pairs are found with tiled matrix products
+(core.face_index.near_duplicate_pairs), --block-rows x --block-cols
+scores at a time, so memory stays bounded however large the table.
+Registration already checks new faces; run this once to clean up
+enrollments made before that check, or after raising the threshold.
+
+The database URL defaults to DATABASE_URL (core.settings).
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.face_index import near_duplicate_pairs
+from core.vector_utils import normalize_rows
+from data.employee_repository import get_gallery_embeddings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Find near-duplicate face enrollments.")
+    parser.add_argument("--threshold", type=float, help="Defaults to DUPLICATE_ENROLLMENT_THRESHOLD.")
+    parser.add_argument("--site", help="Only compare employees of this site.")
+    parser.add_argument("--block-rows", type=int, default=2048)
+    parser.add_argument("--block-cols", type=int, default=8192)
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL.")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None or args.threshold is None:
+        from core.settings import get_settings
+        settings = get_settings()
+        args.database_url = args.database_url or settings.database_url
+        if args.threshold is None:
+            args.threshold = settings.duplicate_enrollment_threshold
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=create_engine(args.database_url, future=True))
+    with Session() as db:
+        ids, embeddings, _ = get_gallery_embeddings(db, args.site)
+
+    if not ids:
+        print("No employees enrolled.")
+        return 0
+
+    pairs = near_duplicate_pairs(
+        ids,
+        normalize_rows(embeddings),
+        args.threshold,
+        block_rows=args.block_rows,
+        block_cols=args.block_cols,
+    )
+    for id_a, id_b, score in pairs:
+        print(f"{id_a}\t{id_b}\t{score:.4f}")
+
+    print(f"{len(pairs)} pairs at or above {args.threshold} among {len(ids)} employees.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Backfill or repair the daily_hours rollup from time entries.
+
+Usage:
+    python -m scripts.rebuild_daily_hours
+    python -m scripts.rebuild_daily_hours --start 2025-01-01 --end 2025-04-01
+
+Days in [--start, --end) are recomputed one month per transaction from
+closed entries, plus the cold archive when TIME_ENTRY_ARCHIVE_DIR (or
+--archive-dir) is set. Without --start the rebuild begins at the oldest
+live entry; --end defaults to tomorrow. Run it once after migration
+d8a1f5c3e926, and after any manual edit of time_entries.
+
+Each month's transaction locks the rollup (see rebuild_daily_hours), so
+clock-outs during the run are counted exactly once but wait until that
+month is done.
+"""
+
+import argparse
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from data.archive import TimeEntryArchive
+from data.daily_hours_repository import rebuild_daily_hours
+from data.models import TimeEntry
+from data.partitions import add_months, month_start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the daily_hours rollup.")
+    parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD; defaults to the oldest entry.")
+    parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD, exclusive; defaults to tomorrow.")
+    parser.add_argument("--archive-dir", help="Defaults to TIME_ENTRY_ARCHIVE_DIR.")
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL.")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None or args.archive_dir is None:
+        from core.settings import get_settings
+        settings = get_settings()
+        args.database_url = args.database_url or settings.database_url
+        args.archive_dir = args.archive_dir or settings.time_entry_archive_dir
+
+    archive = TimeEntryArchive(args.archive_dir) if args.archive_dir else None
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=create_engine(args.database_url, future=True))
+
+    with Session() as db:
+        start = args.start
+        if start is None:
+            oldest = db.query(func.min(TimeEntry.clock_in)).scalar()
+            start = oldest.date() if oldest else datetime.now(timezone.utc).date()
+            if archive is not None and archive.segments():
+                first = min(s["min_clock_in"] for s in archive.segments())
+                start = min(start, date.fromisoformat(first[:10]))
+        end = args.end or datetime.now(timezone.utc).date() + timedelta(days=1)
+
+        total = 0
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(add_months(month_start(chunk_start), 1), end)
+            rows = rebuild_daily_hours(db, chunk_start, chunk_end, archive)
+            print(f"{chunk_start.isoformat()} .. {chunk_end.isoformat()}: {rows} rows")
+            total += rows
+            chunk_start = chunk_end
+
+    print(f"Rebuilt {total} daily_hours rows.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Maintain the monthly partitions of time_entries (PostgreSQL only).
+
+Usage:
+    python -m scripts.time_entry_partitions list
+    python -m scripts.time_entry_partitions ensure --months-ahead 3
+    python -m scripts.time_entry_partitions detach --before 2025-01 [--drop] [--force]
+
+Run `ensure` daily from cron so next month's partition always exists
+before the first clock-in lands in it (rows that reach the default
+partition are moved on the next run). `detach` moves partitions that end
+on or before the given month into the `archive` schema, or drops them
+with --drop. Every command accepts --dry-run to print the SQL instead.
+
+The database URL comes from DATABASE_URL (core.settings) unless
+--database-url is given.
+"""
+
+import argparse
+import sys
+from datetime import date
+
+from sqlalchemy import create_engine
+
+from data.partitions import (
+    detach_partitions,
+    ensure_partitions,
+    list_partitions,
+    partition_name,
+)
+
+
+def _month(value: str) -> date:
+    year, month = value.split("-")[:2]
+    return date(int(year), int(month), 1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain time_entries partitions.")
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL.")
+    parser.add_argument("--dry-run", action="store_true", help="Print SQL without executing it.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="Show attached monthly partitions.")
+
+    ensure = commands.add_parser("ensure", help="Create upcoming partitions.")
+    ensure.add_argument("--months-ahead", type=int, default=3)
+
+    detach = commands.add_parser("detach", help="Detach old partitions.")
+    detach.add_argument("--before", type=_month, required=True, help="YYYY-MM; partitions ending by then.")
+    detach.add_argument("--drop", action="store_true", help="Drop instead of moving to the archive schema.")
+    detach.add_argument("--force", action="store_true", help="Also detach partitions with open entries.")
+
+    args = parser.parse_args(argv)
+
+    if args.database_url is None:
+        from core.settings import get_settings
+        args.database_url = get_settings().database_url
+
+    engine = create_engine(args.database_url, future=True)
+    if engine.dialect.name != "postgresql":
+        print(f"time_entries partitioning requires PostgreSQL (got {engine.dialect.name}).", file=sys.stderr)
+        return 2
+
+    with engine.begin() as conn:
+        if args.command == "list":
+            for month in list_partitions(conn):
+                print(partition_name(month))
+            return 0
+
+        if args.command == "ensure":
+            statements = ensure_partitions(conn, months_ahead=args.months_ahead, dry_run=args.dry_run)
+        else:
+            statements = detach_partitions(
+                conn,
+                before=args.before,
+                drop=args.drop,
+                force=args.force,
+                dry_run=args.dry_run,
+            )
+
+    for statement in statements:
+        print(statement + ";")
+    if not statements:
+        print("Nothing to do.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,41 @@ Clock-in/clock-out business logic.
 Orchestrates time entry operations with validation rules:
     • Cannot clock in if already clocked in
     • Cannot clock out if not clocked in
+    • On site-scoped routes, the employee must be enrolled at that site
+
+With a GroupCommitWriter (data.clock_writer) the writes, and the rule
+checks that guard them, are applied by the writer in batched
+transactions instead of through the repository.
+
+A punch verifies the employee's face and then clocks in or out,
+whichever applies, in the request's own session, holding a lock on the
+employee row from the open-entry check until the write commits.
+
+Committed changes are published to the StatusBroker, when given, for
+GET /clock/stream subscribers.
 """
 
+from typing import List, Optional
+
 from sqlalchemy.orm import Session
 from structlog import get_logger
 
+from core.status_broker import StatusBroker, StatusChange
+from data.clock_writer import GroupCommitWriter
 from data.models import TimeEntry
 import data.time_entry_repository as repo
-from core.errors import AlreadyClockedIn, NotClockedIn
-from schemas import ClockStatus
+from core.errors import AlreadyClockedIn, EmployeeNotFound, NotClockedIn
+from core.settings import Settings
+from schemas import (
+    ClockStatus,
+    FaceProbe,
+    PunchResult,
+    RosterEntry,
+    RosterPage,
+    VerifyFaceRequest,
+)
+from services.sites import ensure_employee_at_site
+from services.verify_face import verify_face_embedding
 
 log = get_logger()
 
@@ -21,27 +47,45 @@ log = get_logger()
 # CLOCK IN
 # ---------------------------------------------------------------------------
 
-def clock_in(employee_id: str, db: Session) -> TimeEntry:
+def clock_in(
+    employee_id: str,
+    db: Session,
+    site_id: Optional[str] = None,
+    writer: Optional[GroupCommitWriter] = None,
+    broker: Optional[StatusBroker] = None,
+) -> TimeEntry:
     """
     Clock in an employee.
 
     Raises:
         AlreadyClockedIn: If the employee has an open time entry.
+        EmployeeNotFound: If site_id is given and the employee is not
+                          enrolled at that site.
     """
-    log.info("clock_in_attempt", employee_id=employee_id)
+    log.info("clock_in_attempt", employee_id=employee_id, site_id=site_id)
 
-    # Check for existing open entry
-    existing = repo.get_open_entry(db, employee_id)
-    if existing is not None:
-        log.warning(
-            "clock_in_rejected_already_clocked_in",
-            employee_id=employee_id,
-            existing_entry_id=existing.id,
-        )
-        raise AlreadyClockedIn()
+    if site_id is not None:
+        ensure_employee_at_site(db, employee_id, site_id)
+
+    if writer is not None:
+        try:
+            entry = writer.clock_in(employee_id)
+        except AlreadyClockedIn:
+            log.warning("clock_in_rejected_already_clocked_in", employee_id=employee_id)
+            raise
+    else:
+        # Check for existing open entry
+        existing = repo.get_open_entry(db, employee_id)
+        if existing is not None:
+            log.warning(
+                "clock_in_rejected_already_clocked_in",
+                employee_id=employee_id,
+                existing_entry_id=existing.id,
+            )
+            raise AlreadyClockedIn()
 
-    # Create new entry
-    entry = repo.create_entry(db, employee_id)
+        # Create new entry
+        entry = repo.create_entry(db, employee_id)
 
     log.info(
         "clock_in_success",
@@ -50,6 +94,9 @@ def clock_in(employee_id: str, db: Session) -> TimeEntry:
         clock_in=entry.clock_in.isoformat(),
     )
 
+    if broker is not None:
+        broker.publish(StatusChange(employee_id, entry.site_id, True, entry.clock_in))
+
     return entry
 
 
@@ -57,26 +104,44 @@ def clock_in(employee_id: str, db: Session) -> TimeEntry:
 # CLOCK OUT
 # ---------------------------------------------------------------------------
 
-def clock_out(employee_id: str, db: Session) -> TimeEntry:
+def clock_out(
+    employee_id: str,
+    db: Session,
+    site_id: Optional[str] = None,
+    writer: Optional[GroupCommitWriter] = None,
+    broker: Optional[StatusBroker] = None,
+) -> TimeEntry:
     """
     Clock out an employee.
 
     Raises:
         NotClockedIn: If the employee has no open time entry.
+        EmployeeNotFound: If site_id is given and the employee is not
+                          enrolled at that site.
     """
-    log.info("clock_out_attempt", employee_id=employee_id)
+    log.info("clock_out_attempt", employee_id=employee_id, site_id=site_id)
 
-    # Find open entry
-    entry = repo.get_open_entry(db, employee_id)
-    if entry is None:
-        log.warning(
-            "clock_out_rejected_not_clocked_in",
-            employee_id=employee_id,
-        )
-        raise NotClockedIn()
+    if site_id is not None:
+        ensure_employee_at_site(db, employee_id, site_id)
 
-    # Close the entry
-    closed = repo.close_entry(db, entry)
+    if writer is not None:
+        try:
+            closed = writer.clock_out(employee_id)
+        except NotClockedIn:
+            log.warning("clock_out_rejected_not_clocked_in", employee_id=employee_id)
+            raise
+    else:
+        # Find open entry
+        entry = repo.get_open_entry(db, employee_id)
+        if entry is None:
+            log.warning(
+                "clock_out_rejected_not_clocked_in",
+                employee_id=employee_id,
+            )
+            raise NotClockedIn()
+
+        # Close the entry
+        closed = repo.close_entry(db, entry)
 
     log.info(
         "clock_out_success",
@@ -85,17 +150,100 @@ def clock_out(employee_id: str, db: Session) -> TimeEntry:
         clock_out=closed.clock_out.isoformat() if closed.clock_out else None,
     )
 
+    if broker is not None:
+        broker.publish(StatusChange(employee_id, closed.site_id, False))
+
     return closed
 
 
+# ---------------------------------------------------------------------------
+# PUNCH
+# ---------------------------------------------------------------------------
+
+def punch(
+    employee_id: str,
+    probe: FaceProbe,
+    db: Session,
+    settings: Settings,
+    site_id: Optional[str] = None,
+    broker: Optional[StatusBroker] = None,
+) -> PunchResult:
+    """
+    Verify the employee's face, then clock in if they have no open entry
+    and out otherwise.
+
+    The verification reads, the open-entry check and the write share one
+    session, so a kiosk punch costs one round of queries instead of a
+    verify request followed by a clock request. After verifying, the
+    employee row is locked (SELECT ... FOR UPDATE); the open-entry check
+    and the insert or update then run in that transaction, which
+    create_entry / close_entry commit. A concurrent punch for the same
+    employee (e.g. a double tap) waits for the lock and sees the new
+    entry, so two shifts are never opened. The group-commit writer is
+    not used: its batch transaction could not include the verification.
+
+    Raises:
+        FaceConfidenceTooLow: If the face does not match (nothing is written).
+        EmployeeNotFound: If the employee does not exist, or site_id is
+                          given and they are enrolled at another site.
+    """
+    log.info("punch_attempt", employee_id=employee_id, site_id=site_id)
+
+    similarity = verify_face_embedding(
+        VerifyFaceRequest(
+            employee_id=employee_id,
+            embedding=probe.embedding,
+            embeddings=probe.embeddings,
+        ),
+        db,
+        settings,
+        site_id,
+    )
+
+    if not repo.lock_employee(db, employee_id):
+        raise EmployeeNotFound()
+
+    entry = repo.get_open_entry(db, employee_id)
+    if entry is None:
+        entry = repo.create_entry(db, employee_id)
+        action = "in"
+        status = ClockStatus(is_clocked_in=True, clock_in_time=entry.clock_in)
+        change = StatusChange(employee_id, entry.site_id, True, entry.clock_in)
+    else:
+        entry = repo.close_entry(db, entry)
+        action = "out"
+        status = ClockStatus(is_clocked_in=False)
+        change = StatusChange(employee_id, entry.site_id, False)
+
+    log.info(
+        "punch_success",
+        employee_id=employee_id,
+        entry_id=entry.id,
+        action=action,
+        similarity=round(similarity, 4),
+    )
+
+    if broker is not None:
+        broker.publish(change)
+
+    return PunchResult(action=action, similarity=similarity, status=status)
+
+
 # ---------------------------------------------------------------------------
 # STATUS
 # ---------------------------------------------------------------------------
 
-def get_clock_status(employee_id: str, db: Session) -> ClockStatus:
+def get_clock_status(
+    employee_id: str,
+    db: Session,
+    site_id: Optional[str] = None,
+) -> ClockStatus:
     """
     Check if an employee is currently clocked in.
     """
+    if site_id is not None:
+        ensure_employee_at_site(db, employee_id, site_id)
+
     entry = repo.get_open_entry(db, employee_id)
 
     if entry is None:
@@ -104,4 +252,42 @@ def get_clock_status(employee_id: str, db: Session) -> ClockStatus:
     return ClockStatus(
         is_clocked_in=True,
         clock_in_time=entry.clock_in,
-    )
\ No newline at end of file
+    )
+
+
+# ---------------------------------------------------------------------------
+# ROSTER
+# ---------------------------------------------------------------------------
+
+def get_roster(
+    db: Session,
+    site_id: Optional[str] = None,
+    employee_ids: Optional[List[str]] = None,
+    after: Optional[str] = None,
+    limit: int = 100,
+) -> RosterPage:
+    """
+    Employees currently clocked in, one page at a time.
+
+    Replaces polling the status route once per employee: a whole page
+    (optionally restricted to employee_ids) comes from one query.
+    """
+    # One extra row tells whether another page follows
+    entries = repo.get_roster(db, site_id, employee_ids, after, limit + 1)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    log.info("clock_roster", site_id=site_id, count=len(entries), has_more=has_more)
+
+    return RosterPage(
+        entries=[
+            RosterEntry(
+                employee_id=entry.employee_id,
+                site_id=entry.site_id,
+                time_entry_id=entry.id,
+                clock_in=entry.clock_in,
+            )
+            for entry in entries
+        ],
+        next_after=entries[-1].employee_id if has_more else None,
+    )
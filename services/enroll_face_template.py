@@ -0,0 +1,70 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from schemas import FaceTemplateInput
+from core.settings import Settings
+from core.vector_utils import normalize_vector
+from core.errors import FaceConfidenceTooLow, TemplateLimitReached
+import data.employee_repository as employee_repository
+import data.face_template_repository as template_repository
+from services.sites import ensure_employee_at_site
+
+log = get_logger()
+
+
+def enroll_face_template(
+    employee_id: str,
+    template: FaceTemplateInput,
+    db: Session,
+    settings: Settings,
+    site_id: Optional[str] = None,
+) -> int:
+    """
+    Enroll an additional face template for an existing employee.
+
+    The embedding is normalized before storage so verification can score
+    all templates with a single matrix-vector product.
+
+    Returns the employee's template count after enrollment (excluding the
+    primary embedding).
+
+    Raises:
+        EmployeeNotFound: If the employee does not exist (at site_id).
+        TemplateLimitReached: If settings.max_face_templates are enrolled.
+        FaceConfidenceTooLow: If the embedding cannot be normalized.
+    """
+    log.info("face_template_enroll_start", employee_id=employee_id)
+
+    # Employee must exist, at this site if scoped (raises EmployeeNotFound)
+    if site_id is not None:
+        ensure_employee_at_site(db, employee_id, site_id)
+    else:
+        employee_repository.get_employee_by_id(db, employee_id)
+
+    existing = template_repository.count_face_templates(db, employee_id)
+    if existing >= settings.max_face_templates:
+        log.warning(
+            "face_template_enroll_limit_reached",
+            employee_id=employee_id,
+            existing=existing,
+            limit=settings.max_face_templates,
+        )
+        raise TemplateLimitReached()
+
+    try:
+        normalized = normalize_vector(template.embedding)
+    except ValueError:
+        log.warning("face_template_enroll_invalid_embedding", employee_id=employee_id)
+        raise FaceConfidenceTooLow("Invalid embedding: cannot normalize.")
+
+    template_repository.add_face_template(db, employee_id, normalized.tolist())
+
+    log.info(
+        "face_template_enroll_success",
+        employee_id=employee_id,
+        templates=existing + 1,
+    )
+
+    return existing + 1
@@ -0,0 +1,64 @@
+"""
+Hours reports served from the daily_hours rollup.
+
+Both reports are index range scans over one small row per employee and
+day; time_entries is never read.
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from data.daily_hours_repository import get_daily_hours, get_hours_totals
+from schemas import DailyHoursResult, HoursTotalResult
+
+log = get_logger()
+
+
+def get_employee_daily_hours(
+    employee_id: str,
+    start: date,
+    end: date,
+    db: Session,
+    site_id: Optional[str] = None,
+) -> List[DailyHoursResult]:
+    """Days in [start, end) on which the employee worked, oldest first."""
+    rows = get_daily_hours(db, start, end, employee_id, site_id)
+
+    log.info("daily_hours_read", employee_id=employee_id, days=len(rows))
+
+    return [
+        DailyHoursResult(
+            employee_id=row.employee_id,
+            site_id=row.site_id,
+            day=row.day,
+            seconds=row.seconds,
+            entries=row.entries,
+        )
+        for row in rows
+    ]
+
+
+def get_hours_summary(
+    start: date,
+    end: date,
+    db: Session,
+    site_id: Optional[str] = None,
+) -> List[HoursTotalResult]:
+    """Per-employee totals for days in [start, end), by employee_id."""
+    rows = get_hours_totals(db, start, end, site_id)
+
+    log.info("hours_summary_read", site_id=site_id, employees=len(rows))
+
+    return [
+        HoursTotalResult(
+            employee_id=employee_id,
+            site_id=row_site,
+            seconds=seconds,
+            entries=entries,
+            days=days,
+        )
+        for employee_id, row_site, seconds, entries, days in rows
+    ]
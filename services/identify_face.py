@@ -0,0 +1,89 @@
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from schemas import IdentifyFaceRequest, IdentifyResult
+from core.face_index import FaceGallery
+from core.vector_utils import normalize_vector
+from core.errors import EmployeeNotFound, FaceConfidenceTooLow
+from data.employee_repository import get_employee_by_id, get_embeddings_by_ids
+from core.settings import Settings
+from core.timing import span
+
+log = get_logger()
+
+
+def identify_face(
+    req: IdentifyFaceRequest,
+    db: Session,
+    settings: Settings,
+    gallery: FaceGallery,
+) -> IdentifyResult:
+    """
+    Find the enrolled employee whose embedding best matches the probe.
+
+    The search runs against the worker's cached identification index
+    (exact float32 or int8 with float32 re-rank, per
+    settings.identify_index). The best match must still clear
+    settings.face_match_threshold.
+    """
+    log.info("face_identify_start", embedding_length=len(req.embedding))
+
+    if len(req.embedding) != settings.embedding_dim:
+        log.warning(
+            "face_identify_wrong_embedding_length",
+            expected=settings.embedding_dim,
+            got=len(req.embedding),
+        )
+        raise FaceConfidenceTooLow(
+            f"Expected embedding_dim={settings.embedding_dim}, "
+            f"got {len(req.embedding)}."
+        )
+
+    with span("normalize"):
+        try:
+            query_vec = normalize_vector(req.embedding)
+        except ValueError:
+            log.warning("face_identify_invalid_query_embedding")
+            raise FaceConfidenceTooLow("Invalid embedding: cannot normalize.")
+
+    index = gallery.get(db)
+    if len(index) == 0:
+        log.info("face_identify_empty_gallery")
+        raise EmployeeNotFound()
+
+    # Includes the re-rank fetch (a `db` span) for quantized indexes
+    with span("search"):
+        matches = index.search(
+            query_vec,
+            k=1,
+            fetch=lambda ids: get_embeddings_by_ids(db, ids),
+        )
+
+    if not matches:
+        log.info("face_identify_no_candidates", gallery_size=len(index))
+        raise EmployeeNotFound()
+
+    employee_id, score = matches[0]
+
+    log.info(
+        "face_identify_best_match",
+        employee_id=employee_id,
+        similarity=round(score, 4),
+        threshold=settings.face_match_threshold,
+        gallery_size=len(index),
+    )
+
+    if score < settings.face_match_threshold:
+        log.warning(
+            "face_identify_low_confidence",
+            similarity=round(score, 4),
+            threshold=settings.face_match_threshold,
+        )
+        raise FaceConfidenceTooLow(
+            f"Match confidence {score:.4f} below threshold "
+            f"{settings.face_match_threshold:.4f}"
+        )
+
+    emp = get_employee_by_id(db, employee_id)
+
+    return IdentifyResult(employee_id=emp.employee_id, name=emp.name, score=score)
@@ -1,18 +1,78 @@
+from typing import List, Optional
+
 from sqlalchemy.orm import Session
 from schemas import EmployeeInput, EmployeeResult
-from core.vector_utils import normalize_vector
+from core.errors import DuplicateEnrollment
+from core.face_index import FaceGallery, Match
+from core.settings import Settings
+from core.timing import span
+from core.vector_utils import normalize_vector, signature_bytes
 import data.employee_repository as employee_repository
+from data.models import DEFAULT_SITE
 from structlog import get_logger
 
 log = get_logger()
 
+# Nearest enrolled faces compared against a new registration
+DUPLICATE_CANDIDATES = 5
+
+
+def find_duplicate_enrollments(
+    employee_id: str,
+    normalized,
+    db: Session,
+    settings: Settings,
+    gallery: FaceGallery,
+) -> List[Match]:
+    """
+    Enrolled employees whose embedding scores at least
+    settings.duplicate_enrollment_threshold against the new one, best
+    first. Searches the gallery's identification index (one vectorized
+    scan, or the configured approximate index) rather than the table.
 
-def register_employee(employee: EmployeeInput, db: Session) -> EmployeeResult:
+    Only primary embeddings are compared: additional face templates
+    (FaceTemplate rows) are not in the index, so a face enrolled solely
+    as another employee's template is not caught.
+    """
+    index = gallery.get(db)
+    if len(index) == 0:
+        return []
+
+    with span("search"):
+        matches = index.search(
+            normalized,
+            k=DUPLICATE_CANDIDATES,
+            fetch=lambda ids: employee_repository.get_embeddings_by_ids(db, ids),
+        )
+
+    return [
+        (match_id, score) for match_id, score in matches
+        if score >= settings.duplicate_enrollment_threshold and match_id != employee_id
+    ]
+
+
+def register_employee(
+    employee: EmployeeInput,
+    db: Session,
+    site_id: Optional[str] = None,
+    settings: Optional[Settings] = None,
+    gallery: Optional[FaceGallery] = None,
+) -> EmployeeResult:
     """
     Register a new employee in the system.
 
     This service handles preprocessing and validation before persisting an
-    employee to the database.
+    employee to the database. The employee is enrolled at `site_id`
+    (DEFAULT_SITE when registered through the unscoped route).
+
+    With `settings` and the company-wide `gallery`, the face is first
+    checked against enrolled employees per
+    settings.duplicate_enrollment_check.
+
+    Raises:
+        DuplicateEnrollment: If the face matches an enrolled employee and
+                             duplicate_enrollment_check is "reject".
+        EmployeeAlreadyExists: If employee_id is taken.
     """
 
     log.info(
@@ -24,12 +84,37 @@ def register_employee(employee: EmployeeInput, db: Session) -> EmployeeResult:
     # Normalize embedding
     normalized = normalize_vector(employee.embedding)
 
+    # Same person enrolled under another id?
+    if settings is not None and gallery is not None and settings.duplicate_enrollment_check != "off":
+        duplicates = find_duplicate_enrollments(
+            employee.employee_id, normalized, db, settings, gallery
+        )
+        if duplicates:
+            match_id, score = duplicates[0]
+            log.warning(
+                "employee_register_possible_duplicate",
+                employee_id=employee.employee_id,
+                matches=[match for match, _ in duplicates],
+                similarity=round(score, 4),
+                threshold=settings.duplicate_enrollment_threshold,
+                action=settings.duplicate_enrollment_check,
+            )
+            if settings.duplicate_enrollment_check == "reject":
+                raise DuplicateEnrollment(
+                    f"Face matches enrolled employee {match_id} "
+                    f"(similarity {score:.4f})"
+                )
+
     # Prepare payload
     payload = employee.model_copy(update={
         "embedding": normalized.tolist(),
         "role": employee.role or "Employee"
     }).model_dump()
 
+    # Binary signature for the identification prefilter
+    payload["signature"] = signature_bytes(normalized)
+    payload["site_id"] = site_id or DEFAULT_SITE
+
     log.info(
         "employee_register_prepared_payload",
         employee_id=payload["employee_id"],
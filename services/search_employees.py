@@ -1,34 +1,42 @@
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from structlog import get_logger
 
+from core.timing import span
 from schemas import EmployeeResult
 import data.employee_repository as employee_repository
 
 log = get_logger()
 
 
-def search_employees_by_prefix(prefix: str, db: Session) -> List[EmployeeResult]:
+def search_employees_by_prefix(
+    prefix: str,
+    db: Session,
+    site_id: Optional[str] = None,
+) -> List[EmployeeResult]:
     """
-    Search for employees whose ID or name begins with a given prefix.
+    Search for employees whose ID or name begins with a given prefix,
+    within one site when site_id is given.
     """
 
     log.info(
         "search_employees_start",
         prefix=prefix,
         prefix_length=len(prefix),
+        site_id=site_id,
     )
 
-    employees = employee_repository.get_employees_by_prefix(db, prefix)
-
-    results = [
-        EmployeeResult(
-            employee_id=emp.employee_id,
-            name=emp.name,
-            role=emp.role
-        )
-        for emp in employees
-    ]
+    employees = employee_repository.get_employees_by_prefix(db, prefix, site_id)
+
+    with span("dto"):
+        results = [
+            EmployeeResult(
+                employee_id=emp.employee_id,
+                name=emp.name,
+                role=emp.role
+            )
+            for emp in employees
+        ]
 
     log.info(
         "search_employees_success",
@@ -0,0 +1,35 @@
+"""
+Site (tenant) scoping helpers shared by the services.
+
+Routes mounted under /sites/{site_id}/... pass that site to the services;
+the unscoped routes pass None and span every site (see core.sites).
+"""
+
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from core.errors import EmployeeNotFound
+from data.models import Employee
+import data.employee_repository as employee_repository
+
+log = get_logger()
+
+
+def ensure_employee_at_site(db: Session, employee_id: str, site_id: str) -> Employee:
+    """
+    Fetch an employee, treating one enrolled at another site as not found.
+
+    Raises:
+        EmployeeNotFound: If the employee does not exist at this site.
+    """
+    emp = employee_repository.get_employee_by_id(db, employee_id)
+
+    if emp.site_id != site_id:
+        log.info(
+            "employee_not_at_site",
+            employee_id=employee_id,
+            site_id=site_id,
+        )
+        raise EmployeeNotFound()
+
+    return emp
@@ -0,0 +1,171 @@
+"""
+Server-Sent Events stream of clock status changes (GET /clock/stream).
+
+A dashboard or kiosk opens one long-lived request instead of polling the
+status route per employee:
+
+    1. subscribe to the worker's StatusBroker (the route does this
+       before responding, so a full broker is a plain 503, and before
+       reading, so no change between snapshot and subscription is lost)
+    2. send the current status of the watched employees (one query)
+    3. forward changes as they are published
+    4. send a comment line after `heartbeat` seconds of silence, so
+       proxies keep the connection open and dead clients are noticed
+    5. every `resync` seconds, re-read the statuses and send whatever
+       differs: this picks up clock actions served by other workers.
+       Resyncs are aligned to a worker-wide tick, and streams watching a
+       whole site (or every site) share one roster read per tick through
+       StatusBroker.shared_read(); streams for explicit employee_ids read
+       only those employees.
+
+Each message is an `event: status` with an EmployeeClockStatus payload.
+StatusStreamResponse closes the subscription when the response ends,
+including when the client is gone before the first event is sent.
+"""
+
+import time
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+from structlog import get_logger
+
+import data.time_entry_repository as repo
+from core.status_broker import Subscription
+from schemas import EmployeeClockStatus
+
+log = get_logger()
+
+SNAPSHOT_PAGE = 1000
+
+
+def load_statuses(
+    db: Session,
+    employee_ids: Optional[List[str]] = None,
+    site_id: Optional[str] = None,
+) -> Dict[str, Optional[datetime]]:
+    """
+    employee_id -> clock_in of the open entry, or None when clocked out.
+
+    With employee_ids every requested employee is present; otherwise
+    only employees currently clocked in (at site_id) are.
+    """
+    if employee_ids is not None:
+        open_entries = repo.get_open_entries(db, employee_ids)
+        return {
+            employee_id: (
+                open_entries[employee_id].clock_in
+                if employee_id in open_entries
+                and (site_id is None or open_entries[employee_id].site_id == site_id)
+                else None
+            )
+            for employee_id in employee_ids
+        }
+
+    statuses: Dict[str, Optional[datetime]] = {}
+    after = None
+    while True:
+        page = repo.get_roster(db, site_id, None, after, SNAPSHOT_PAGE)
+        statuses.update((entry.employee_id, entry.clock_in) for entry in page)
+        if len(page) < SNAPSHOT_PAGE:
+            return statuses
+        after = page[-1].employee_id
+
+
+def format_event(employee_id: str, clock_in_time: Optional[datetime]) -> str:
+    payload = EmployeeClockStatus(
+        employee_id=employee_id,
+        is_clocked_in=clock_in_time is not None,
+        clock_in_time=clock_in_time,
+    )
+    return f"event: status\ndata: {payload.model_dump_json()}\n\n"
+
+
+async def status_events(
+    subscription: Subscription,
+    open_session: Callable[[], AbstractContextManager],
+    *,
+    heartbeat: float = 15.0,
+    resync: float = 30.0,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for the subscription's employees until the client
+    disconnects (the response is cancelled), then close the subscription.
+    `open_session` returns a context manager yielding a Session; one is
+    opened per snapshot so none is held while idle.
+    """
+    employee_ids = sorted(subscription.employee_ids) if subscription.employee_ids is not None else None
+    site_id = subscription.site_id
+
+    def snapshot() -> Dict[str, Optional[datetime]]:
+        with open_session() as db:
+            return load_statuses(db, employee_ids, site_id)
+
+    async def resynced(tick: int) -> Dict[str, Optional[datetime]]:
+        if employee_ids is not None:
+            return await run_in_threadpool(snapshot)
+        # Copied: the shared result is also read by other streams
+        return dict(await subscription.broker.shared_read(("roster", site_id), tick, snapshot))
+
+    log.info("status_stream_open", site_id=site_id)
+
+    try:
+        known = await run_in_threadpool(snapshot)
+        for employee_id, clock_in_time in known.items():
+            yield format_event(employee_id, clock_in_time)
+        last_sent = time.monotonic()
+
+        # Resync ticks are shared by every stream of this worker
+        next_tick = int(time.monotonic() // resync) + 1 if resync > 0 else None
+
+        while True:
+            now = time.monotonic()
+            timeout = max(0.0, last_sent + heartbeat - now)
+            if next_tick is not None:
+                timeout = min(timeout, max(0.0, next_tick * resync - now))
+
+            for change in await subscription.get(timeout):
+                known[change.employee_id] = change.clock_in_time if change.is_clocked_in else None
+                yield format_event(change.employee_id, known[change.employee_id])
+                last_sent = time.monotonic()
+
+            if next_tick is not None and time.monotonic() >= next_tick * resync:
+                current = await resynced(next_tick)
+                for employee_id in known.keys() | current.keys():
+                    if known.get(employee_id) != current.get(employee_id):
+                        yield format_event(employee_id, current.get(employee_id))
+                        last_sent = time.monotonic()
+                known = current
+                next_tick = int(time.monotonic() // resync) + 1
+
+            # Only a silent stream gets a heartbeat, resync or not
+            if time.monotonic() - last_sent >= heartbeat:
+                yield ": ping\n\n"
+                last_sent = time.monotonic()
+
+    finally:
+        subscription.close()
+        log.info("status_stream_closed", site_id=site_id)
+
+
+class StatusStreamResponse(StreamingResponse):
+    """
+    SSE response that owns a Subscription.
+
+    The generator's own cleanup only runs once it has been started, and a
+    BackgroundTask is skipped when the client disconnects, so the
+    subscription is also closed here whichever way the response ends.
+    """
+
+    def __init__(self, subscription: Subscription, content, **kwargs):
+        super().__init__(content, media_type="text/event-stream", **kwargs)
+        self.subscription = subscription
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.subscription.close()
@@ -0,0 +1,211 @@
+"""
+Offline kiosk sync: apply a batch of buffered clock events at once.
+
+Events are applied per employee in occurred_at order with the same rules
+as the live clock routes (no clock-in while clocked in, no clock-out
+without an open entry), and a late-synced shift may not overlap one
+already recorded. The whole request costs four reads (known events,
+employee sites, open entries, recent closed shifts) and one write
+transaction, instead of one rate-limited request and commit per tap.
+
+Two syncs racing on the same event_id (a kiosk retrying while the first
+request is still running) cannot both store it: the loser's transaction
+is rolled back and the request is applied again, now reporting that
+event as a duplicate.
+"""
+
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from core.errors import ErrorCode, SyncEventAlreadyStored
+from core.status_broker import StatusBroker, StatusChange
+from data.clock_sync_repository import get_synced_events, save_sync_batch
+from data.employee_repository import get_employee_sites
+from data.models import ClockSyncEvent, TimeEntry
+from data.time_entry_repository import get_open_entries, get_shifts_ending_after
+from schemas import ClockSyncEventInput, ClockSyncOutcome, ClockSyncRequest
+
+log = get_logger()
+
+
+def sync_clock_events(
+    req: ClockSyncRequest,
+    db: Session,
+    site_id: Optional[str] = None,
+    broker: Optional[StatusBroker] = None,
+) -> List[ClockSyncOutcome]:
+    """
+    Apply a kiosk's buffered clock events and report each one's outcome.
+
+    Outcomes are returned in request order, and each affected employee's
+    resulting status is published to `broker`. Per-event rejections:
+        • EMPLOYEE_NOT_FOUND – unknown employee, or enrolled at another
+                               site than site_id
+        • ALREADY_CLOCKED_IN – "in" while an entry is open
+        • NOT_CLOCKED_IN     – "out" with no open entry, or one opened
+                               after the tap
+        • SHIFT_OVERLAP      – "in" whose shift (up to the next "out" of
+                               this sync, or open-ended) would overlap a
+                               recorded shift, e.g. a tap inside a shift
+                               that was already closed
+
+    Raises:
+        DatabaseError: If the batch cannot be read or written; nothing is
+                       applied in that case and the kiosk may retry.
+    """
+    log.info("clock_sync_start", events=len(req.events), site_id=site_id)
+
+    try:
+        return _apply_sync(req, db, site_id, broker)
+    except SyncEventAlreadyStored:
+        log.info("clock_sync_retry_concurrent_duplicate", site_id=site_id)
+        return _apply_sync(req, db, site_id, broker)
+
+
+def _apply_sync(
+    req: ClockSyncRequest,
+    db: Session,
+    site_id: Optional[str],
+    broker: Optional[StatusBroker],
+) -> List[ClockSyncOutcome]:
+    # First occurrence wins when an event_id repeats within the request
+    events: Dict[str, ClockSyncEventInput] = {}
+    for event in req.events:
+        events.setdefault(event.event_id, event)
+
+    stored = get_synced_events(db, list(events))
+    outcomes: Dict[str, ClockSyncOutcome] = {
+        event_id: ClockSyncOutcome(
+            event_id=event_id,
+            employee_id=row.employee_id,
+            status=row.status,
+            code=row.code,
+            duplicate=True,
+            time_entry_id=row.time_entry_id,
+        )
+        for event_id, row in stored.items()
+    }
+
+    fresh = sorted(
+        (e for e in events.values() if e.event_id not in stored),
+        key=lambda e: (e.employee_id, _naive_utc(e.occurred_at)),
+    )
+    employee_ids = sorted({e.employee_id for e in fresh})
+
+    new_entries: List[TimeEntry] = []
+    records = []
+    synced: List[str] = []
+    # employee_id -> (site, clock_in of the open entry or None) after sync
+    final: Dict[str, tuple] = {}
+
+    if fresh:
+        sites = get_employee_sites(db, employee_ids)
+        open_entries = get_open_entries(db, employee_ids)
+        recorded = get_shifts_ending_after(
+            db, employee_ids, min(_naive_utc(e.occurred_at) for e in fresh),
+        )
+
+        for employee_id, group in groupby(fresh, key=lambda e: e.employee_id):
+            group = list(group)
+            known = employee_id in sites and (site_id is None or sites[employee_id] == site_id)
+            entry = open_entries.get(employee_id)
+
+            for i, event in enumerate(group):
+                occurred_at = _naive_utc(event.occurred_at)
+                target, code = None, None
+
+                if not known:
+                    code = ErrorCode.EMPLOYEE_NOT_FOUND
+                elif event.action == "in":
+                    if entry is not None:
+                        code = ErrorCode.ALREADY_CLOCKED_IN
+                    elif _overlaps(recorded.get(employee_id, ()), occurred_at, _closed_at(group, i)):
+                        code = ErrorCode.SHIFT_OVERLAP
+                    else:
+                        entry = target = TimeEntry(
+                            employee_id=employee_id,
+                            clock_in=occurred_at,
+                            site_id=sites[employee_id],
+                        )
+                        new_entries.append(entry)
+                elif entry is None or occurred_at < entry.clock_in:
+                    code = ErrorCode.NOT_CLOCKED_IN
+                else:
+                    entry.clock_out = occurred_at
+                    target, entry = entry, None
+
+                outcome = outcomes[event.event_id] = ClockSyncOutcome(
+                    event_id=event.event_id,
+                    employee_id=employee_id,
+                    status="rejected" if code else "applied",
+                    code=code.value if code else None,
+                )
+
+                record = ClockSyncEvent(
+                    event_id=event.event_id,
+                    employee_id=employee_id,
+                    action=event.action,
+                    occurred_at=occurred_at,
+                    status=outcome.status,
+                    code=outcome.code,
+                )
+                records.append((record, target))
+                synced.append(event.event_id)
+
+                if code is None:
+                    final[employee_id] = (sites[employee_id], entry.clock_in if entry else None)
+
+        entry_ids = save_sync_batch(db, new_entries, records)
+
+        for event_id, entry_id in zip(synced, entry_ids):
+            outcomes[event_id].time_entry_id = entry_id
+
+        if broker is not None:
+            for employee_id, (employee_site, clock_in_time) in final.items():
+                broker.publish(StatusChange(
+                    employee_id, employee_site, clock_in_time is not None, clock_in_time,
+                ))
+
+    results = []
+    seen = set()
+    for event in req.events:
+        outcome = outcomes[event.event_id]
+        if event.event_id in seen:
+            outcome = outcome.model_copy(update={"duplicate": True})
+        seen.add(event.event_id)
+        results.append(outcome)
+
+    log.info(
+        "clock_sync_complete",
+        applied=sum(1 for o in outcomes.values() if o.status == "applied" and not o.duplicate),
+        rejected=sum(1 for o in outcomes.values() if o.status == "rejected" and not o.duplicate),
+        duplicates=len(stored),
+    )
+
+    return results
+
+
+def _closed_at(group: List[ClockSyncEventInput], i: int) -> Optional[datetime]:
+    """When the entry opened by group[i] ("in") is closed in this sync, if it is."""
+    if i + 1 < len(group) and group[i + 1].action == "out":
+        return _naive_utc(group[i + 1].occurred_at)
+    return None
+
+
+def _overlaps(shifts, start: datetime, end: Optional[datetime]) -> bool:
+    """True if [start, end) (end None = still open) overlaps a recorded shift."""
+    return any(
+        clock_in < clock_out and start < clock_out and (end is None or clock_in < end)
+        for clock_in, clock_out in shifts
+    )
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC, like the server-side clock_in."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,82 @@
+"""
+Timesheet reads across the live table and the cold archive.
+
+Closed shifts older than the archival cutoff live in data.archive files
+instead of time_entries; callers get one list either way.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+from structlog import get_logger
+
+from data.archive import TimeEntryArchive
+from data.time_entry_repository import get_entries_between
+from schemas import TimeEntryResult
+
+log = get_logger()
+
+
+def get_timesheet(
+    employee_id: str,
+    start: datetime,
+    end: datetime,
+    db: Session,
+    archive: Optional[TimeEntryArchive] = None,
+    site_id: Optional[str] = None,
+) -> List[TimeEntryResult]:
+    """
+    Shifts with start <= clock_in < end, oldest first.
+
+    Archived rows are merged in when an archive is configured. A row
+    present in both (archival interrupted between writing the segment
+    and deleting the rows) is reported once, from the live table.
+    """
+    # Stored timestamps are naive UTC; an offset-bearing bound (e.g. a
+    # "...+02:00" query parameter) is converted rather than truncated
+    start, end = _naive_utc(start), _naive_utc(end)
+
+    live = get_entries_between(db, start, end, employee_id, site_id)
+    results = [
+        TimeEntryResult(
+            id=entry.id,
+            employee_id=entry.employee_id,
+            site_id=entry.site_id,
+            clock_in=entry.clock_in,
+            clock_out=entry.clock_out,
+        )
+        for entry in live
+    ]
+
+    if archive is not None:
+        live_ids = {entry.id for entry in results}
+        archived = [
+            TimeEntryResult(
+                id=entry.id,
+                employee_id=entry.employee_id,
+                site_id=entry.site_id,
+                clock_in=entry.clock_in,
+                clock_out=entry.clock_out,
+                archived=True,
+            )
+            for entry in archive.read(start, end, employee_id=employee_id, site_id=site_id)
+            if entry.id not in live_ids
+        ]
+        if archived:
+            results = sorted(results + archived, key=lambda e: e.clock_in)
+
+    log.info(
+        "timesheet_read",
+        employee_id=employee_id,
+        entries=len(results),
+        archived=sum(1 for e in results if e.archived),
+    )
+
+    return results
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
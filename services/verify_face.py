@@ -1,14 +1,19 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from structlog import get_logger
 
 from schemas import VerifyFaceRequest
-from core.vector_utils import normalize_vector, cosine_similarity
+from core.vector_utils import normalize_rows, normalize_vector, template_similarity
 from core.errors import (
+    EmployeeNotFound,
     FaceConfidenceTooLow,
     ServerMisconfigured,
 )
 from data.employee_repository import get_employee_by_id
+from data.face_template_repository import get_face_template_embeddings
 from core.settings import Settings
+from core.timing import span
 
 log = get_logger()
 
@@ -17,15 +22,29 @@ def verify_face_embedding(
     req: VerifyFaceRequest,
     db: Session,
     settings: Settings,
+    site_id: Optional[str] = None,
 ) -> float:
     """
-    Validate a submitted face embedding against a stored embedding.
+    Validate a submitted face embedding against an employee's templates.
+
+    The probe is scored against the primary embedding plus any additional
+    enrolled templates in a single matrix-vector product; the per-template
+    similarities are fused per settings.face_template_fusion.
+
+    Kiosks may submit several frames from one scan (req.embeddings); they
+    are normalized as one 2-D array, scored in the same product, and the
+    per-frame scores are combined per settings.probe_aggregate.
+
+    On site-scoped routes an employee enrolled at another site is
+    reported as not found.
     """
+    probes = req.probes
 
     log.info(
         "face_verify_start",
         employee_id=req.employee_id,
-        embedding_length=len(req.embedding),
+        embedding_length=len(probes[0]),
+        frames=len(probes),
     )
 
     # ------------------------------------------------------------
@@ -42,55 +61,89 @@ def verify_face_embedding(
     # ------------------------------------------------------------
     # Validate embedding length
     # ------------------------------------------------------------
-    if len(req.embedding) != settings.embedding_dim:
-        log.warning(
-            "face_verify_wrong_embedding_length",
-            expected=settings.embedding_dim,
-            got=len(req.embedding),
-            employee_id=req.employee_id,
-        )
-        raise FaceConfidenceTooLow(
-            f"Expected embedding_dim={settings.embedding_dim}, "
-            f"got {len(req.embedding)}."
-        )
+    for probe in probes:
+        if len(probe) != settings.embedding_dim:
+            log.warning(
+                "face_verify_wrong_embedding_length",
+                expected=settings.embedding_dim,
+                got=len(probe),
+                employee_id=req.employee_id,
+            )
+            raise FaceConfidenceTooLow(
+                f"Expected embedding_dim={settings.embedding_dim}, "
+                f"got {len(probe)}."
+            )
 
     # ------------------------------------------------------------
-    # Fetch employee
+    # Fetch employee + additional templates
     # ------------------------------------------------------------
     emp = get_employee_by_id(db, req.employee_id)
+    if site_id is not None and emp.site_id != site_id:
+        log.info(
+            "face_verify_employee_not_at_site",
+            employee_id=req.employee_id,
+            site_id=site_id,
+        )
+        raise EmployeeNotFound()
+
+    extra_templates = get_face_template_embeddings(db, req.employee_id)
 
     # ------------------------------------------------------------
     # Normalize vectors
     # ------------------------------------------------------------
-    try:
-        query_vec = normalize_vector(req.embedding)
-        log.debug("face_verify_query_embedding_normalized")
-    except ValueError:
-        log.warning(
-            "face_verify_invalid_query_embedding",
-            employee_id=req.employee_id,
-        )
-        raise FaceConfidenceTooLow("Invalid embedding: cannot normalize.")
-
-    try:
-        stored_vec = normalize_vector(emp.embedding)
-        log.debug("face_verify_stored_embedding_normalized")
-    except ValueError:
-        log.error(
-            "face_verify_invalid_stored_embedding",
-            employee_id=req.employee_id,
-        )
-        raise ServerMisconfigured("Stored embedding is invalid.")
+    with span("normalize"):
+        try:
+            if req.embeddings is None:
+                query_vec = normalize_vector(req.embedding)
+            else:
+                query_vec = normalize_rows(req.embeddings)
+            log.debug("face_verify_query_embedding_normalized")
+        except ValueError:
+            log.warning(
+                "face_verify_invalid_query_embedding",
+                employee_id=req.employee_id,
+            )
+            raise FaceConfidenceTooLow("Invalid embedding: cannot normalize.")
+
+        try:
+            stored_vec = normalize_vector(emp.embedding)
+            log.debug("face_verify_stored_embedding_normalized")
+        except ValueError:
+            log.error(
+                "face_verify_invalid_stored_embedding",
+                employee_id=req.employee_id,
+            )
+            raise ServerMisconfigured("Stored embedding is invalid.")
+
+        templates = [stored_vec]
+        if extra_templates:
+            try:
+                templates.extend(normalize_rows(extra_templates))
+            except ValueError:
+                log.error(
+                    "face_verify_invalid_stored_template",
+                    employee_id=req.employee_id,
+                )
+                raise ServerMisconfigured("Stored face template is invalid.")
 
     # ------------------------------------------------------------
     # Compute similarity
     # ------------------------------------------------------------
-    score = cosine_similarity(query_vec, stored_vec)
+    with span("score"):
+        score = template_similarity(
+            query_vec,
+            templates,
+            settings.face_template_fusion,
+            aggregate=settings.probe_aggregate,
+            k=settings.probe_k,
+        )
 
     log.info(
         "face_verify_similarity_computed",
         employee_id=req.employee_id,
         similarity=round(score, 4),
+        templates=len(templates),
+        frames=len(probes),
         threshold=settings.face_match_threshold,
     )
 
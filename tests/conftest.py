@@ -7,6 +7,7 @@ This file sets up:
     • A schema reset per test
     • A dependency-injected get_session for FastAPI
     • A make_client() fixture that produces a fresh TestClient per test
+    • A restore_logging fixture for tests that call init_logging()
 
 API tests simulate full HTTP requests, so each test receives:
     • a clean database schema
@@ -14,7 +15,10 @@ API tests simulate full HTTP requests, so each test receives:
     • a new TestClient
 """
 
+import logging
+
 import pytest
+import structlog
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.pool import StaticPool
@@ -22,6 +26,7 @@ from sqlalchemy.pool import StaticPool
 from data.models import Base
 from data.database import build_session_dependency
 from main import create_app
+from core.logging import shutdown_logging
 from core.settings import Settings
 
 
@@ -123,3 +128,27 @@ def make_client(test_engine):
         return TestClient(app)
 
     return builder
+
+
+# ---------------------------------------------------------------------------
+# restore_logging FIXTURE — undo init_logging() calls made by a test
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def restore_logging():
+    """
+    Put back the root handlers, root level and structlog configuration
+    after the test, so a test that re-initializes logging (often into a
+    patched sys.stderr) does not leave later tests writing to its stream
+    through its samplers and caps.
+    """
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    config = structlog.get_config()
+
+    yield
+
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    structlog.configure(**config)
@@ -0,0 +1,181 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from data.archive import ArchivedEntry, TimeEntryArchive
+from data.models import Base, TimeEntry
+from scripts.archive_time_entries import main
+from services.timesheet import get_timesheet
+
+
+def _entry(id, employee_id, day, site_id="default", month=1):
+    return ArchivedEntry(
+        id=id,
+        employee_id=employee_id,
+        site_id=site_id,
+        clock_in=datetime(2025, month, day, 8),
+        clock_out=datetime(2025, month, day, 16, 30),
+    )
+
+
+@pytest.fixture()
+def db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'tt.db'}"
+    Base.metadata.create_all(create_engine(url))
+    return url
+
+
+@pytest.fixture()
+def db(db_url):
+    session = sessionmaker(bind=create_engine(db_url), autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# ---------------------------------------------------------------------------
+# ARCHIVE FILES
+# ---------------------------------------------------------------------------
+
+def test_append_and_read_round_trip(tmp_path):
+    archive = TimeEntryArchive(tmp_path)
+    segment = archive.append([_entry(2, "bob", 3), _entry(1, "amy", 2)])
+
+    assert segment["rows"] == 2
+    assert (tmp_path / segment["file"]).exists()
+
+    rows = archive.read(datetime(2025, 1, 1), datetime(2025, 2, 1))
+    assert rows == [_entry(1, "amy", 2), _entry(2, "bob", 3)]
+
+
+def test_read_filters_by_range_employee_and_site(tmp_path):
+    archive = TimeEntryArchive(tmp_path)
+    archive.append([
+        _entry(1, "amy", 2),
+        _entry(2, "amy", 20),
+        _entry(3, "bob", 2, site_id="north"),
+    ])
+
+    assert [e.id for e in archive.read(datetime(2025, 1, 10), datetime(2025, 2, 1))] == [2]
+    assert [e.id for e in archive.read(datetime(2025, 1, 1), datetime(2025, 2, 1), employee_id="amy")] == [1, 2]
+    assert [e.id for e in archive.read(datetime(2025, 1, 1), datetime(2025, 2, 1), site_id="north")] == [3]
+    assert archive.read(datetime(2025, 1, 1), datetime(2025, 2, 1), employee_id="zoe") == []
+
+
+def test_read_skips_segments_outside_the_range(tmp_path):
+    archive = TimeEntryArchive(tmp_path)
+    january = archive.append([_entry(1, "amy", 2)])
+    archive.append([_entry(2, "amy", 2, month=3)])
+
+    # A pruned segment is never opened, even if its file is gone
+    os.remove(tmp_path / january["file"])
+    rows = archive.read(datetime(2025, 3, 1), datetime(2025, 4, 1))
+    assert [e.id for e in rows] == [2]
+
+
+def test_read_converts_offset_bounds_to_utc(tmp_path):
+    import warnings
+
+    archive = TimeEntryArchive(tmp_path)
+    archive.append([_entry(1, "amy", 2)])   # clock_in 2025-01-02 08:00 UTC
+    plus_two = timezone(timedelta(hours=2))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        # 09:00+02:00 is 07:00 UTC: the 08:00 shift is inside the window
+        rows = archive.read(
+            datetime(2025, 1, 2, 9, tzinfo=plus_two),
+            datetime(2025, 1, 2, 11, tzinfo=plus_two),
+        )
+    assert [e.id for e in rows] == [1]
+
+    # 10:00+02:00 is 08:00 UTC, still inclusive; 10:01 is not
+    assert archive.read(datetime(2025, 1, 2, 10, 1, tzinfo=plus_two), datetime(2025, 2, 1)) == []
+
+
+def test_readers_see_segments_appended_by_another_instance(tmp_path):
+    reader = TimeEntryArchive(tmp_path)
+    assert reader.segments() == []
+
+    TimeEntryArchive(tmp_path).append([_entry(1, "amy", 2)])
+    assert len(reader.segments()) == 1
+
+
+def test_empty_append_writes_nothing(tmp_path):
+    assert TimeEntryArchive(tmp_path).append([]) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+# ---------------------------------------------------------------------------
+# TIMESHEET MERGE
+# ---------------------------------------------------------------------------
+
+def test_timesheet_merges_archived_and_live_entries(tmp_path, db):
+    archive = TimeEntryArchive(tmp_path)
+    archive.append([_entry(1, "amy", 2)])
+    db.add(TimeEntry(id=5, employee_id="amy", clock_in=datetime(2025, 1, 9, 8)))
+    db.commit()
+
+    rows = get_timesheet("amy", datetime(2025, 1, 1), datetime(2025, 2, 1), db, archive)
+
+    assert [(e.id, e.archived) for e in rows] == [(1, True), (5, False)]
+    assert rows[1].clock_out is None
+
+
+def test_timesheet_reports_rows_in_both_places_once(tmp_path, db):
+    archive = TimeEntryArchive(tmp_path)
+    archive.append([_entry(1, "amy", 2)])
+    db.add(TimeEntry(id=1, employee_id="amy", clock_in=datetime(2025, 1, 2, 8)))
+    db.commit()
+
+    rows = get_timesheet("amy", datetime(2025, 1, 1), datetime(2025, 2, 1), db, archive)
+    assert [(e.id, e.archived) for e in rows] == [(1, False)]
+
+
+def test_timesheet_converts_offset_bounds_for_both_sources(tmp_path, db):
+    archive = TimeEntryArchive(tmp_path)
+    archive.append([_entry(1, "amy", 2)])
+    db.add(TimeEntry(id=5, employee_id="amy", clock_in=datetime(2025, 1, 2, 12)))
+    db.commit()
+    minus_five = timezone(timedelta(hours=-5))
+
+    # 02:00-05:00 .. 08:00-05:00 is 07:00 .. 13:00 UTC
+    rows = get_timesheet(
+        "amy",
+        datetime(2025, 1, 2, 2, tzinfo=minus_five),
+        datetime(2025, 1, 2, 8, tzinfo=minus_five),
+        db,
+        archive,
+    )
+    assert [(e.id, e.archived) for e in rows] == [(1, True), (5, False)]
+
+
+# ---------------------------------------------------------------------------
+# ARCHIVAL SCRIPT
+# ---------------------------------------------------------------------------
+
+def test_script_moves_closed_entries_before_cutoff(tmp_path, db_url, db):
+    db.add_all([
+        TimeEntry(id=1, employee_id="amy", clock_in=datetime(2024, 12, 1, 8), clock_out=datetime(2024, 12, 1, 16)),
+        TimeEntry(id=2, employee_id="bob", clock_in=datetime(2024, 12, 2, 8), clock_out=datetime(2024, 12, 2, 16)),
+        TimeEntry(id=3, employee_id="cat", clock_in=datetime(2024, 12, 3, 8)),
+        TimeEntry(id=4, employee_id="amy", clock_in=datetime(2025, 1, 5, 8), clock_out=datetime(2025, 1, 5, 16)),
+    ])
+    db.commit()
+    archive_dir = tmp_path / "archive"
+    args = ["--before", "2025-01-01", "--archive-dir", str(archive_dir), "--database-url", db_url]
+
+    assert main(args + ["--dry-run"]) == 0
+    assert not archive_dir.exists()
+
+    assert main(args + ["--batch-size", "1"]) == 0
+
+    # Open and recent entries stay live
+    assert sorted(e.id for e in db.query(TimeEntry)) == [3, 4]
+    archived = TimeEntryArchive(archive_dir)
+    assert len(archived.segments()) == 2
+    assert [e.id for e in archived.read(datetime(2024, 1, 1), datetime(2026, 1, 1))] == [1, 2]
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.harness import compare, load_baseline, measure, save_baseline
+
+
+# ---------------------------------------------------------------------------
+# MEASURE
+# ---------------------------------------------------------------------------
+
+def test_measure_returns_per_call_stats():
+    stats = measure(lambda: sum(range(10)), repeat=2, min_time=0.001)
+
+    assert stats["loops"] >= 1
+    assert 0 < stats["min_us"] <= stats["median_us"] <= stats["max_us"]
+
+
+# ---------------------------------------------------------------------------
+# BASELINE I/O
+# ---------------------------------------------------------------------------
+
+def test_save_and_load_baseline_roundtrip(tmp_path):
+    results = {"case.a": {"median_us": 10.0, "min_us": 9.0, "max_us": 11.0, "loops": 100}}
+    path = tmp_path / "baseline.json"
+
+    save_baseline(results, path)
+
+    assert load_baseline(path) == results
+
+
+# ---------------------------------------------------------------------------
+# COMPARE
+# ---------------------------------------------------------------------------
+
+def test_compare_flags_regression_beyond_tolerance():
+    baseline = {
+        "fast": {"median_us": 10.0},
+        "slow": {"median_us": 10.0},
+    }
+    current = {
+        "fast": {"median_us": 11.0},   # +10%
+        "slow": {"median_us": 20.0},   # +100%
+    }
+
+    rows = {row["case"]: row for row in compare(current, baseline, tolerance=0.25)}
+
+    assert rows["fast"]["regressed"] is False
+    assert rows["slow"]["regressed"] is True
+    assert rows["slow"]["ratio"] == 2.0
+
+
+def test_compare_ignores_cases_missing_on_either_side():
+    baseline = {"old_only": {"median_us": 1.0}, "both": {"median_us": 1.0}}
+    current = {"new_only": {"median_us": 1.0}, "both": {"median_us": 1.0}}
+
+    rows = compare(current, baseline, tolerance=0.1)
+
+    assert [row["case"] for row in rows] == ["both"]
+
+
+def test_committed_baseline_loads():
+    results = load_baseline(Path(__file__).parent.parent / "benchmarks" / "baseline.json")
+
+    assert results and all(stats["median_us"] > 0 for stats in results.values())
+
+
+def test_compare_against_missing_baseline_is_an_error(tmp_path):
+    from benchmarks.run import main
+
+    with pytest.raises(SystemExit) as exc:
+        main(["--compare", str(tmp_path / "missing.json")])
+
+    assert exc.value.code == 2
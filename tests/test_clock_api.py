@@ -9,6 +9,8 @@ These tests rely on:
     • realistic HTTP requests executed via TestClient
 """
 
+import pytest
+
 
 def _create_employee(client, employee_id="emp123"):
     """Helper to create an employee for clock tests."""
@@ -122,6 +124,413 @@ def test_clock_status_clocked_in(make_client):
     assert body["data"]["clock_in_time"] is not None
 
 
+# ============================================================================
+# ROSTER
+# ============================================================================
+
+def test_roster_pages_through_open_entries(make_client):
+    client = make_client()
+    for employee_id in ("r3", "r1", "r2", "r4"):
+        client.post(f"/clock/{employee_id}/in")
+    client.post("/clock/r4/out")
+
+    first = client.get("/clock/roster", params={"limit": 2}).json()["data"]
+    assert [e["employee_id"] for e in first["entries"]] == ["r1", "r2"]
+    assert first["next_after"] == "r2"
+
+    second = client.get("/clock/roster", params={"limit": 2, "after": "r2"}).json()["data"]
+    assert [e["employee_id"] for e in second["entries"]] == ["r3"]
+    assert second["next_after"] is None
+
+
+def test_roster_filters_by_employee_ids(make_client):
+    client = make_client()
+    for employee_id in ("r1", "r2", "r3"):
+        client.post(f"/clock/{employee_id}/in")
+
+    response = client.get("/clock/roster", params={"employee_id": ["r3", "r1", "nobody"]})
+
+    assert response.status_code == 200
+    entries = response.json()["data"]["entries"]
+    assert [e["employee_id"] for e in entries] == ["r1", "r3"]
+    assert entries[0]["clock_in"] is not None
+
+
+def test_roster_rejects_oversized_page(make_client):
+    client = make_client()
+    assert client.get("/clock/roster", params={"limit": 5000}).status_code == 422
+
+
+def test_stream_returns_503_when_worker_is_full(make_client):
+    client = make_client(settings_overrides={"status_stream_max_subscribers": 0})
+
+    response = client.get("/clock/stream", params={"employee_id": "emp1"})
+
+    assert response.status_code == 503
+    assert response.json()["code"] == "STREAM_LIMIT_REACHED"
+
+
+def test_status_etag_answers_304_without_reading(make_client, monkeypatch):
+    import routers.clock
+
+    client = make_client()
+    first = client.get("/clock/emp7/status")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    calls = []
+    real = routers.clock.get_clock_status
+    monkeypatch.setattr(routers.clock, "get_clock_status", lambda *a: calls.append(a) or real(*a))
+
+    again = client.get("/clock/emp7/status", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert calls == []
+
+    # A clock action drops the remembered ETag
+    client.post("/clock/emp7/in")
+    changed = client.get("/clock/emp7/status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["data"]["is_clocked_in"] is True
+    assert changed.headers["ETag"] != etag
+    assert len(calls) == 1
+
+
+def test_status_etag_revalidates_after_cache_expiry(make_client):
+    client = make_client(settings_overrides={"etag_cache_seconds": 0})
+    etag = client.get("/clock/emp8/status").headers["ETag"]
+
+    # Still 304 when the read finds nothing changed
+    assert client.get("/clock/emp8/status", headers={"If-None-Match": etag}).status_code == 304
+
+
+# ============================================================================
+# PUNCH
+# ============================================================================
+
+def test_punch_toggles_clock_state(make_client):
+    client = make_client()
+    _register_worker(client, "emp9")
+
+    first = client.post("/clock/emp9/punch", json={"embedding": [0.1] * 512})
+    assert first.status_code == 200
+    data = first.json()["data"]
+    assert data["action"] == "in"
+    assert data["similarity"] == pytest.approx(1.0)
+    assert data["status"]["is_clocked_in"] is True
+    assert data["status"]["clock_in_time"] is not None
+
+    second = client.post("/clock/emp9/punch", json={"embeddings": [[0.1] * 512] * 2})
+    data = second.json()["data"]
+    assert data["action"] == "out"
+    assert data["status"] == {"is_clocked_in": False, "clock_in_time": None}
+
+    assert client.get("/clock/emp9/status").json()["data"]["is_clocked_in"] is False
+
+
+def test_punch_rejected_face_writes_nothing(make_client):
+    client = make_client()
+    _register_worker(client, "emp10")
+
+    response = client.post("/clock/emp10/punch", json={"embedding": [-0.1] * 512})
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "FACE_CONFIDENCE_TOO_LOW"
+    assert client.get("/clock/emp10/status").json()["data"]["is_clocked_in"] is False
+
+
+def test_punch_unknown_employee_returns_404(make_client):
+    client = make_client()
+
+    response = client.post("/clock/ghost/punch", json={"embedding": [0.1] * 512})
+
+    assert response.status_code == 404
+
+
+# ============================================================================
+# SITE-SCOPED ROUTES
+# ============================================================================
+
+def test_site_scoped_clock_in_requires_employee_at_site(make_client):
+    client = make_client()
+    client.post("/sites/north/employees/", json={
+        "employee_id": "n1",
+        "name": "Nia",
+        "role": "Employee",
+        "embedding": [0.1] * 512,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+    assert client.post("/sites/south/clock/n1/in").status_code == 404
+
+    response = client.post("/sites/north/clock/n1/in")
+    assert response.status_code == 200
+    assert client.get("/clock/n1/status").json()["data"]["is_clocked_in"] is True
+
+    roster = client.get("/sites/north/clock/roster").json()["data"]["entries"]
+    assert [(e["employee_id"], e["site_id"]) for e in roster] == [("n1", "north")]
+    assert client.get("/sites/south/clock/roster").json()["data"]["entries"] == []
+
+
+# ============================================================================
+# OFFLINE SYNC
+# ============================================================================
+
+def _event(event_id, employee_id, action, minute):
+    return {
+        "event_id": event_id,
+        "employee_id": employee_id,
+        "action": action,
+        "occurred_at": f"2026-03-02T08:{minute:02d}:00Z",
+    }
+
+
+def _register_worker(client, employee_id, site=None):
+    prefix = f"/sites/{site}" if site else ""
+    client.post(f"{prefix}/employees/", json={
+        "employee_id": employee_id,
+        "name": "Sync Worker",
+        "role": "Employee",
+        "embedding": [0.1] * 512,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+
+def test_sync_applies_events_in_time_order(make_client):
+    client = make_client()
+    _register_worker(client, "w1")
+    _register_worker(client, "w2")
+
+    # Sent out of order; w1 is in→out→in, w2 just clocks in
+    events = [
+        _event("e3", "w1", "in", 30),
+        _event("e1", "w1", "in", 0),
+        _event("e4", "w2", "in", 5),
+        _event("e2", "w1", "out", 15),
+    ]
+    response = client.post("/clock/sync", json={"events": events})
+
+    assert response.status_code == 200
+    outcomes = response.json()["data"]
+    assert [o["event_id"] for o in outcomes] == ["e3", "e1", "e4", "e2"]
+    assert all(o["status"] == "applied" for o in outcomes)
+    assert outcomes[1]["time_entry_id"] == outcomes[3]["time_entry_id"]
+
+    status = client.get("/clock/w1/status").json()["data"]
+    assert status["is_clocked_in"] is True
+    assert status["clock_in_time"].startswith("2026-03-02T08:30")
+
+
+def test_sync_clock_outs_feed_hours_reports(make_client):
+    client = make_client()
+    _register_worker(client, "w1")
+    client.post("/clock/sync", json={"events": [
+        _event("e1", "w1", "in", 0),
+        _event("e2", "w1", "out", 45),
+    ]})
+    params = {"start": "2026-03-02", "end": "2026-03-03"}
+    admin = {"X-Admin-Key": "dev-key"}
+
+    daily = client.get("/employees/w1/hours", params=params, headers=admin).json()["data"]
+    assert [(d["day"], d["seconds"], d["entries"]) for d in daily] == [("2026-03-02", 2700, 1)]
+
+    totals = client.get("/employees/hours", params=params, headers=admin).json()["data"]
+    assert totals == [{"employee_id": "w1", "site_id": "default", "seconds": 2700, "entries": 1, "days": 1}]
+
+    assert client.get("/employees/hours", params=params).status_code == 401
+
+
+def test_sync_rejects_per_event_against_open_entries(make_client):
+    client = make_client()
+    _register_worker(client, "w1")
+    client.post("/clock/w1/in")
+
+    response = client.post("/clock/sync", json={"events": [
+        _event("e1", "w1", "in", 0),
+        _event("e2", "ghost", "in", 0),
+        _event("e3", "w1", "out", 1),  # before the live clock-in
+    ]})
+
+    outcomes = response.json()["data"]
+    assert [(o["status"], o["code"]) for o in outcomes] == [
+        ("rejected", "ALREADY_CLOCKED_IN"),
+        ("rejected", "EMPLOYEE_NOT_FOUND"),
+        ("rejected", "NOT_CLOCKED_IN"),
+    ]
+    assert client.get("/clock/w1/status").json()["data"]["is_clocked_in"] is True
+
+
+def test_sync_replays_stored_outcomes_for_resent_events(make_client):
+    client = make_client()
+    _register_worker(client, "w1")
+    batch = {"events": [_event("e1", "w1", "in", 0), _event("e2", "w1", "in", 1)]}
+
+    first = client.post("/clock/sync", json=batch).json()["data"]
+    again = client.post("/clock/sync", json=batch).json()["data"]
+
+    assert [o["duplicate"] for o in first] == [False, False]
+    assert [o["duplicate"] for o in again] == [True, True]
+    for before, after in zip(first, again):
+        assert (before["status"], before["code"], before["time_entry_id"]) == (
+            after["status"], after["code"], after["time_entry_id"]
+        )
+
+
+def test_sync_rejects_clock_in_inside_a_recorded_shift(make_client):
+    client = make_client()
+    _register_worker(client, "w1")
+    client.post("/clock/sync", json={"events": [
+        _event("e1", "w1", "in", 0),
+        _event("e2", "w1", "out", 45),
+    ]})
+
+    # A kiosk that was offline longer syncs taps inside and around that shift
+    outcomes = client.post("/clock/sync", json={"events": [
+        _event("e3", "w1", "in", 10),
+        _event("e4", "w1", "out", 20),
+        _event("e5", "w1", "in", 50),
+    ]}).json()["data"]
+
+    assert [(o["status"], o["code"]) for o in outcomes] == [
+        ("rejected", "SHIFT_OVERLAP"),
+        ("rejected", "NOT_CLOCKED_IN"),
+        ("applied", None),
+    ]
+    params = {"start": "2026-03-02", "end": "2026-03-03"}
+    daily = client.get("/employees/w1/hours", params=params, headers={"X-Admin-Key": "dev-key"})
+    assert daily.json()["data"][0]["entries"] == 1
+
+
+def test_sync_reports_concurrently_stored_events_as_duplicates(make_client, monkeypatch):
+    import services.sync_clock_events as sync
+
+    client = make_client()
+    _register_worker(client, "w1")
+    batch = {"events": [_event("e1", "w1", "in", 0)]}
+    first = client.post("/clock/sync", json=batch).json()["data"][0]
+
+    # The second request reads before the first one's commit lands
+    real, calls = sync.get_synced_events, []
+    monkeypatch.setattr(
+        sync, "get_synced_events",
+        lambda db, ids: real(db, ids) if calls.append(ids) or len(calls) > 1 else {},
+    )
+    response = client.post("/clock/sync", json=batch)
+
+    assert response.status_code == 200
+    again = response.json()["data"][0]
+    assert again["duplicate"] is True
+    assert again["time_entry_id"] == first["time_entry_id"]
+    assert len(calls) == 2
+
+
+def test_site_scoped_sync_rejects_other_sites(make_client):
+    client = make_client()
+    _register_worker(client, "n1", site="north")
+
+    south = client.post("/sites/south/clock/sync", json={"events": [_event("e1", "n1", "in", 0)]})
+    north = client.post("/sites/north/clock/sync", json={"events": [_event("e2", "n1", "in", 0)]})
+
+    assert south.json()["data"][0]["code"] == "EMPLOYEE_NOT_FOUND"
+    assert north.json()["data"][0]["status"] == "applied"
+
+
+def test_sync_rejects_empty_batch(make_client):
+    client = make_client()
+
+    assert client.post("/clock/sync", json={"events": []}).status_code == 422
+
+
+# ============================================================================
+# IDEMPOTENCY KEYS
+# ============================================================================
+
+@pytest.mark.parametrize("store", ["memory", "database"])
+def test_idempotency_key_replays_original_response(make_client, store):
+    client = make_client(settings_overrides={"idempotency_store": store})
+    headers = {"Idempotency-Key": "tap-1"}
+
+    first = client.post("/clock/emp9/in", headers=headers)
+    retry = client.post("/clock/emp9/in", headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+    # A new key is a new request and hits the business rule
+    assert client.post("/clock/emp9/in", headers={"Idempotency-Key": "tap-2"}).status_code == 409
+
+
+def test_idempotency_key_is_scoped_to_route(make_client):
+    client = make_client()
+    headers = {"Idempotency-Key": "same"}
+
+    client.post("/clock/emp10/in", headers=headers)
+    response = client.post("/clock/emp10/out", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["data"]["is_clocked_in"] is False
+    assert "Idempotent-Replayed" not in response.headers
+
+
+@pytest.mark.parametrize("store", ["memory", "database"])
+def test_idempotency_key_reused_with_other_body_returns_409(make_client, store):
+    client = make_client(settings_overrides={"idempotency_store": store})
+    _register_worker(client, "w9")
+    headers = {"Idempotency-Key": "batch-1"}
+
+    first = client.post("/clock/sync", json={"events": [_event("e1", "w9", "in", 0)]}, headers=headers)
+    same = client.post("/clock/sync", json={"events": [_event("e1", "w9", "in", 0)]}, headers=headers)
+    other = client.post("/clock/sync", json={"events": [_event("e2", "w9", "out", 5)]}, headers=headers)
+
+    assert first.status_code == 200
+    assert same.headers["Idempotent-Replayed"] == "true"
+    assert other.status_code == 409
+    assert other.json()["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+
+def test_idempotency_disabled(make_client):
+    client = make_client(settings_overrides={"idempotency_store": "off"})
+    headers = {"Idempotency-Key": "tap-1"}
+
+    client.post("/clock/emp11/in", headers=headers)
+
+    assert client.post("/clock/emp11/in", headers=headers).status_code == 409
+
+
+# ============================================================================
+# GROUP COMMIT
+# ============================================================================
+
+def test_clock_cycle_with_group_commit(make_client):
+    client = make_client(settings_overrides={"clock_group_commit": True})
+
+    clock_in_resp = client.post("/clock/emp8/in")
+    assert clock_in_resp.status_code == 200
+    assert clock_in_resp.json()["data"]["clock_in_time"] is not None
+
+    assert client.post("/clock/emp8/in").status_code == 409
+    assert client.get("/clock/emp8/status").json()["data"]["is_clocked_in"] is True
+
+    assert client.post("/clock/emp8/out").status_code == 200
+    assert client.post("/clock/emp8/out").status_code == 400
+
+
+# ============================================================================
+# READ REPLICAS
+# ============================================================================
+
+def test_status_falls_back_to_primary_when_replica_unreachable(make_client):
+    client = make_client(settings_overrides={
+        "database_replica_urls": "sqlite:////nonexistent-dir/replica.db",
+    })
+
+    response = client.get("/clock/emp1/status")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["is_clocked_in"] is False
+    assert client.app.state.replicas.healthy_count() == 0
+
+
 # ============================================================================
 # FULL WORKFLOW
 # ============================================================================
@@ -159,4 +159,36 @@ def test_get_clock_status_not_clocked_in(monkeypatch):
     # Assert
     assert isinstance(status, ClockStatus)
     assert status.is_clocked_in is False
-    assert status.clock_in_time is None
\ No newline at end of file
+    assert status.clock_in_time is None
+
+# ---------------------------------------------------------------------------
+# GROUP COMMIT
+# ---------------------------------------------------------------------------
+
+def test_clock_in_and_out_use_writer_when_given(monkeypatch):
+    """With a writer, the repository is bypassed entirely."""
+    def fail(*args):
+        raise AssertionError("repository must not be called")
+
+    monkeypatch.setattr("services.clock_service.repo.get_open_entry", fail)
+    monkeypatch.setattr("services.clock_service.repo.create_entry", fail)
+
+    entry = MagicMock()
+    entry.clock_in = datetime.now()
+    entry.clock_out = datetime.now()
+    writer = MagicMock()
+    writer.clock_in.return_value = entry
+    writer.clock_out.return_value = entry
+
+    assert clock_in("emp123", MagicMock(), writer=writer) is entry
+    assert clock_out("emp123", MagicMock(), writer=writer) is entry
+    writer.clock_in.assert_called_once_with("emp123")
+    writer.clock_out.assert_called_once_with("emp123")
+
+
+def test_clock_in_writer_rejection_propagates():
+    writer = MagicMock()
+    writer.clock_in.side_effect = AlreadyClockedIn()
+
+    with pytest.raises(AlreadyClockedIn):
+        clock_in("emp123", MagicMock(), writer=writer)
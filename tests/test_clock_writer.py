@@ -0,0 +1,227 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from core.errors import AlreadyClockedIn, DatabaseError, NotClockedIn
+from data.clock_writer import GroupCommitWriter, _ClockEvent
+from data.models import Base, DailyHours, Employee, TimeEntry
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture()
+def writer(engine):
+    writer = GroupCommitWriter(engine, window_ms=50)
+    yield writer
+    writer.stop()
+
+
+def _count_batches(writer, monkeypatch):
+    sizes = []
+    apply = writer._apply
+
+    def counting(events):
+        sizes.append(len(events))
+        return apply(events)
+
+    monkeypatch.setattr(writer, "_apply", counting)
+    return sizes
+
+
+def _concurrently(fn, args):
+    """Call fn(arg) for every arg at (nearly) the same time."""
+    barrier = threading.Barrier(len(args))
+
+    def call(arg):
+        barrier.wait()
+        try:
+            return fn(arg)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(len(args)) as pool:
+        return list(pool.map(call, args))
+
+
+# ---------------------------------------------------------------------------
+# BATCHING
+# ---------------------------------------------------------------------------
+
+def test_concurrent_clock_ins_share_one_transaction(engine, monkeypatch):
+    # A full batch closes at once, so a loaded machine cannot split it
+    writer = GroupCommitWriter(engine, window_ms=5000, max_batch=8)
+    sizes = _count_batches(writer, monkeypatch)
+
+    try:
+        entries = _concurrently(writer.clock_in, [f"emp{i}" for i in range(8)])
+    finally:
+        writer.stop()
+
+    assert sizes == [8]
+    assert sorted(e.employee_id for e in entries) == [f"emp{i}" for i in range(8)]
+    assert all(e.id is not None and e.clock_in is not None for e in entries)
+
+    with Session(engine) as db:
+        assert len(db.scalars(select(TimeEntry)).all()) == 8
+
+
+def test_clock_in_copies_employee_site(engine, writer):
+    with Session(engine) as db:
+        db.add(Employee(employee_id="n1", name="Nia", role="Employee",
+                        embedding=[0.1] * 512, site_id="north"))
+        db.commit()
+
+    assert writer.clock_in("n1").site_id == "north"
+
+
+def test_clock_out_closes_open_entry(writer):
+    opened = writer.clock_in("emp1")
+
+    closed = writer.clock_out("emp1")
+
+    assert closed.id == opened.id
+    assert closed.clock_out is not None
+
+
+def test_clock_out_updates_daily_hours(engine, writer):
+    writer.clock_in("emp1")
+    writer.clock_out("emp1")
+
+    with Session(engine) as db:
+        rows = db.query(DailyHours).all()
+    assert [(r.employee_id, r.entries) for r in rows] == [("emp1", 1)]
+
+
+# ---------------------------------------------------------------------------
+# PER-ITEM ERRORS
+# ---------------------------------------------------------------------------
+
+def test_rule_violations_are_raised_per_item(writer):
+    writer.clock_in("emp1")
+
+    results = _concurrently(
+        lambda call: call[0](call[1]),
+        [(writer.clock_in, "emp1"), (writer.clock_out, "emp2"), (writer.clock_in, "emp3")],
+    )
+
+    assert isinstance(results[0], AlreadyClockedIn)
+    assert isinstance(results[1], NotClockedIn)
+    assert results[2].employee_id == "emp3"
+
+
+def test_same_employee_twice_in_a_batch_is_applied_in_order(writer, monkeypatch):
+    sizes = _count_batches(writer, monkeypatch)
+    writer._ensure_started()
+
+    # Enqueue directly so all three land inside one batch window
+    events = [_ClockEvent("in", "emp1"), _ClockEvent("out", "emp1"), _ClockEvent("in", "emp2")]
+    for event in events:
+        writer._queue.put(event)
+
+    results = [event.future.result(timeout=5) for event in events]
+
+    assert results[1].clock_out is not None
+    assert results[0].id == results[1].id
+    assert sorted(sizes) == [1, 2]
+
+
+def test_failed_batch_is_retried_item_by_item(writer, monkeypatch):
+    apply = writer._apply
+
+    def flaky(events):
+        if len(events) > 1 or events[0].employee_id == "bad":
+            raise RuntimeError("constraint violated")
+        return apply(events)
+
+    monkeypatch.setattr(writer, "_apply", flaky)
+
+    results = _concurrently(writer.clock_in, ["good1", "bad", "good2"])
+
+    assert results[0].employee_id == "good1"
+    assert isinstance(results[1], DatabaseError)
+    assert results[2].employee_id == "good2"
+
+
+def _entry_count(engine):
+    with Session(engine) as db:
+        return len(db.scalars(select(TimeEntry)).all())
+
+
+def test_failure_after_commit_is_not_replayed(engine, writer, monkeypatch):
+    sizes = _count_batches(writer, monkeypatch)
+    resolve = writer._resolve
+
+    def resolve_then_fail(events, outcomes, rows):
+        resolve(events, outcomes, rows)
+        raise RuntimeError("failed after commit")
+
+    monkeypatch.setattr(writer, "_resolve", resolve_then_fail)
+
+    entries = _concurrently(writer.clock_in, ["emp1", "emp2"])
+
+    assert sorted(e.employee_id for e in entries) == ["emp1", "emp2"]
+    assert sizes == [2]
+    assert _entry_count(engine) == 2
+
+
+def test_failed_commit_is_not_retried_item_by_item(engine, writer, monkeypatch):
+    sizes = _count_batches(writer, monkeypatch)
+    make_session = writer._sessionmaker
+
+    def ambiguous_commit_session():
+        db = make_session()
+        commit = db.commit
+
+        def commit_then_fail():
+            commit()
+            raise RuntimeError("connection lost during commit")
+
+        db.commit = commit_then_fail
+        return db
+
+    monkeypatch.setattr(writer, "_sessionmaker", ambiguous_commit_session)
+
+    results = _concurrently(writer.clock_in, ["emp1", "emp2"])
+
+    assert all(isinstance(r, DatabaseError) for r in results)
+    assert sizes == [2]
+    assert _entry_count(engine) == 2
+
+
+def test_timed_out_queued_event_is_not_written(engine, monkeypatch):
+    writer = GroupCommitWriter(engine, window_ms=0, timeout=0.2)
+    entered, release = threading.Event(), threading.Event()
+    apply = writer._apply
+
+    def blocking(events):
+        entered.set()
+        release.wait(5)
+        return apply(events)
+
+    monkeypatch.setattr(writer, "_apply", blocking)
+    try:
+        with ThreadPoolExecutor(1) as pool:
+            first = pool.submit(writer.clock_in, "emp1")
+            # emp1's transaction is running; emp2 waits in the queue
+            assert entered.wait(5)
+            with pytest.raises(DatabaseError):
+                writer.clock_in("emp2")
+            release.set()
+            assert first.result(timeout=5).employee_id == "emp1"
+    finally:
+        writer.stop()
+
+    assert _entry_count(engine) == 1
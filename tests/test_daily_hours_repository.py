@@ -0,0 +1,169 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import data.daily_hours_repository as repo
+import data.time_entry_repository as entries
+from data.archive import ArchivedEntry, TimeEntryArchive
+from data.models import Base, DailyHours, TimeEntry
+from scripts.rebuild_daily_hours import main
+
+
+@pytest.fixture()
+def db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'tt.db'}"
+    Base.metadata.create_all(create_engine(url))
+    return url
+
+
+@pytest.fixture()
+def db(db_url):
+    session = sessionmaker(bind=create_engine(db_url), autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _shift(employee_id, clock_in, clock_out, id=None, site_id="default"):
+    return TimeEntry(id=id, employee_id=employee_id, site_id=site_id, clock_in=clock_in, clock_out=clock_out)
+
+
+def _rollup(db):
+    return [
+        (row.employee_id, row.day, row.seconds, row.entries)
+        for row in db.query(DailyHours).order_by(DailyHours.employee_id, DailyHours.day)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# SPLITTING
+# ---------------------------------------------------------------------------
+
+def test_split_by_day_crosses_midnight():
+    parts = repo.split_by_day(datetime(2026, 3, 1, 22), datetime(2026, 3, 3, 6))
+    assert parts == [
+        (date(2026, 3, 1), 2 * 3600),
+        (date(2026, 3, 2), 24 * 3600),
+        (date(2026, 3, 3), 6 * 3600),
+    ]
+
+
+def test_split_by_day_keeps_empty_shift():
+    moment = datetime(2026, 3, 1, 9)
+    assert repo.split_by_day(moment, moment) == [(date(2026, 3, 1), 0)]
+
+
+# ---------------------------------------------------------------------------
+# INCREMENTAL UPDATE
+# ---------------------------------------------------------------------------
+
+def test_record_shifts_accumulates_into_existing_rows(db):
+    repo.record_shifts(db, [_shift("amy", datetime(2026, 3, 1, 8), datetime(2026, 3, 1, 12))])
+    repo.record_shifts(db, [
+        _shift("amy", datetime(2026, 3, 1, 13), datetime(2026, 3, 1, 17)),
+        _shift("amy", datetime(2026, 3, 1, 22), datetime(2026, 3, 2, 2)),
+    ])
+    db.commit()
+
+    # The night shift counts as an entry on the day it started only
+    assert _rollup(db) == [
+        ("amy", date(2026, 3, 1), 10 * 3600, 3),
+        ("amy", date(2026, 3, 2), 2 * 3600, 0),
+    ]
+
+
+def test_close_entry_updates_rollup_in_same_transaction(db):
+    entry = _shift("amy", datetime(2000, 1, 1, 8), None)
+    db.add(entry)
+    db.commit()
+
+    closed = entries.close_entry(db, entry)
+
+    rows = _rollup(db)
+    assert rows[0][:2] == ("amy", date(2000, 1, 1))
+    assert sum(seconds for _, _, seconds, _ in rows) == int((closed.clock_out - closed.clock_in).total_seconds())
+    assert sum(count for _, _, _, count in rows) == 1
+
+
+# ---------------------------------------------------------------------------
+# REBUILD / READ
+# ---------------------------------------------------------------------------
+
+def test_rebuild_matches_incremental_rollup_and_includes_archive(db, tmp_path):
+    shifts = [
+        _shift("amy", datetime(2026, 2, 28, 22), datetime(2026, 3, 1, 6), id=1),
+        _shift("bob", datetime(2026, 3, 1, 9), datetime(2026, 3, 1, 17), id=2, site_id="north"),
+        _shift("bob", datetime(2026, 3, 2, 9), None, id=3, site_id="north"),
+    ]
+    db.add_all(shifts)
+    repo.record_shifts(db, shifts[:2])
+    db.commit()
+    incremental = _rollup(db)
+
+    archive = TimeEntryArchive(tmp_path / "archive")
+    archive.append([ArchivedEntry(1, "amy", "default", datetime(2026, 2, 28, 22), datetime(2026, 3, 1, 6))])
+    archive.append([ArchivedEntry(9, "amy", "default", datetime(2026, 2, 27, 8), datetime(2026, 2, 27, 9))])
+
+    db.query(DailyHours).delete()
+    db.commit()
+    assert repo.rebuild_daily_hours(db, date(2026, 2, 28), date(2026, 3, 5), archive) == 3
+    assert _rollup(db) == incremental
+
+    # A range cut mid-shift keeps only the days inside it
+    repo.rebuild_daily_hours(db, date(2026, 2, 1), date(2026, 3, 1), archive)
+    assert _rollup(db)[:2] == [
+        ("amy", date(2026, 2, 27), 3600, 1),
+        ("amy", date(2026, 2, 28), 2 * 3600, 1),
+    ]
+
+
+def test_rebuild_keeps_zero_length_shift_at_range_start(db):
+    moment = datetime(2026, 3, 1)
+    db.add(_shift("amy", moment, moment, id=1))
+    db.commit()
+
+    assert repo.rebuild_daily_hours(db, date(2026, 3, 1), date(2026, 3, 2)) == 1
+    assert _rollup(db) == [("amy", date(2026, 3, 1), 0, 1)]
+
+
+def test_record_shifts_rejects_unsupported_dialect(db, monkeypatch):
+    from types import SimpleNamespace
+
+    from core.errors import ServerMisconfigured
+
+    bind = SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+    monkeypatch.setattr(db, "get_bind", lambda *a, **k: bind)
+
+    with pytest.raises(ServerMisconfigured):
+        repo.record_shifts(db, [_shift("amy", datetime(2026, 3, 1, 8), datetime(2026, 3, 1, 9))])
+
+
+def test_hours_totals_group_by_employee(db):
+    repo.record_shifts(db, [
+        _shift("amy", datetime(2026, 3, 1, 8), datetime(2026, 3, 1, 16)),
+        _shift("amy", datetime(2026, 3, 2, 8), datetime(2026, 3, 2, 12)),
+        _shift("bob", datetime(2026, 3, 1, 8), datetime(2026, 3, 1, 9), site_id="north"),
+    ])
+    db.commit()
+
+    assert repo.get_hours_totals(db, date(2026, 3, 1), date(2026, 4, 1)) == [
+        ("amy", "default", 12 * 3600, 2, 2),
+        ("bob", "north", 3600, 1, 1),
+    ]
+    assert [r[0] for r in repo.get_hours_totals(db, date(2026, 3, 1), date(2026, 4, 1), "north")] == ["bob"]
+    assert len(repo.get_daily_hours(db, date(2026, 3, 2), date(2026, 3, 3), employee_id="amy")) == 1
+
+
+def test_rebuild_script_backfills_from_oldest_entry(db_url, db):
+    db.add(_shift("amy", datetime(2026, 1, 31, 20), datetime(2026, 2, 1, 4)))
+    db.commit()
+
+    assert main(["--database-url", db_url, "--archive-dir", "", "--end", "2026-03-01"]) == 0
+
+    assert _rollup(db) == [
+        ("amy", date(2026, 1, 31), 4 * 3600, 1),
+        ("amy", date(2026, 2, 1), 4 * 3600, 0),
+    ]
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+from data.database import ReplicaRouter, build_read_session_dependency
+
+
+def _router(n=2, **kwargs):
+    now = {"t": 0.0}
+    engines = [create_engine("sqlite://") for _ in range(n)]
+    router = ReplicaRouter(engines, clock=lambda: now["t"], **kwargs)
+    return router, engines, now
+
+
+# ---------------------------------------------------------------------------
+# REPLICA ROUTER
+# ---------------------------------------------------------------------------
+
+def test_router_without_replicas_uses_primary():
+    router = ReplicaRouter([])
+
+    router.record_write("emp1")
+
+    assert router.choose("emp1") is None
+    assert router.choose() is None
+
+
+def test_router_round_robins_replicas():
+    router, engines, _ = _router(n=2)
+
+    assert [router.choose() for _ in range(4)] == [engines[0], engines[1], engines[0], engines[1]]
+
+
+def test_router_pins_recent_writers_to_primary():
+    router, engines, now = _router(sticky_seconds=5)
+
+    router.record_write("emp1")
+
+    assert router.choose("emp1") is None
+    assert router.choose("emp2") in engines
+
+    now["t"] = 5.0
+    assert router.choose("emp1") in engines
+
+
+def test_router_skips_replicas_marked_down_until_retry():
+    router, engines, now = _router(retry_seconds=10)
+
+    router.mark_down(engines[0])
+    assert [router.choose() for _ in range(3)] == [engines[1]] * 3
+    assert router.healthy_count() == 1
+
+    router.mark_down(engines[1])
+    assert router.choose() is None
+
+    now["t"] = 10.0
+    assert router.healthy_count() == 2
+
+
+# ---------------------------------------------------------------------------
+# READ SESSION DEPENDENCY
+# ---------------------------------------------------------------------------
+
+def _primary_session():
+    yield "primary"
+
+
+def test_read_session_uses_chosen_replica():
+    router, engines, _ = _router(n=1)
+    get_read_session = build_read_session_dependency(router, _primary_session)
+
+    gen = get_read_session(SimpleNamespace(path_params={}))
+    db = next(gen)
+
+    assert db.get_bind() is engines[0]
+    assert db.execute(text("SELECT 1")).scalar() == 1
+    gen.close()
+
+
+def test_read_session_fails_over_to_primary_and_marks_replica_down():
+    unreachable = create_engine("sqlite:////nonexistent-dir/replica.db")
+    router = ReplicaRouter([unreachable])
+    get_read_session = build_read_session_dependency(router, _primary_session)
+
+    db = next(get_read_session(SimpleNamespace(path_params={"employee_id": "emp1"})))
+
+    assert db == "primary"
+    assert router.healthy_count() == 0
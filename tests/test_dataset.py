@@ -0,0 +1,72 @@
+from collections import Counter
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.dataset import generate_employees, generate_time_entries, load_dataset
+from data.models import Employee, TimeEntry
+
+
+END = date(2026, 1, 1)
+
+
+# ---------------------------------------------------------------------------
+# EMPLOYEES
+# ---------------------------------------------------------------------------
+
+def test_generate_employees_is_deterministic_for_seed():
+    first = [row for chunk in generate_employees(50, seed=7) for row in chunk]
+    second = [row for chunk in generate_employees(50, seed=7) for row in chunk]
+    other = [row for chunk in generate_employees(50, seed=8) for row in chunk]
+
+    assert first == second
+    assert first != other
+
+
+def test_generate_employees_embeddings_are_unit_length():
+    rows = next(generate_employees(20, seed=1))
+
+    norms = np.linalg.norm([row["embedding"] for row in rows], axis=1)
+
+    assert len(rows) == 20
+    assert len(rows[0]["embedding"]) == 512
+    assert np.allclose(norms, 1.0)
+
+
+# ---------------------------------------------------------------------------
+# TIME ENTRIES
+# ---------------------------------------------------------------------------
+
+def test_generate_time_entries_follow_shift_rules():
+    rows = [row for chunk in generate_time_entries(30, days=28, seed=3, end_date=END) for row in chunk]
+    period_end = datetime(2026, 1, 1)
+
+    assert rows
+    # Roughly 5 shifts a week minus absences and late hires
+    assert len(rows) <= 30 * 20
+
+    for row in rows:
+        assert row["clock_in"] < period_end
+        if row["clock_out"] is not None:
+            hours = (row["clock_out"] - row["clock_in"]).total_seconds() / 3600
+            assert 4.0 <= hours <= 13.0
+
+    open_per_employee = Counter(r["employee_id"] for r in rows if r["clock_out"] is None)
+    assert all(count == 1 for count in open_per_employee.values())
+
+
+# ---------------------------------------------------------------------------
+# LOADING
+# ---------------------------------------------------------------------------
+
+def test_load_dataset_into_sqlite():
+    engine = create_engine("sqlite://", future=True)
+
+    counts = load_dataset(engine, employees=25, days=14, seed=5, end_date=END, create_schema=True)
+
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(Employee)) == counts["employees"] == 25
+        assert conn.scalar(select(func.count()).select_from(TimeEntry)) == counts["time_entries"]
+
+    assert counts["time_entries"] > 0
@@ -4,6 +4,7 @@ from sqlalchemy.orm import sessionmaker
 
 from data.models import Base, Employee
 import data.employee_repository as repo
+from core.vector_utils import signature_bytes
 from core.errors import (
     EmployeeAlreadyExists,
     EmployeeNotFound,
@@ -130,6 +131,17 @@ def test_update_employee_changes_fields(db):
     assert updated.role == "Admin"
 
 
+def test_update_employee_embedding_refreshes_signature(db):
+    payload = make_emp()
+    db.add(Employee(**payload))
+    db.commit()
+
+    new_embedding = [-0.1] * 512
+    updated = repo.update_employee(db, payload["employee_id"], embedding=new_embedding)
+
+    assert updated.signature == signature_bytes(new_embedding)
+
+
 def test_update_employee_not_found(db):
     with pytest.raises(EmployeeNotFound):
         repo.update_employee(db, "ghost", name="x")
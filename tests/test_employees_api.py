@@ -14,6 +14,9 @@ Each test:
     • performs real API operations
 """
 
+import pytest
+
+
 # ============================================================================
 # ADD EMPLOYEE
 # ============================================================================
@@ -110,6 +113,45 @@ def test_add_employee_invalid_payload_schema(make_client):
     assert response.status_code == 422
 
 
+def _employee(employee_id, embedding):
+    return {
+        "employee_id": employee_id,
+        "name": "Eve",
+        "role": "Employee",
+        "embedding": embedding,
+    }
+
+
+def test_add_employee_same_face_rejected_in_reject_mode(make_client):
+    client = make_client(settings_overrides={"duplicate_enrollment_check": "reject"})
+    headers = {"X-Admin-Key": "dev-key"}
+    face = [0.1] * 512
+    other = [1.0] + [0.0] * 511
+
+    assert client.post("/employees/", json=_employee("eve1", face), headers=headers).status_code == 200
+    assert client.post("/employees/", json=_employee("adam", other), headers=headers).status_code == 200
+
+    # Same face at another site is still a duplicate
+    response = client.post("/sites/north/employees/", json=_employee("eve2", [0.2] * 512), headers=headers)
+
+    assert response.status_code == 409
+    body = response.json()
+    assert body["code"] == "DUPLICATE_ENROLLMENT"
+    assert "eve1" in body["message"]
+    found = client.get("/employees/search", params={"prefix": "eve"}).json()["data"]
+    assert sorted(e["employee_id"] for e in found) == ["adam", "eve1"]
+
+
+def test_add_employee_same_face_registered_in_flag_mode(make_client):
+    client = make_client()
+    headers = {"X-Admin-Key": "dev-key"}
+
+    client.post("/employees/", json=_employee("eve1", [0.1] * 512), headers=headers)
+    response = client.post("/employees/", json=_employee("eve2", [0.1] * 512), headers=headers)
+
+    assert response.status_code == 200
+
+
 # ============================================================================
 # SEARCH EMPLOYEES
 # ============================================================================
@@ -137,6 +179,29 @@ def test_search_employees(make_client):
     assert ids == {"alice1", "alice2"}
 
 
+def test_search_etag_and_invalidation_on_register(make_client):
+    client = make_client()
+    client.post("/employees/", json={
+        "employee_id": "carl1", "name": "Carl", "role": "Employee", "embedding": [0.1] * 512,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+    first = client.get("/employees/search?prefix=car")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, max-age=10"
+
+    assert client.get("/employees/search?prefix=car", headers={"If-None-Match": etag}).status_code == 304
+    # The ETag follows the results, not the URL
+    assert client.get("/employees/search?prefix=xyz", headers={"If-None-Match": etag}).status_code == 200
+
+    client.post("/employees/", json={
+        "employee_id": "carla", "name": "Carla", "role": "Employee", "embedding": [0.1] * 512,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+    response = client.get("/employees/search?prefix=car", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 2
+
+
 def test_search_employees_no_results(make_client):
     client = make_client()
 
@@ -239,6 +304,241 @@ def test_verify_face_invalid_embedding_length(make_client):
     assert body["success"] is False
 
 
+def test_verify_face_multi_frame_success(make_client):
+    client = make_client()
+
+    client.post("/employees/", json={
+        "employee_id": "emp5",
+        "name": "Eve",
+        "role": "Employee",
+        "embedding": [0.0] * 511 + [1.0],
+    }, headers={"X-Admin-Key": "dev-key"})
+
+    frames = [[0.0] * 511 + [1.0], [0.0] * 510 + [0.1, 1.0]]
+    response = client.post("/employees/verify",
+                           json={"employee_id": "emp5", "embeddings": frames})
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+
+def test_verify_face_too_many_frames_returns_422(make_client):
+    client = make_client()
+
+    frames = [[1.0] * 512] * 11
+    response = client.post("/employees/verify",
+                           json={"employee_id": "emp5", "embeddings": frames})
+
+    assert response.status_code == 422
+
+
+# ============================================================================
+# FACE IDENTIFICATION
+# ============================================================================
+
+def _register(client, employee_id, name, embedding):
+    client.post("/employees/", json={
+        "employee_id": employee_id,
+        "name": name,
+        "role": "Employee",
+        "embedding": embedding,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+
+def test_identify_face_returns_best_match(make_client):
+    client = make_client()
+
+    _register(client, "id1", "Ira", [1.0] + [0.0] * 511)
+    _register(client, "id2", "Jo", [0.0, 1.0] + [0.0] * 510)
+
+    response = client.post("/employees/identify",
+                           json={"embedding": [0.1, 1.0] + [0.0] * 510})
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["employee_id"] == "id2"
+    assert data["name"] == "Jo"
+    assert data["score"] > 0.9
+
+
+def test_identify_face_int8_index_sees_new_registrations(make_client):
+    client = make_client(settings_overrides={"identify_index": "int8"})
+
+    _register(client, "id1", "Ira", [1.0] + [0.0] * 511)
+    probe = {"embedding": [0.0, 1.0] + [0.0] * 510}
+
+    # Only an orthogonal employee is enrolled
+    assert client.post("/employees/identify", json=probe).status_code == 400
+
+    # Registration invalidates this worker's index
+    _register(client, "id2", "Jo", [0.0, 1.0] + [0.0] * 510)
+
+    response = client.post("/employees/identify", json=probe)
+    assert response.status_code == 200
+    assert response.json()["data"]["employee_id"] == "id2"
+    assert response.json()["data"]["score"] == pytest.approx(1.0)
+
+
+def test_identify_face_binary_prefilter(make_client):
+    client = make_client(settings_overrides={"identify_index": "binary", "identify_shortlist": 1})
+
+    _register(client, "id1", "Ira", [1.0] * 256 + [-1.0] * 256)
+    _register(client, "id2", "Jo", [-1.0] * 256 + [1.0] * 256)
+
+    response = client.post("/employees/identify",
+                           json={"embedding": [-1.0] * 250 + [1.0] * 262})
+
+    assert response.status_code == 200
+    assert response.json()["data"]["employee_id"] == "id2"
+
+
+def test_identify_face_ivf_inserts_new_registrations(make_client):
+    client = make_client(settings_overrides={"identify_index": "ivf"})
+
+    _register(client, "id1", "Ira", [1.0] + [0.0] * 511)
+    probe = {"embedding": [0.0, 1.0] + [0.0] * 510}
+    client.post("/employees/identify", json=probe)  # builds the index
+
+    _register(client, "id2", "Jo", [0.0, 1.0] + [0.0] * 510)
+
+    response = client.post("/employees/identify", json=probe)
+    assert response.status_code == 200
+    assert response.json()["data"]["employee_id"] == "id2"
+
+
+def test_identify_face_empty_gallery_returns_404(make_client):
+    client = make_client()
+
+    response = client.post("/employees/identify", json={"embedding": [1.0] * 512})
+
+    assert response.status_code == 404
+
+
+# ============================================================================
+# SITE-SCOPED ROUTES
+# ============================================================================
+
+def _register_at(client, site_id, employee_id, name, embedding):
+    return client.post(f"/sites/{site_id}/employees/", json={
+        "employee_id": employee_id,
+        "name": name,
+        "role": "Employee",
+        "embedding": embedding,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+
+def test_site_scoped_search_only_returns_that_site(make_client):
+    client = make_client()
+
+    assert _register_at(client, "north", "n1", "Sam North", [0.1] * 512).status_code == 200
+    _register_at(client, "south", "s1", "Sam South", [0.1] * 512)
+
+    north = client.get("/sites/north/employees/search", params={"prefix": "Sam"}).json()["data"]
+    assert [e["employee_id"] for e in north] == ["n1"]
+
+    # The unscoped route still spans every site
+    everyone = client.get("/employees/search", params={"prefix": "Sam"}).json()["data"]
+    assert len(everyone) == 2
+
+
+def test_site_scoped_verify_rejects_other_site(make_client):
+    client = make_client()
+    _register_at(client, "north", "n1", "Nia", [0.1] * 512)
+
+    probe = {"employee_id": "n1", "embedding": [0.1] * 512}
+
+    assert client.post("/sites/north/employees/verify", json=probe).status_code == 200
+    assert client.post("/sites/south/employees/verify", json=probe).status_code == 404
+
+
+def test_site_scoped_identify_only_searches_that_site(make_client):
+    client = make_client()
+    probe = {"embedding": [1.0] + [0.0] * 511}
+
+    _register_at(client, "north", "n1", "Nia", [1.0] + [0.0] * 511)
+    _register_at(client, "south", "s1", "Sol", [0.0, 1.0] + [0.0] * 510)
+
+    response = client.post("/sites/north/employees/identify", json=probe)
+    assert response.json()["data"]["employee_id"] == "n1"
+
+    # South's gallery never contains the north employee
+    assert client.post("/sites/south/employees/identify", json=probe).status_code == 400
+
+    response = client.post("/employees/identify", json=probe)
+    assert response.json()["data"]["employee_id"] == "n1"
+
+
+# ============================================================================
+# FACE TEMPLATES
+# ============================================================================
+
+def test_additional_template_allows_verification(make_client):
+    client = make_client(settings_overrides={"face_match_threshold": 0.9})
+
+    client.post("/employees/", json={
+        "employee_id": "emp3",
+        "name": "Cara",
+        "role": "Employee",
+        "embedding": [1.0] + [0.0] * 511,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+    probe = {"employee_id": "emp3", "embedding": [0.0, 1.0] + [0.0] * 510}
+
+    # Primary template alone does not match the probe
+    assert client.post("/employees/verify", json=probe).status_code == 400
+
+    response = client.post(
+        "/employees/emp3/templates",
+        json={"embedding": [0.0, 1.0] + [0.0] * 510},
+        headers={"X-Admin-Key": "dev-key"},
+    )
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+    assert client.post("/employees/verify", json=probe).status_code == 200
+
+
+def test_add_template_limit_reached_returns_409(make_client):
+    client = make_client(settings_overrides={"max_face_templates": 1})
+
+    client.post("/employees/", json={
+        "employee_id": "emp4",
+        "name": "Dev",
+        "role": "Employee",
+        "embedding": [0.1] * 512,
+    }, headers={"X-Admin-Key": "dev-key"})
+
+    template = {"embedding": [0.2] * 512}
+    first = client.post("/employees/emp4/templates", json=template,
+                        headers={"X-Admin-Key": "dev-key"})
+    second = client.post("/employees/emp4/templates", json=template,
+                         headers={"X-Admin-Key": "dev-key"})
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    assert second.json()["code"] == "TEMPLATE_LIMIT_REACHED"
+
+
+def test_add_template_unknown_employee_returns_404(make_client):
+    client = make_client()
+
+    response = client.post("/employees/ghost/templates",
+                           json={"embedding": [0.1] * 512},
+                           headers={"X-Admin-Key": "dev-key"})
+
+    assert response.status_code == 404
+    assert response.json()["code"] == "EMPLOYEE_NOT_FOUND"
+
+
+def test_add_template_requires_admin_key(make_client):
+    client = make_client()
+
+    response = client.post("/employees/emp1/templates",
+                           json={"embedding": [0.1] * 512})
+
+    assert response.status_code == 401
+
+
 def test_rate_limiter_and_middleware_attached(make_client):
     client = make_client()
 
@@ -254,3 +554,44 @@ def test_rate_limiter_and_middleware_attached(make_client):
     assert any(isinstance(m.cls, type(SlowAPIMiddleware)) for m in app.user_middleware)
 
 
+
+
+# ============================================================================
+# TIMESHEET
+# ============================================================================
+
+def test_timesheet_includes_archived_entries(make_client, tmp_path):
+    from datetime import datetime
+    from data.archive import ArchivedEntry, TimeEntryArchive
+
+    TimeEntryArchive(tmp_path).append([ArchivedEntry(
+        id=9_000,
+        employee_id="emp1",
+        site_id="default",
+        clock_in=datetime(2024, 3, 4, 8),
+        clock_out=datetime(2024, 3, 4, 16),
+    )])
+    client = make_client(settings_overrides={"time_entry_archive_dir": str(tmp_path)})
+    client.post("/clock/emp1/in")
+    client.post("/clock/emp1/out")
+
+    response = client.get(
+        "/employees/emp1/timesheet",
+        params={"start": "2024-01-01T00:00:00", "end": "2100-01-01T00:00:00"},
+        headers={"X-Admin-Key": "dev-key"},
+    )
+
+    assert response.status_code == 200
+    entries = response.json()["data"]
+    assert [e["archived"] for e in entries] == [True, False]
+    assert entries[0]["id"] == 9_000
+    assert entries[1]["clock_out"] is not None
+
+
+def test_timesheet_requires_admin_key(make_client):
+    client = make_client()
+    response = client.get(
+        "/employees/emp1/timesheet",
+        params={"start": "2024-01-01T00:00:00", "end": "2025-01-01T00:00:00"},
+    )
+    assert response.status_code == 401
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+from core.etag import ValidatorCache, if_none_match, make_etag
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _request(header=None):
+    return SimpleNamespace(headers={"if-none-match": header} if header else {})
+
+
+def test_make_etag_is_quoted_and_stable():
+    etag = make_etag(True, "2026-03-02T09:00:00")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(True, "2026-03-02T09:00:00")
+    assert etag != make_etag(False, None)
+
+
+def test_if_none_match_parses_lists_weak_tags_and_star():
+    etag = make_etag(1)
+    assert if_none_match(_request(f'"other", W/{etag}'), etag)
+    assert if_none_match(_request("*"), etag)
+    assert not if_none_match(_request('"other"'), etag)
+    assert not if_none_match(_request(), etag)
+    assert not if_none_match(_request("*"), None)
+
+
+def test_cache_entries_expire():
+    clock = FakeClock()
+    cache = ValidatorCache(ttl=2.0, clock=clock)
+    cache.put("g", "v", '"a"', cache.generation("g"))
+
+    assert cache.get("g", "v") == '"a"'
+    clock.now = 2.0
+    assert cache.get("g", "v") is None
+
+
+def test_invalidate_drops_group_and_rejects_racing_reads():
+    cache = ValidatorCache(ttl=10.0)
+    cache.put("g", "v1", '"a"', cache.generation("g"))
+    cache.put("g", "v2", '"b"', cache.generation("g"))
+
+    generation = cache.generation("g")   # a read starts...
+    cache.invalidate("g")                # ...the data changes...
+    cache.put("g", "v1", '"stale"', generation)  # ...the read finishes
+
+    assert cache.get("g", "v1") is None
+    assert cache.get("g", "v2") is None
+
+
+def test_cache_is_bounded_and_can_be_disabled():
+    cache = ValidatorCache(ttl=10.0, max_groups=2)
+    for group in ("a", "b", "c"):
+        cache.put(group, None, '"x"', 0)
+    assert cache.get("a") is None
+    assert cache.get("c") == '"x"'
+
+    disabled = ValidatorCache(ttl=0)
+    disabled.put("a", None, '"x"', 0)
+    assert disabled.get("a") is None
+
+
+def test_variants_within_a_group_are_bounded():
+    cache = ValidatorCache(ttl=10.0, max_variants=3)
+    for n in range(100):
+        cache.put(("search",), (None, f"p{n}"), '"x"', 0)
+
+    assert len(cache._groups[("search",)]) == 3
+    assert cache.get(("search",), (None, "p0")) is None
+    assert cache.get(("search",), (None, "p99")) == '"x"'
+
+
+def test_variant_eviction_is_least_recently_used():
+    cache = ValidatorCache(ttl=10.0, max_variants=2)
+    cache.put("g", "a", '"a"', 0)
+    cache.put("g", "b", '"b"', 0)
+    cache.get("g", "a")
+    cache.put("g", "c", '"c"', 0)
+
+    assert cache.get("g", "a") == '"a"'
+    assert cache.get("g", "b") is None
@@ -0,0 +1,353 @@
+import numpy as np
+import pytest
+
+from core.face_index import (
+    BinaryIndex,
+    ExactIndex,
+    FaceGallery,
+    Int8Index,
+    IVFIndex,
+    SiteGalleries,
+    near_duplicate_pairs,
+    quantize_int8,
+    train_centroids,
+)
+from core.vector_utils import signature_bytes
+
+
+def make_gallery(n=2000, dim=512, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"emp{i:05d}" for i in range(n)]
+    return ids, vectors
+
+
+# ---------------------------------------------------------------------------
+# EXACT
+# ---------------------------------------------------------------------------
+
+def test_exact_index_returns_best_matches_in_order():
+    ids, vectors = make_gallery()
+
+    matches = ExactIndex(ids, vectors).search(vectors[42], k=3)
+
+    assert matches[0][0] == "emp00042"
+    assert matches[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert matches[0][1] >= matches[1][1] >= matches[2][1]
+
+
+# ---------------------------------------------------------------------------
+# INT8
+# ---------------------------------------------------------------------------
+
+def test_quantize_int8_round_trips_closely():
+    _, vectors = make_gallery(n=10)
+
+    codes, scales = quantize_int8(vectors)
+
+    assert codes.dtype == np.int8
+    np.testing.assert_allclose(codes * scales[:, None], vectors, atol=scales.max())
+
+
+def test_int8_index_uses_quarter_of_the_memory():
+    ids, vectors = make_gallery()
+
+    exact = ExactIndex(ids, vectors)
+    int8 = Int8Index(ids, vectors)
+
+    assert int8.nbytes < exact.nbytes / 3.9
+
+
+def test_int8_index_rerank_returns_exact_scores():
+    ids, vectors = make_gallery()
+    by_id = dict(zip(ids, vectors))
+    rng = np.random.default_rng(1)
+
+    exact = ExactIndex(ids, vectors)
+    int8 = Int8Index(ids, vectors, rerank=16, block_rows=300)
+
+    for i in rng.integers(0, len(ids), 20):
+        probe = vectors[i] + 0.05 * rng.standard_normal(vectors.shape[1])
+        probe /= np.linalg.norm(probe)
+
+        expected = exact.search(probe, k=1)[0]
+        got = int8.search(probe, k=1, fetch=lambda c: {e: by_id[e] for e in c})[0]
+
+        assert got[0] == expected[0]
+        assert got[1] == pytest.approx(expected[1], abs=1e-5)
+
+
+def test_int8_index_drops_candidates_missing_from_fetch():
+    ids, vectors = make_gallery(n=50)
+
+    int8 = Int8Index(ids, vectors, rerank=5)
+
+    assert int8.search(vectors[3], k=1, fetch=lambda c: {}) == []
+
+
+# ---------------------------------------------------------------------------
+# BINARY PREFILTER
+# ---------------------------------------------------------------------------
+
+def test_binary_index_matches_exact_search_on_near_duplicates():
+    ids, vectors = make_gallery()
+    rng = np.random.default_rng(2)
+
+    exact = ExactIndex(ids, vectors)
+    binary = BinaryIndex(ids, vectors, shortlist=32)
+
+    for i in rng.integers(0, len(ids), 20):
+        probe = vectors[i] + 0.05 * rng.standard_normal(vectors.shape[1])
+        probe /= np.linalg.norm(probe)
+
+        expected = exact.search(probe, k=1)[0]
+        got = binary.search(probe, k=1)[0]
+
+        assert got[0] == expected[0]
+        assert got[1] == pytest.approx(expected[1], abs=1e-5)
+
+
+def test_binary_index_shortlist_limits_scored_rows():
+    ids, vectors = make_gallery(n=100)
+
+    binary = BinaryIndex(ids, vectors, shortlist=10)
+
+    assert len(binary.candidates(vectors[0])) == 10
+    assert 0 in binary.candidates(vectors[0])
+
+
+def test_binary_index_uses_persisted_signatures():
+    ids, vectors = make_gallery(n=20)
+    stored = [signature_bytes(v) for v in vectors]
+
+    from_stored = BinaryIndex(ids, vectors, signatures=stored)
+    computed = BinaryIndex(ids, vectors, signatures=[None] + stored[1:])
+
+    np.testing.assert_array_equal(from_stored.signatures, computed.signatures)
+
+
+# ---------------------------------------------------------------------------
+# IVF
+# ---------------------------------------------------------------------------
+
+def test_train_centroids_are_unit_length():
+    _, vectors = make_gallery(n=500)
+
+    centroids = train_centroids(vectors, 16, iterations=3)
+
+    assert centroids.shape == (16, 512)
+    np.testing.assert_allclose(np.linalg.norm(centroids, axis=1), 1.0, rtol=1e-5)
+
+
+def test_ivf_index_probing_every_cell_is_exact():
+    ids, vectors = make_gallery(n=1000)
+    rng = np.random.default_rng(3)
+
+    exact = ExactIndex(ids, vectors)
+    ivf = IVFIndex(ids, vectors, nlist=20, iterations=3)
+    ivf.nprobe = ivf.nlist
+
+    assert len(ivf) == len(ids)
+    for probe in rng.standard_normal((5, 512)).astype(np.float32):
+        probe /= np.linalg.norm(probe)
+        assert ivf.search(probe, k=3) == pytest.approx(exact.search(probe, k=3))
+
+
+def test_ivf_index_finds_near_duplicates_with_few_probes():
+    ids, vectors = make_gallery(n=2000)
+
+    ivf = IVFIndex(ids, vectors, nlist=40, nprobe=2, iterations=5)
+
+    assert ivf.search(vectors[7], k=1)[0][0] == "emp00007"
+
+
+def test_ivf_index_add_is_searchable_and_triggers_retrain():
+    ids, vectors = make_gallery(n=100)
+
+    ivf = IVFIndex(ids, vectors, nlist=5, nprobe=1, retrain_fraction=0.1, iterations=3)
+    new = -vectors[0]
+
+    ivf.add("new", new)
+
+    assert ivf.search(new, k=1)[0][0] == "new"
+    assert len(ivf) == 101
+    assert not ivf.needs_retrain
+
+    for i in range(10):
+        ivf.add(f"more{i}", vectors[i])
+    assert ivf.needs_retrain
+
+
+def test_ivf_index_add_to_empty_index():
+    ivf = IVFIndex([], np.zeros((0, 0), dtype=np.float32))
+
+    ivf.add("first", np.eye(512, dtype=np.float32)[0])
+
+    assert ivf.search(np.eye(512, dtype=np.float32)[0], k=1)[0][0] == "first"
+
+
+# ---------------------------------------------------------------------------
+# DUPLICATE PAIRS
+# ---------------------------------------------------------------------------
+
+def test_near_duplicate_pairs_matches_full_matrix_across_blocks():
+    ids, vectors = make_gallery(n=300, dim=64)
+    # Plant near-copies, some in different blocks
+    for i, j in [(3, 10), (20, 250), (299, 0)]:
+        vectors[j] = vectors[i] + 0.01 * vectors[j]
+        vectors[j] /= np.linalg.norm(vectors[j])
+
+    pairs = near_duplicate_pairs(ids, vectors, 0.9, block_rows=64, block_cols=48)
+
+    full = vectors @ vectors.T
+    expected = {
+        (ids[i], ids[j]) for i in range(len(ids)) for j in range(i + 1, len(ids))
+        if full[i, j] >= 0.9
+    }
+    assert {(a, b) for a, b, _ in pairs} == expected == {
+        ("emp00003", "emp00010"), ("emp00020", "emp00250"), ("emp00000", "emp00299"),
+    }
+    scores = [score for _, _, score in pairs]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_near_duplicate_pairs_empty_when_nothing_is_close():
+    ids, vectors = make_gallery(n=50, dim=64)
+    assert near_duplicate_pairs(ids, vectors, 0.9) == []
+
+
+# ---------------------------------------------------------------------------
+# GALLERY CACHE
+# ---------------------------------------------------------------------------
+
+def test_face_gallery_builds_once_until_invalidated_or_expired():
+    ids, vectors = make_gallery(n=10)
+    calls = {"count": 0}
+    now = {"t": 0.0}
+
+    def loader(db):
+        calls["count"] += 1
+        return ids, vectors.tolist()
+
+    gallery = FaceGallery(loader, kind="int8", ttl=60, clock=lambda: now["t"])
+
+    first = gallery.get(None)
+    assert isinstance(first, Int8Index)
+    assert gallery.get(None) is first
+    assert calls["count"] == 1
+
+    gallery.invalidate()
+    gallery.get(None)
+    assert calls["count"] == 2
+
+    now["t"] = 61.0
+    gallery.get(None)
+    assert calls["count"] == 3
+
+
+def test_face_gallery_add_updates_every_index_in_place():
+    ids, vectors = make_gallery(n=50)
+
+    ivf_gallery = FaceGallery(lambda db: (ids, vectors), kind="ivf", index_options={"nlist": 4})
+    index = ivf_gallery.get(None)
+    ivf_gallery.add("new", 3 * vectors[0])
+    assert ivf_gallery.get(None) is index
+    assert len(index) == 51
+
+    for kind in ("exact", "int8", "binary"):
+        gallery = FaceGallery(lambda db: (list(ids), vectors), kind=kind)
+        index = gallery.get(None)
+        gallery.add("new", 3 * vectors[0])
+        assert gallery.get(None) is index
+        assert len(index) == 51
+        assert index.search(vectors[0], k=2)[1][0] in ("emp00000", "new")
+
+    # Not built yet: nothing to insert into
+    lazy = FaceGallery(lambda db: (ids, vectors), kind="exact")
+    lazy.add("new", vectors[0])
+    assert len(lazy.get(None)) == 50
+
+
+def test_index_add_to_empty_index():
+    empty = np.zeros((0, 0), dtype=np.float32)
+    vector = make_gallery(n=1)[1][0]
+    for cls in (ExactIndex, Int8Index, BinaryIndex):
+        index = cls([], empty)
+        index.add("only", vector)
+        assert [e for e, _ in index.search(vector)] == ["only"]
+
+
+def test_face_gallery_handles_empty_gallery():
+    for kind in ("exact", "int8", "binary", "ivf"):
+        gallery = FaceGallery(lambda db: ([], [], []), kind=kind)
+
+        assert len(gallery.get(None)) == 0
+
+
+def test_site_galleries_evict_idle_sites():
+    now = {"t": 0.0}
+    built = []
+
+    def factory(site_id):
+        built.append(site_id)
+        return FaceGallery(lambda db: ([], []), kind="exact")
+
+    galleries = SiteGalleries(factory, idle_ttl=60, clock=lambda: now["t"])
+
+    north = galleries.get("north")
+    assert galleries.get("north") is north
+    galleries.get(None)
+    assert built == ["north", None]
+
+    now["t"] = 30.0
+    galleries.get(None)
+    now["t"] = 70.0
+    galleries.get(None)
+
+    assert "north" not in galleries
+    assert None in galleries
+    assert galleries.get("north") is not north
+
+
+def test_site_galleries_add_reaches_site_and_company_galleries():
+    ids, vectors = make_gallery(n=50)
+    galleries = SiteGalleries(
+        lambda site_id: FaceGallery(lambda db: (ids, vectors), kind="ivf", index_options={"nlist": 4})
+    )
+    north, south, company = (galleries.get(s).get(None) for s in ("north", "south", None))
+
+    galleries.add("north", "new", vectors[0])
+
+    assert len(north) == 51
+    assert len(company) == 51
+    assert len(south) == 50
+
+
+# ---------------------------------------------------------------------------
+# BENCHMARK SMOKE TEST
+# ---------------------------------------------------------------------------
+
+def test_identify_benchmark_reports_recall_and_memory():
+    from benchmarks.identify import run
+
+    results = run(
+        size=300,
+        queries=5,
+        seed=3,
+        reranks=(8,),
+        shortlists=(16,),
+        nprobes=(2,),
+        nlist=10,
+        repeat=1,
+        min_time=0.001,
+    )
+
+    exact = results["identify.exact[300]"]
+    int8 = results["identify.int8[300,rerank=8]"]
+
+    assert exact["recall_at_1"] == 1.0
+    assert 0.0 <= int8["recall_at_1"] <= 1.0
+    assert int8["nbytes"] < exact["nbytes"]
+    assert "identify.binary[300,shortlist=16]" in results
+    assert "identify.ivf[300,nlist=10,nprobe=2]" in results
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from data.models import Base
+import data.employee_repository as employee_repo
+import data.face_template_repository as repo
+
+# ---------------------------------------------------------------------------
+# FIXTURES
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    session = SessionLocal()
+
+    employee_repo.add_employee(session, {
+        "employee_id": "abc123",
+        "name": "Alice",
+        "role": "Employee",
+        "embedding": [0.1] * 512,
+    })
+
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# ---------------------------------------------------------------------------
+# CREATE + READ
+# ---------------------------------------------------------------------------
+
+def test_add_and_list_templates_in_insertion_order(db):
+    repo.add_face_template(db, "abc123", [1.0] + [0.0] * 511)
+    repo.add_face_template(db, "abc123", [0.0, 1.0] + [0.0] * 510)
+
+    embeddings = repo.get_face_template_embeddings(db, "abc123")
+
+    assert len(embeddings) == 2
+    assert embeddings[0][0] == 1.0
+    assert embeddings[1][1] == 1.0
+
+
+def test_count_templates_per_employee(db):
+    assert repo.count_face_templates(db, "abc123") == 0
+
+    repo.add_face_template(db, "abc123", [0.1] * 512)
+
+    assert repo.count_face_templates(db, "abc123") == 1
+    assert repo.count_face_templates(db, "other") == 0
+
+
+def test_no_templates_returns_empty_list(db):
+    assert repo.get_face_template_embeddings(db, "abc123") == []
@@ -0,0 +1,189 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from core.idempotency import IdempotencyMiddleware, MemoryIdempotencyStore, StoredResponse
+from data.idempotency_store import DatabaseIdempotencyStore
+from data.models import Base
+
+
+def _response(body=b"{}"):
+    return StoredResponse(200, [("content-type", "application/json")], body)
+
+
+# ---------------------------------------------------------------------------
+# MEMORY STORE
+# ---------------------------------------------------------------------------
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryIdempotencyStore(max_keys=2)
+
+    store.put("a", _response(b"a"))
+    store.put("b", _response(b"b"))
+    store.get("a")
+    store.put("c", _response(b"c"))
+
+    assert store.get("b") is None
+    assert store.get("a").body == b"a"
+    assert store.get("c").body == b"c"
+    assert len(store) == 2
+
+
+def test_memory_store_expires_after_ttl():
+    now = {"t": 0.0}
+    store = MemoryIdempotencyStore(ttl=60, clock=lambda: now["t"])
+    store.put("a", _response())
+
+    now["t"] = 59.0
+    assert store.get("a") is not None
+
+    now["t"] = 60.0
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+# ---------------------------------------------------------------------------
+# DATABASE STORE
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_database_store_round_trips(engine):
+    store = DatabaseIdempotencyStore(engine)
+
+    assert store.get("k") is None
+    store.put("k", _response(b'{"ok": true}'))
+
+    stored = store.get("k")
+    assert stored.status_code == 200
+    assert stored.headers == [("content-type", "application/json")]
+    assert stored.body == b'{"ok": true}'
+
+
+def test_database_store_keeps_first_response(engine):
+    first, second = DatabaseIdempotencyStore(engine), DatabaseIdempotencyStore(engine)
+
+    first.put("k", _response(b"first"))
+    second.put("k", _response(b"second"))
+
+    assert second.get("k").body == b"first"
+
+
+def test_database_store_replaces_expired_row_before_purge(engine):
+    from datetime import timedelta
+
+    from data.idempotency_store import _utcnow
+    from data.models import IdempotencyKey
+
+    store = DatabaseIdempotencyStore(engine, ttl=60)
+    with store._sessionmaker() as db:
+        db.add(IdempotencyKey(
+            key="k", status_code=200, headers=[], body=b"old",
+            created_at=_utcnow() - timedelta(seconds=120),
+        ))
+        db.commit()
+
+    assert store.get("k") is None
+    store.put("k", _response(b"new"))
+
+    assert store.get("k").body == b"new"
+
+
+def test_database_store_ignores_and_purges_expired_keys(engine):
+    store = DatabaseIdempotencyStore(engine, ttl=0, purge_every=1)
+
+    store.put("k", _response())
+
+    assert store.get("k") is None
+    with store._sessionmaker() as db:
+        assert db.query(Base.metadata.tables["idempotency_keys"]).count() == 0
+
+
+# ---------------------------------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------------------------------
+
+class _CountingStore(MemoryIdempotencyStore):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        return super().get(key)
+
+
+def _middleware_client(store, status=200):
+    from starlette.responses import PlainTextResponse
+    from starlette.testclient import TestClient
+
+    calls = {"n": 0}
+
+    async def app(scope, receive, send):
+        calls["n"] += 1
+        await PlainTextResponse(f"call {calls['n']}", status_code=status)(scope, receive, send)
+
+    return TestClient(IdempotencyMiddleware(app, store=store)), calls
+
+
+def test_middleware_passes_other_requests_through_without_the_store():
+    store = _CountingStore()
+    client, calls = _middleware_client(store)
+
+    client.post("/employees/", headers={"Idempotency-Key": "k"})
+    client.get("/clock/e1/status", headers={"Idempotency-Key": "k"})
+    client.post("/clock/e1/in")
+
+    assert calls["n"] == 3
+    assert store.calls == 0
+
+
+def test_middleware_replays_keyed_response_but_not_5xx():
+    client, calls = _middleware_client(MemoryIdempotencyStore())
+    headers = {"Idempotency-Key": "k"}
+
+    assert client.post("/clock/e1/in", headers=headers).text == "call 1"
+    # Another path is another request
+    assert client.post("/sites/north/clock/e1/in", headers=headers).text == "call 2"
+    replay = client.post("/clock/e1/in", headers=headers)
+    assert replay.text == "call 1"
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+    failing, calls = _middleware_client(MemoryIdempotencyStore(), status=503)
+    failing.post("/clock/e1/in", headers=headers)
+    failing.post("/clock/e1/in", headers=headers)
+    assert calls["n"] == 2
+
+
+@pytest.mark.parametrize("status", [408, 422, 429])
+def test_middleware_does_not_store_transient_rejections(status):
+    client, calls = _middleware_client(MemoryIdempotencyStore(), status=status)
+    headers = {"Idempotency-Key": "k"}
+
+    client.post("/clock/e1/in", headers=headers)
+    retry = client.post("/clock/e1/in", headers=headers)
+
+    assert calls["n"] == 2
+    assert "Idempotent-Replayed" not in retry.headers
+
+
+@pytest.mark.parametrize("status", [400, 404, 409])
+def test_middleware_replays_domain_rejections(status):
+    client, calls = _middleware_client(MemoryIdempotencyStore(), status=status)
+    headers = {"Idempotency-Key": "k"}
+
+    client.post("/clock/e1/in", headers=headers)
+    retry = client.post("/clock/e1/in", headers=headers)
+
+    assert calls["n"] == 1
+    assert retry.status_code == status
+    assert retry.headers["Idempotent-Replayed"] == "true"
@@ -0,0 +1,161 @@
+import io
+import json
+
+import pytest
+from structlog import DropEvent
+
+from core.log_sampling import (
+    EventSampler,
+    render_exception_cause,
+    suppress_expected_causes,
+)
+from core.logging import init_logging, shutdown_logging
+
+
+# ---------------------------------------------------------------------------
+# SAMPLING
+# ---------------------------------------------------------------------------
+
+def test_sampler_drops_events_above_rate():
+    rolls = iter([0.05, 0.5])
+    sampler = EventSampler({"face_verify_start": 0.1}, rand=lambda: next(rolls))
+
+    assert sampler(None, "info", {"event": "face_verify_start"})
+    with pytest.raises(DropEvent):
+        sampler(None, "info", {"event": "face_verify_start"})
+
+
+def test_sampler_passes_unconfigured_events_and_errors():
+    sampler = EventSampler({"noisy": 0.0}, {"capped": 0})
+
+    assert sampler(None, "info", {"event": "other"}) == {"event": "other"}
+    assert sampler(None, "error", {"event": "noisy"}) == {"event": "noisy"}
+    assert sampler(None, "error", {"event": "capped"}) == {"event": "capped"}
+
+
+# ---------------------------------------------------------------------------
+# RATE CAPS
+# ---------------------------------------------------------------------------
+
+def test_rate_limit_caps_per_second_and_reports_suppressed():
+    now = {"t": 100.0}
+    sampler = EventSampler(rate_limits={"clock_status_request": 2}, clock=lambda: now["t"])
+
+    passed = 0
+    for _ in range(5):
+        try:
+            sampler(None, "info", {"event": "clock_status_request"})
+            passed += 1
+        except DropEvent:
+            pass
+
+    assert passed == 2
+
+    now["t"] = 101.0
+    event = sampler(None, "info", {"event": "clock_status_request"})
+    assert event["suppressed"] == 3
+
+
+def _capped_sampler(now, reports, limit=1):
+    return EventSampler(
+        rate_limits={"spike": limit},
+        clock=lambda: now["t"],
+        report=lambda event, n: reports.append((event, n)),
+    )
+
+
+def _log(sampler, event):
+    try:
+        return sampler(None, "info", {"event": event})
+    except DropEvent:
+        return None
+
+
+def test_rate_limit_reports_pending_count_when_window_rolls_over():
+    now, reports = {"t": 100.0}, []
+    sampler = _capped_sampler(now, reports)
+
+    for _ in range(4):
+        _log(sampler, "spike")
+    assert reports == []
+
+    # The spike stops; the next event of any kind flushes its count once
+    now["t"] = 101.5
+    _log(sampler, "other")
+    _log(sampler, "other")
+    assert reports == [("spike", 3)]
+
+    # Already reported: not attached to a later recurrence as well
+    now["t"] = 105.0
+    assert "suppressed" not in _log(sampler, "spike")
+
+
+def test_flush_reports_pending_counts():
+    now, reports = {"t": 100.0}, []
+    sampler = _capped_sampler(now, reports)
+    for _ in range(3):
+        _log(sampler, "spike")
+
+    sampler.flush()
+    sampler.flush()
+
+    assert reports == [("spike", 2)]
+
+
+def test_shutdown_logs_suppressed_counts(monkeypatch, restore_logging):
+    stream = io.StringIO()
+    monkeypatch.setattr("sys.stderr", stream)
+    init_logging("test", rate_limits={"spike": 1})
+
+    import structlog
+    for _ in range(5):
+        structlog.get_logger().info("spike")
+    shutdown_logging()
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    reports = [e for e in events if e["event"] == "log_events_suppressed"]
+    assert reports and all(r["suppressed_event"] == "spike" for r in reports)
+    passed = [e for e in events if e["event"] == "spike"]
+    assert len(passed) + sum(e.get("suppressed", 0) for e in passed + reports) == 5
+
+
+# ---------------------------------------------------------------------------
+# TRACEBACK SUPPRESSION
+# ---------------------------------------------------------------------------
+
+def test_suppress_expected_causes_only_for_quiet_types():
+    processor = suppress_expected_causes(["EmployeeAlreadyExists"])
+
+    with pytest.raises(DropEvent):
+        processor(None, "warning", {"event": "app_exception_cause", "exc_type": "EmployeeAlreadyExists"})
+
+    kept = {"event": "app_exception_cause", "exc_type": "DatabaseError"}
+    assert processor(None, "warning", kept) is kept
+
+
+def test_render_exception_cause_formats_traceback():
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError as exc:
+        event = render_exception_cause(None, "warning", {"cause": exc})
+
+    assert "RuntimeError: boom" in event["cause"]
+    assert "Traceback" in event["cause"]
+
+
+def test_duplicate_employee_does_not_log_cause_traceback(make_client, monkeypatch, restore_logging):
+    stream = io.StringIO()
+    client = make_client()
+    monkeypatch.setattr("sys.stderr", stream)
+    init_logging("test", quiet_exceptions=["EmployeeAlreadyExists"])
+
+    payload = {"employee_id": "dup", "name": "Bob", "role": "Employee", "embedding": [0.1] * 512}
+    client.post("/employees/", json=payload, headers={"X-Admin-Key": "dev-key"})
+    response = client.post("/employees/", json=payload, headers={"X-Admin-Key": "dev-key"})
+    shutdown_logging()
+
+    events = [json.loads(line)["event"] for line in stream.getvalue().splitlines()]
+
+    assert response.status_code == 409
+    assert "app_exception" in events
+    assert "app_exception_cause" not in events
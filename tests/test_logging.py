@@ -0,0 +1,133 @@
+import io
+import json
+import logging
+
+import structlog
+
+from core.logging import BatchingLogWriter, init_logging, shutdown_logging
+
+
+def _record(message, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 0, message, None, None)
+
+
+def _writer(stream=None, **kwargs):
+    return BatchingLogWriter(
+        stream or io.StringIO(),
+        logging.Formatter("%(message)s"),
+        **kwargs,
+    )
+
+
+# ---------------------------------------------------------------------------
+# DROP POLICY
+# ---------------------------------------------------------------------------
+
+def test_drop_newest_discards_incoming_when_full():
+    writer = _writer(queue_size=2, drop_policy="drop_newest")
+
+    for i in range(5):
+        writer.submit(_record(f"r{i}"))
+
+    assert writer.dropped == 3
+    assert [writer._queue.get_nowait().msg for _ in range(2)] == ["r0", "r1"]
+
+
+def test_drop_oldest_evicts_queued_records():
+    writer = _writer(queue_size=2, drop_policy="drop_oldest")
+
+    for i in range(4):
+        writer.submit(_record(f"r{i}"))
+
+    assert writer.dropped == 2
+    assert [writer._queue.get_nowait().msg for _ in range(2)] == ["r2", "r3"]
+
+
+def test_drop_report_renders_as_structlog_event():
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.JSONRenderer(),
+        ],
+    )
+    writer = BatchingLogWriter(io.StringIO(), formatter, queue_size=1)
+
+    for i in range(3):
+        writer.submit(_record(f"r{i}"))
+
+    event = json.loads(writer._drop_report())
+    assert event["event"] == "log_records_dropped"
+    assert event["dropped"] == event["dropped_total"] == 2
+    assert event["level"] == "warning"
+    assert writer._drop_report() is None
+
+
+# ---------------------------------------------------------------------------
+# BACKGROUND WRITER
+# ---------------------------------------------------------------------------
+
+def test_writer_flushes_batches_and_stops_cleanly():
+    stream = io.StringIO()
+    writer = _writer(stream, batch_size=3)
+    writer.start()
+
+    for i in range(7):
+        writer.submit(_record(f"line{i}"))
+
+    writer.flush()
+    assert stream.getvalue().splitlines() == [f"line{i}" for i in range(7)]
+
+    writer.submit(_record("last"))
+    writer.stop()
+    assert stream.getvalue().splitlines()[-1] == "last"
+    assert not writer._thread.is_alive()
+
+
+def test_async_init_logging_renders_structlog_events_off_thread(monkeypatch, restore_logging):
+    stream = io.StringIO()
+    monkeypatch.setattr("sys.stderr", stream)
+
+    init_logging("test", async_logging=True, queue_size=100)
+    structlog.get_logger().info("async_event", answer=42)
+    shutdown_logging()
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    event = next(e for e in events if e["event"] == "async_event")
+
+    assert event["answer"] == 42
+    assert event["level"] == "info"
+    assert "timestamp" in event
+
+
+def test_shutdown_falls_back_to_synchronous_handler(monkeypatch, restore_logging):
+    stream = io.StringIO()
+    monkeypatch.setattr("sys.stderr", stream)
+
+    init_logging("test", async_logging=True)
+    shutdown_logging()
+    structlog.get_logger().warning("after_shutdown")
+
+    assert "after_shutdown" in stream.getvalue()
+
+
+def test_emitted_events_are_timed_as_log_phase(monkeypatch, restore_logging):
+    import contextvars
+
+    from core.timing import start_recording
+
+    stream = io.StringIO()
+    monkeypatch.setattr("sys.stderr", stream)
+    init_logging("test")
+
+    def scenario():
+        recorder = start_recording()
+        structlog.get_logger().info("timed_event")
+        structlog.get_logger().debug("filtered_event")   # below INFO: no-op
+        return recorder
+
+    recorder = contextvars.Context().run(scenario)
+
+    assert list(recorder.durations) == ["log"]
+    event = json.loads(stream.getvalue().splitlines()[-1])
+    assert event["event"] == "timed_event"
+    assert "_log_started" not in event
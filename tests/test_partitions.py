@@ -0,0 +1,74 @@
+from datetime import date
+from unittest.mock import MagicMock
+
+import data.partitions as partitions
+from data.partitions import (
+    add_months,
+    create_partition_sql,
+    detach_partition_sql,
+    iter_months,
+    partition_month,
+    partition_name,
+)
+from scripts.time_entry_partitions import main
+
+
+def test_month_arithmetic_crosses_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert list(iter_months(date(2025, 11, 20), date(2026, 2, 3))) == [
+        date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1),
+    ]
+
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2026, 3, 1)) == "time_entries_y2026m03"
+    assert partition_month("time_entries_y2026m03") == date(2026, 3, 1)
+    assert partition_month("time_entries_default") is None
+    assert partition_month("time_entries_y2026m13") is None
+
+
+def test_create_partition_moves_rows_out_of_default_before_attaching():
+    create, move, attach = create_partition_sql(date(2025, 12, 1))
+
+    assert "time_entries_y2025m12" in create
+    assert "DELETE FROM time_entries_default" in move
+    assert "clock_in >= '2025-12-01' AND clock_in < '2026-01-01'" in move
+    assert attach.endswith("FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')")
+
+
+def test_detach_archives_or_drops():
+    archived = detach_partition_sql(date(2024, 1, 1))
+    dropped = detach_partition_sql(date(2024, 1, 1), drop=True)
+
+    assert archived[-1] == "ALTER TABLE time_entries_y2024m01 SET SCHEMA archive"
+    assert dropped[-1] == "DROP TABLE time_entries_y2024m01"
+
+
+def test_ensure_only_creates_missing_months(monkeypatch):
+    monkeypatch.setattr(partitions, "list_partitions", lambda conn: [date(2026, 3, 1)])
+    conn = MagicMock()
+
+    statements = partitions.ensure_partitions(conn, months_ahead=1, today=date(2026, 3, 15))
+
+    assert [s for s in statements if "ATTACH" in s] == [create_partition_sql(date(2026, 4, 1))[-1]]
+    assert conn.execute.call_count == 3
+
+
+def test_detach_skips_recent_and_open_partitions(monkeypatch):
+    months = [date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)]
+    monkeypatch.setattr(partitions, "list_partitions", lambda conn: months)
+    monkeypatch.setattr(partitions, "open_entries_in", lambda conn, m: 1 if m == date(2025, 2, 1) else 0)
+
+    statements = partitions.detach_partitions(MagicMock(), before=date(2025, 3, 1), dry_run=True)
+    forced = partitions.detach_partitions(MagicMock(), before=date(2025, 3, 1), force=True, dry_run=True)
+
+    assert [s for s in statements if "DETACH" in s] == [
+        "ALTER TABLE time_entries DETACH PARTITION time_entries_y2025m01",
+    ]
+    assert len([s for s in forced if "DETACH" in s]) == 2
+
+
+def test_cli_requires_postgresql(capsys):
+    assert main(["--database-url", "sqlite://", "list"]) == 2
+    assert "requires PostgreSQL" in capsys.readouterr().err
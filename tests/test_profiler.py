@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from core import profiler
+from core.errors import ProfilerBusy
+
+
+def _spin_until(stop):
+    while not stop.is_set():
+        sum(range(200))
+
+
+@pytest.fixture()
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_spin_until, args=(stop,), daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+# ---------------------------------------------------------------------------
+# SAMPLING
+# ---------------------------------------------------------------------------
+
+def test_sample_captures_busy_thread(busy_thread):
+    result = profiler.sample(0.1, interval=0.002)
+
+    assert result.total_samples > 0
+    assert "_spin_until" in result.collapsed()
+
+
+def test_sample_rejects_concurrent_profiles():
+    started = threading.Event()
+
+    def background():
+        started.set()
+        profiler.sample(0.3, interval=0.01)
+
+    thread = threading.Thread(target=background)
+    thread.start()
+    started.wait()
+    time.sleep(0.05)
+
+    with pytest.raises(ProfilerBusy):
+        profiler.sample(0.01)
+
+    thread.join()
+
+
+def test_request_matcher_skips_threads_without_matching_request(busy_thread):
+    matcher = profiler.build_request_matcher(route="/employees/verify")
+
+    result = profiler.sample(0.05, interval=0.002, matcher=matcher)
+
+    assert result.total_samples == 0
+
+
+def test_build_request_matcher_none_without_filters():
+    assert profiler.build_request_matcher() is None
+
+
+# ---------------------------------------------------------------------------
+# OUTPUT FORMATS
+# ---------------------------------------------------------------------------
+
+def test_speedscope_document_shape(busy_thread):
+    doc = profiler.sample(0.05, interval=0.002).speedscope()
+
+    frames = doc["shared"]["frames"]
+    prof = doc["profiles"][0]
+
+    assert prof["type"] == "sampled"
+    assert len(prof["samples"]) == len(prof["weights"])
+    assert all(0 <= i < len(frames) for sample in prof["samples"] for i in sample)
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
+
+def test_profile_endpoint_requires_admin_key(make_client):
+    client = make_client()
+
+    response = client.post("/admin/profile?seconds=0.01")
+
+    assert response.status_code == 401
+    assert response.json()["code"] == "UNAUTHORIZED"
+
+
+def test_profile_endpoint_returns_collapsed_stacks(make_client, busy_thread):
+    client = make_client()
+
+    response = client.post(
+        "/admin/profile?seconds=0.05&interval_ms=1",
+        headers={"X-Admin-Key": "dev-key"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "_spin_until" in response.text
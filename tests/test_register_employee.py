@@ -63,6 +63,7 @@ def test_register_employee_normalizes_and_defaults_role(monkeypatch):
 
     # 4. Role was defaulted
     assert payload["role"] == "Employee"
+    assert len(payload["signature"]) == 64
 
     # 5. Original object was NOT mutated
     assert employee_input.embedding == raw_embedding
@@ -25,7 +25,7 @@ def test_search_employees_by_prefix(monkeypatch):
     fake_results = [mock_emp1, mock_emp2]
 
     # Mock repo
-    def mock_get(db_session, prefix):
+    def mock_get(db_session, prefix, site_id=None):
         mock_get.captured_prefix = prefix
         mock_get.captured_db = db_session
         return fake_results
@@ -77,7 +77,7 @@ def test_search_employees_by_prefix_no_matches(monkeypatch):
     db = MagicMock()
 
     # Repo returns empty list
-    def mock_get(db_session, prefix):
+    def mock_get(db_session, prefix, site_id=None):
         mock_get.captured_prefix = prefix
         return []
 
@@ -108,7 +108,7 @@ def test_search_employees_by_prefix_extra_fields_ignored(monkeypatch):
     mock_emp.role = "Employee"
     mock_emp.secret_token = "DO_NOT_LEAK"  # Repo might have extra columns
 
-    def mock_get(_, __):
+    def mock_get(_, __, ___=None):
         return [mock_emp]
 
     monkeypatch.setattr(
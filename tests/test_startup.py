@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import main
+from core.lazy import lazy_import
+from core.settings import get_settings
+
+
+# ---------------------------------------------------------------------------
+# LAZY IMPORTS
+# ---------------------------------------------------------------------------
+
+def test_lazy_import_defers_module_execution(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe_mod.py").write_text(textwrap.dedent("""
+        import builtins
+        builtins.lazy_probe_executed = True
+        VALUE = 42
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe_mod", raising=False)
+
+    import builtins
+    monkeypatch.setattr(builtins, "lazy_probe_executed", False, raising=False)
+
+    mod = lazy_import("lazy_probe_mod")
+    assert builtins.lazy_probe_executed is False
+
+    assert mod.VALUE == 42
+    assert builtins.lazy_probe_executed is True
+
+    sys.modules.pop("lazy_probe_mod", None)
+
+
+def test_lazy_import_returns_already_loaded_module():
+    assert lazy_import("json") is sys.modules["json"]
+
+
+# ---------------------------------------------------------------------------
+# SETTINGS + ENTRYPOINT
+# ---------------------------------------------------------------------------
+
+def test_get_settings_is_cached():
+    assert get_settings() is get_settings()
+
+
+def test_importing_main_does_not_build_app_or_import_the_stack():
+    # Fresh interpreter: other tests may already have touched main.app
+    code = (
+        "import sys, main; "
+        "assert 'app' not in vars(main); "
+        "assert 'fastapi' not in sys.modules; "
+        "assert 'sqlalchemy' not in sys.modules; "
+        "assert 'numpy' not in sys.modules"
+    )
+    env = {**os.environ, "DATABASE_URL": "sqlite://", "ADMIN_API_KEY": "k", "ENV": "test"}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_unknown_main_attribute_raises():
+    with pytest.raises(AttributeError):
+        main.does_not_exist
+
+
+
+def test_post_fork_disposes_primary_and_replica_engines(monkeypatch):
+    import importlib.util
+    from types import SimpleNamespace
+
+    from sqlalchemy import create_engine
+
+    from core.settings import Settings
+
+    primary, replica = create_engine("sqlite://"), create_engine("sqlite://")
+    app = main.create_app(Settings(env="test"), engine=primary, replica_engines=[replica])
+    assert app.state.engines == [primary, replica]
+
+    disposed = []
+    for engine in app.state.engines:
+        monkeypatch.setattr(engine, "dispose", lambda close=True, e=engine: disposed.append(e))
+    monkeypatch.setattr(main, "app", SimpleNamespace(state=app.state), raising=False)
+
+    path = os.path.join(os.path.dirname(__file__), os.pardir, "gunicorn.conf.py")
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", path)
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+    conf.post_fork(None, None)
+
+    assert disposed == [primary, replica]
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from starlette.requests import ClientDisconnect
+
+from core.errors import StreamLimitReached
+from core.status_broker import StatusBroker, StatusChange
+from data.models import Base, TimeEntry
+from services.status_stream import StatusStreamResponse, status_events
+
+NINE = datetime(2026, 3, 2, 9)
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture()
+def open_session(engine):
+    @contextmanager
+    def opener():
+        with Session(engine) as db:
+            yield db
+    return opener
+
+
+def _parse(message):
+    assert message.startswith("event: status\ndata: ")
+    return json.loads(message.split("data: ", 1)[1])
+
+
+# ---------------------------------------------------------------------------
+# BROKER
+# ---------------------------------------------------------------------------
+
+def test_publish_from_another_thread_reaches_matching_subscribers():
+    broker = StatusBroker()
+
+    async def scenario():
+        watched = broker.subscribe(["a"])
+        north = broker.subscribe(site_id="north")
+
+        thread = threading.Thread(target=broker.publish, args=(StatusChange("a", "default", True, NINE),))
+        thread.start()
+        thread.join()
+
+        assert await watched.get(1.0) == [StatusChange("a", "default", True, NINE)]
+        assert await north.get(0.05) == []
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_latest_change_per_employee():
+    broker = StatusBroker()
+
+    async def scenario():
+        subscription = broker.subscribe()
+        broker.publish(StatusChange("a", "default", True, NINE))
+        broker.publish(StatusChange("b", "default", True, NINE))
+        broker.publish(StatusChange("a", "default", False))
+        await asyncio.sleep(0)
+
+        changes = await subscription.get(1.0)
+        assert [(c.employee_id, c.is_clocked_in) for c in changes] == [("b", True), ("a", False)]
+
+    asyncio.run(scenario())
+
+
+def test_subscriber_limit():
+    broker = StatusBroker(max_subscribers=1)
+
+    async def scenario():
+        first = broker.subscribe()
+        with pytest.raises(StreamLimitReached):
+            broker.subscribe()
+        first.close()
+        broker.subscribe()
+
+    asyncio.run(scenario())
+
+
+def test_subscription_close_is_idempotent():
+    broker = StatusBroker()
+
+    async def scenario():
+        first, second = broker.subscribe(), broker.subscribe()
+        first.close()
+        first.close()
+        assert len(broker) == 1 and not second.closed
+
+    asyncio.run(scenario())
+
+
+# ---------------------------------------------------------------------------
+# STREAM
+# ---------------------------------------------------------------------------
+
+def test_stream_sends_snapshot_changes_and_heartbeats(engine, open_session):
+    with Session(engine) as db:
+        db.add(TimeEntry(employee_id="a", clock_in=NINE))
+        db.commit()
+    broker = StatusBroker()
+
+    async def scenario():
+        events = status_events(broker.subscribe(["a", "b"]), open_session, heartbeat=0.05, resync=0)
+
+        snapshot = [_parse(await anext(events)), _parse(await anext(events))]
+        assert {(s["employee_id"], s["is_clocked_in"]) for s in snapshot} == {("a", True), ("b", False)}
+
+        broker.publish(StatusChange("b", "default", True, NINE))
+        change = _parse(await anext(events))
+        assert change == {"employee_id": "b", "is_clocked_in": True, "clock_in_time": "2026-03-02T09:00:00"}
+
+        assert await anext(events) == ": ping\n\n"
+
+        await events.aclose()
+        assert len(broker) == 0
+
+    asyncio.run(scenario())
+
+
+def test_stream_resync_picks_up_changes_from_other_workers(engine, open_session):
+    with Session(engine) as db:
+        db.add(TimeEntry(employee_id="a", clock_in=NINE))
+        db.commit()
+    broker = StatusBroker()
+
+    async def scenario():
+        events = status_events(broker.subscribe(), open_session, heartbeat=10, resync=0.05)
+        assert _parse(await anext(events))["employee_id"] == "a"
+
+        with Session(engine) as db:
+            db.add(TimeEntry(employee_id="c", clock_in=NINE))
+            db.commit()
+
+        # Resyncs that find nothing new send nothing: no ping before the
+        # heartbeat is due
+        assert _parse(await anext(events))["employee_id"] == "c"
+        await events.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_roster_streams_share_one_read_per_resync_tick(engine, open_session):
+    broker = StatusBroker()
+    reads = []
+
+    @contextmanager
+    def counting_session():
+        reads.append(1)
+        with open_session() as db:
+            yield db
+
+    async def scenario():
+        # Start just after a tick, so the insert below lands before the next
+        await asyncio.sleep(0.3 - time.monotonic() % 0.3 + 0.01)
+        streams = [
+            status_events(broker.subscribe(), counting_session, heartbeat=10, resync=0.3)
+            for _ in range(3)
+        ]
+        pending = [asyncio.ensure_future(anext(stream)) for stream in streams]
+        await asyncio.sleep(0.05)
+        assert len(reads) == 3                    # one snapshot each
+
+        with Session(engine) as db:
+            db.add(TimeEntry(employee_id="c", clock_in=NINE))
+            db.commit()
+
+        events = await asyncio.gather(*pending)
+        assert [_parse(e)["employee_id"] for e in events] == ["c", "c", "c"]
+        assert len(reads) == 4                    # plus one shared resync
+
+        for stream in streams:
+            await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_response_closes_subscription_when_client_is_gone_before_first_event(open_session):
+    broker = StatusBroker()
+
+    async def gone(message):
+        raise OSError("client went away")
+
+    async def scenario():
+        subscription = broker.subscribe()
+        response = StatusStreamResponse(subscription, status_events(subscription, open_session))
+
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+        with pytest.raises(ClientDisconnect):
+            await response(scope, None, gone)
+
+        assert subscription.closed
+        assert len(broker) == 0
+
+    asyncio.run(scenario())
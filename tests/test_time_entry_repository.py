@@ -43,6 +43,26 @@ def employee(db):
     return emp
 
 
+# ---------------------------------------------------------------------------
+# LOCK EMPLOYEE
+# ---------------------------------------------------------------------------
+
+def test_lock_employee_selects_for_update(db, employee):
+    from sqlalchemy import event
+    from sqlalchemy.dialects import postgresql
+
+    statements = []
+    event.listen(db.get_bind(), "before_execute",
+                 lambda conn, clause, *args: statements.append(clause))
+
+    assert repo.lock_employee(db, employee.employee_id) is True
+    assert "FOR UPDATE" in str(statements[-1].compile(dialect=postgresql.dialect()))
+
+
+def test_lock_employee_returns_false_for_unknown_employee(db):
+    assert repo.lock_employee(db, "ghost") is False
+
+
 # ---------------------------------------------------------------------------
 # GET OPEN ENTRY
 # ---------------------------------------------------------------------------
@@ -91,6 +111,15 @@ def test_create_entry_inserts_row(db, employee):
     assert entry.clock_out is None
 
 
+def test_create_entry_copies_employee_site(db):
+    db.add(Employee(employee_id="s1", name="Site Worker", role="Employee",
+                    embedding=[0.1] * 512, site_id="north"))
+    db.commit()
+
+    assert repo.create_entry(db, "s1").site_id == "north"
+    assert repo.create_entry(db, "unknown").site_id == "default"
+
+
 def test_create_entry_raises_database_error_on_failure(db, employee, monkeypatch):
     def bad_commit():
         raise RuntimeError("DB failed")
@@ -0,0 +1,108 @@
+import contextvars
+
+from core.timing import SpanRecorder, TimedModel, span, start_recording
+
+
+# ---------------------------------------------------------------------------
+# SPAN RECORDER
+# ---------------------------------------------------------------------------
+
+def test_span_is_noop_without_recorder():
+    def run():
+        with span("db"):
+            pass
+        return span("db")
+
+    # Fresh context → no recorder active → shared no-op object
+    ctx = contextvars.Context()
+    assert ctx.run(run) is ctx.run(run)
+
+
+def test_spans_accumulate_per_phase():
+    def run():
+        recorder = start_recording()
+        with span("db"):
+            pass
+        with span("db"):
+            pass
+        with span("score"):
+            pass
+        return recorder
+
+    recorder = contextvars.Context().run(run)
+
+    assert set(recorder.durations) == {"db", "score"}
+    assert all(ms >= 0 for ms in recorder.durations.values())
+
+
+def test_header_value_format():
+    recorder = SpanRecorder()
+    recorder.add("db", 1.234)
+    recorder.add("score", 0.5)
+
+    assert recorder.header_value(total_ms=3.0) == (
+        "db;dur=1.23, score;dur=0.50, total;dur=3.00"
+    )
+
+
+def test_timed_model_records_validation_as_parse():
+    class Body(TimedModel):
+        values: list
+
+    def scenario():
+        recorder = start_recording()
+        Body(values=[1.0] * 512)
+        Body.model_validate({"values": [2.0]})
+        return recorder
+
+    recorder = contextvars.Context().run(scenario)
+    assert list(recorder.durations) == ["parse"]
+
+
+# ---------------------------------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------------------------------
+
+def test_server_timing_header_on_verify(make_client):
+    client = make_client(settings_overrides={"server_timing_enabled": True})
+
+    client.post("/employees/", json={
+        "employee_id": "emp1",
+        "name": "Alice",
+        "role": "Employee",
+        "embedding": [0.0] * 511 + [1.0],
+    }, headers={"X-Admin-Key": "dev-key"})
+
+    response = client.post("/employees/verify", json={
+        "employee_id": "emp1",
+        "embedding": [0.0] * 511 + [1.0],
+    })
+
+    header = response.headers["Server-Timing"]
+    for phase in ("parse;dur=", "log;dur=", "db;dur=", "normalize;dur=", "score;dur=", "total;dur="):
+        assert phase in header
+
+
+def test_server_timing_header_absent_when_disabled(make_client):
+    client = make_client()
+
+    response = client.get("/health")
+
+    assert "Server-Timing" not in response.headers
+
+
+def test_server_timing_header_on_streamed_response():
+    from starlette.responses import StreamingResponse
+    from starlette.testclient import TestClient
+
+    from core.timing import ServerTimingMiddleware
+
+    async def app(scope, receive, send):
+        with span("db"):
+            pass
+        await StreamingResponse(iter([b"a", b"b"]))(scope, receive, send)
+
+    response = TestClient(ServerTimingMiddleware(app)).get("/")
+
+    assert response.text == "ab"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
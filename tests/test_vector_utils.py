@@ -1,7 +1,15 @@
 import pytest
 import numpy as np
 
-from core.vector_utils import normalize_vector, cosine_similarity
+from core.vector_utils import (
+    normalize_vector,
+    cosine_similarity,
+    normalize_rows,
+    template_similarity,
+    binary_signature,
+    signature_bytes,
+    hamming_distances,
+)
 
 
 # --- normalize_vector tests ---------------------------------------------------
@@ -61,3 +69,66 @@ def test_cosine_similarity_handles_unnormalized_input():
     result = cosine_similarity(v1, v2)
 
     assert result == pytest.approx(1.0)
+
+
+# --- normalize_rows tests -----------------------------------------------------
+
+def test_normalize_rows_unit_length():
+    rows = normalize_rows([[3, 4], [0, 2]])
+
+    np.testing.assert_allclose(np.linalg.norm(rows, axis=1), [1.0, 1.0])
+    np.testing.assert_allclose(rows[0], [0.6, 0.8])
+
+
+def test_normalize_rows_raises_on_zero_row():
+    with pytest.raises(ValueError):
+        normalize_rows([[1, 0], [0, 0]])
+
+
+# --- template_similarity tests ------------------------------------------------
+
+def test_template_similarity_max_takes_best_template():
+    query = np.array([1.0, 0.0])
+    templates = [np.array([0.0, 1.0]), np.array([1.0, 0.0])]
+
+    assert template_similarity(query, templates, "max") == pytest.approx(1.0)
+
+
+def test_template_similarity_mean_averages_templates():
+    query = np.array([1.0, 0.0])
+    templates = [np.array([0.0, 1.0]), np.array([1.0, 0.0])]
+
+    assert template_similarity(query, templates, "mean") == pytest.approx(0.5)
+
+
+def test_template_similarity_aggregates_probe_stack():
+    probes = np.array([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]])
+    templates = [np.array([1.0, 0.0])]
+
+    # Per-frame scores: 1.0, 0.0, -1.0
+    assert template_similarity(probes, templates, aggregate="mean") == pytest.approx(0.0)
+    assert template_similarity(probes, templates, aggregate="max") == pytest.approx(1.0)
+    assert template_similarity(probes, templates, aggregate="k_of_n", k=2) == pytest.approx(0.0)
+    assert template_similarity(probes, templates, aggregate="k_of_n", k=9) == pytest.approx(-1.0)
+
+
+# --- binary signatures --------------------------------------------------------
+
+def test_binary_signature_packs_sign_bits_into_uint64_words():
+    vec = [1.0] * 64 + [-1.0] * 448
+
+    sig = binary_signature(vec)
+
+    assert sig.dtype == np.uint64
+    assert sig.shape == (1, 8)
+    assert len(signature_bytes(vec)) == 64
+    assert np.bitwise_count(sig).sum() == 64
+
+
+def test_hamming_distances_counts_differing_bits():
+    a = [1.0] * 512
+    b = [1.0] * 500 + [-1.0] * 12
+
+    sigs = binary_signature([a, b])
+
+    np.testing.assert_array_equal(hamming_distances(sigs, sigs[0]), [0, 12])
@@ -149,3 +149,107 @@ def test_verify_face_embedding_calls_normalize_vector(monkeypatch):
 
     # Called for query vec + stored vec
     assert calls["count"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Additional templates: best-of scoring
+# ---------------------------------------------------------------------------
+def test_verify_face_embedding_matches_additional_template(monkeypatch):
+    db = MagicMock()
+    settings = Settings(face_match_threshold=0.9)
+
+    query_vec = [0.0, 1.0] + [0.0] * 510
+
+    mock_emp = MagicMock()
+    mock_emp.embedding = [1.0, 0.0] + [0.0] * 510  # orthogonal primary
+
+    monkeypatch.setattr(
+        "services.verify_face.get_employee_by_id",
+        lambda *_: mock_emp,
+    )
+    monkeypatch.setattr(
+        "services.verify_face.get_face_template_embeddings",
+        lambda *_: [[0.0, 2.0] + [0.0] * 510],  # matches the probe
+    )
+
+    req = VerifyFaceRequest(employee_id="abc", embedding=query_vec)
+
+    assert verify_face_embedding(req, db, settings) == pytest.approx(1.0)
+
+
+def test_verify_face_embedding_mean_fusion(monkeypatch):
+    db = MagicMock()
+    settings = Settings(face_match_threshold=0.4, face_template_fusion="mean")
+
+    query_vec = [0.0, 1.0] + [0.0] * 510
+
+    mock_emp = MagicMock()
+    mock_emp.embedding = [1.0, 0.0] + [0.0] * 510
+
+    monkeypatch.setattr(
+        "services.verify_face.get_employee_by_id",
+        lambda *_: mock_emp,
+    )
+    monkeypatch.setattr(
+        "services.verify_face.get_face_template_embeddings",
+        lambda *_: [[0.0, 1.0] + [0.0] * 510],
+    )
+
+    req = VerifyFaceRequest(employee_id="abc", embedding=query_vec)
+
+    assert verify_face_embedding(req, db, settings) == pytest.approx(0.5)
+
+
+# ---------------------------------------------------------------------------
+# Multi-frame probes
+# ---------------------------------------------------------------------------
+def test_verify_face_embedding_multi_frame_k_of_n(monkeypatch):
+    db = MagicMock()
+    settings = Settings(
+        face_match_threshold=0.9,
+        probe_aggregate="k_of_n",
+        probe_k=2,
+    )
+
+    mock_emp = MagicMock()
+    mock_emp.embedding = [1.0, 0.0] + [0.0] * 510
+
+    monkeypatch.setattr(
+        "services.verify_face.get_employee_by_id",
+        lambda *_: mock_emp,
+    )
+
+    good = [1.0, 0.0] + [0.0] * 510
+    bad = [0.0, 1.0] + [0.0] * 510
+
+    # Two of three frames match
+    req = VerifyFaceRequest(employee_id="abc", embeddings=[good, bad, good])
+    assert verify_face_embedding(req, db, settings) == pytest.approx(1.0)
+
+    # Only one of three frames matches
+    req = VerifyFaceRequest(employee_id="abc", embeddings=[good, bad, bad])
+    with pytest.raises(FaceConfidenceTooLow):
+        verify_face_embedding(req, db, settings)
+
+
+def test_verify_face_embedding_multi_frame_wrong_length(monkeypatch):
+    db = MagicMock()
+    settings = Settings()
+
+    req = VerifyFaceRequest(
+        employee_id="abc",
+        embeddings=[[1.0] * settings.embedding_dim, [1.0, 2.0]],
+    )
+
+    with pytest.raises(FaceConfidenceTooLow):
+        verify_face_embedding(req, db, settings)
+
+
+def test_verify_face_request_requires_exactly_one_probe_field():
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError):
+        VerifyFaceRequest(employee_id="abc")
+
+    with pytest.raises(ValidationError):
+        VerifyFaceRequest(employee_id="abc", embedding=[1.0], embeddings=[[1.0]])